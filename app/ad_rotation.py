@@ -0,0 +1,135 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Advertisement
+from .thumbnails import thumbnail_url
+from .view_counter import record_view
+
+PLAN_KEY = 'ad_rotation:plan'
+CURSOR_KEY = 'ad_rotation:cursor:{slot}'
+BANNER_IMAGE_WIDTH = 320
+
+
+def ad_weight(ad, now):
+    """Ustuvorlik x qolgan kunlar (kamida 1): tugashiga oz qolganlar kamroq ko'rsatiladi"""
+    days = 1
+    if ad.expires_at:
+        days = max(math.ceil((ad.expires_at - now) / timedelta(days=1)), 1)
+    return max(ad.priority, 1) * days
+
+
+def scale_weights(weights, size):
+    """Jami vazn reja o'lchamidan oshsa, proporsional kichraytiriladi (har biri kamida 1)"""
+    total = sum(weights.values())
+    if total <= size:
+        return weights
+    return {key: max(round(weight * size / total), 1) for key, weight in weights.items()}
+
+
+def smooth_sequence(weights):
+    """
+    Silliq weighted round-robin (nginx): har bir reklama o'z vazni marta, lekin
+    iloji boricha tekis taqsimlanadi (3:1 -> A A B A, A A A B emas).
+    """
+    current = dict.fromkeys(weights, 0)
+    total = sum(weights.values())
+    sequence = []
+    for _ in range(total):
+        for key, weight in weights.items():
+            current[key] += weight
+        chosen = max(current, key=current.get)
+        current[chosen] -= total
+        sequence.append(chosen)
+    return sequence
+
+
+def ad_payload(ad):
+    """Banner uchun tayyor ma'lumot (render paytida bazaga murojaat qilinmaydi)"""
+    return {
+        'id': ad.id,
+        'title': ad.title,
+        'description': ad.description,
+        'ad_type': ad.ad_type,
+        'color': ad.color,
+        'image': thumbnail_url(ad.image, BANNER_IMAGE_WIDTH) if ad.image else None,
+        'video': reverse('stream_ad_video', args=[ad.pk]) if ad.video else None,
+        'url': reverse('ad_detail', args=[ad.pk]),
+        'impression_url': reverse('ad_impression', args=[ad.pk]),
+    }
+
+
+def build_plan(now=None):
+    """
+    Faol reklamalardan aylanish rejasi: {'ads': {id: payload}, 'sequence': [id, ...]}.
+    Kesh muddati eng yaqin tugaydigan reklama vaqtidan oshmaydi - reja muddati o'tgan
+    reklamani ko'rsatmaydi.
+    """
+    now = now or timezone.now()
+    ads = list(Advertisement.objects.active(now))
+
+    weights = scale_weights(
+        {ad.id: ad_weight(ad, now) for ad in ads},
+        getattr(settings, 'AD_ROTATION_PLAN_SIZE', 100),
+    )
+    plan = {
+        'ads': {ad.id: ad_payload(ad) for ad in ads},
+        'sequence': smooth_sequence(weights),
+    }
+
+    ttl = getattr(settings, 'AD_ROTATION_TTL', 300)
+    expiries = [ad.expires_at for ad in ads if ad.expires_at]
+    if expiries:
+        ttl = min(ttl, max(int((min(expiries) - now).total_seconds()), 1))
+    cache.set(PLAN_KEY, plan, ttl)
+    return plan
+
+
+def get_plan():
+    plan = cache.get(PLAN_KEY)
+    if plan is None:
+        plan = build_plan()
+    return plan
+
+
+def invalidate_plan():
+    """Reklama saqlanganda/o'chirilganda/arxivlanganda: reja keyingi so'rovda qayta quriladi"""
+    cache.delete(PLAN_KEY)
+
+
+def next_ad(slot='default'):
+    """
+    Slot uchun navbatdagi reklama (payload yoki None). Rejadagi o'rin kesh hisoblagichi
+    bilan olinadi - O(1), bazaga murojaatsiz. Impression bu yerda sanalmaydi: bot yoki
+    prefetch so'rovi ham reklamani olishi mumkin - qarang record_impression.
+    """
+    plan = get_plan()
+    sequence = plan['sequence']
+    if not sequence:
+        return None
+
+    key = CURSOR_KEY.format(slot=slot)
+    cache.add(key, 0, None)
+    try:
+        position = cache.incr(key)
+    except ValueError:
+        # Kalit shu orada o'chgan bo'lsa
+        cache.set(key, 0, None)
+        position = 0
+
+    return plan['ads'][sequence[position % len(sequence)]]
+
+
+def record_impression(ad_id):
+    """
+    Banner sahifaga qo'yilgach ad_slot.js yuboradigan beacon uchun: faqat rejadagi (faol)
+    reklama view_counter buferiga yoziladi. Reklama rejada bo'lmasa False.
+    """
+    if ad_id not in get_plan()['ads']:
+        return False
+    record_view(Advertisement, ad_id)
+    return True
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CarpetType, Order,Profile, Media, Sovga, BarabanSpin, Advertisement
+from .models import CarpetType, Order,Profile, Media, Sovga, BarabanSpin, Advertisement, TelegramOutbox
 
 admin.site.register(CarpetType)
 admin.site.register(Order)
@@ -48,8 +48,10 @@ class BarabanSpinAdmin(admin.ModelAdmin):
 
 @admin.register(Advertisement)
 class AdvertisementAdmin(admin.ModelAdmin):
-    list_display = ('title', 'ad_type', 'views', 'created_at')
-    readonly_fields = ('views', 'created_at')
+    list_display = ('title', 'ad_type', 'priority', 'views', 'expires_at', 'is_archived', 'created_at')
+    list_editable = ('priority',)
+    list_filter = ('is_archived',)
+    readonly_fields = ('views', 'expires_at', 'created_at')
 
     def has_add_permission(self, request):
         return request.user.is_superuser
@@ -59,3 +61,11 @@ class AdvertisementAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return request.user.is_superuser
+
+
+@admin.register(TelegramOutbox)
+class TelegramOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('text', 'last_error')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
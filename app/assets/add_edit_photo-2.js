@@ -0,0 +1,74 @@
+        // Image preview for new uploads
+        const imageInput = document.getElementById('id_image');
+        const imagePreview = document.getElementById('imagePreview');
+        
+        imageInput.addEventListener('change', function(e) {
+            const file = e.target.files[0];
+            if (file) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    if (!imagePreview) {
+                        // Create preview if doesn't exist
+                        const previewDiv = document.createElement('div');
+                        previewDiv.className = 'file-preview';
+                        previewDiv.innerHTML = `
+                            <p><strong>Yangi rasm:</strong></p>
+                            <img src="${e.target.result}" alt="Preview" style="max-width: 200px; max-height: 200px; border-radius: 12px;">
+                        `;
+                        imageInput.parentElement.after(previewDiv);
+                    } else {
+                        imagePreview.src = e.target.result;
+                    }
+                }
+                reader.readAsDataURL(file);
+            }
+        });
+        
+        // Form validation
+        document.querySelector('form').addEventListener('submit', function(e) {
+            const title = document.getElementById('id_title').value.trim();
+            
+            if (!title) {
+                e.preventDefault();
+                alert('Iltimos, rasm nomini kiriting!');
+                document.getElementById('id_title').focus();
+                document.getElementById('id_title').style.borderColor = '#ef4444';
+                return false;
+            }
+            
+            return true;
+        });
+        
+        // Real-time character counter for textarea
+        const textarea = document.getElementById('id_description');
+        if (textarea) {
+            const counter = document.createElement('div');
+            counter.style.cssText = `
+                text-align: right;
+                font-size: 0.9rem;
+                color: #666;
+                margin-top: 5px;
+            `;
+            textarea.parentElement.appendChild(counter);
+            
+            textarea.addEventListener('input', function() {
+                const maxLength = 500;
+                const currentLength = this.value.length;
+                counter.textContent = `${currentLength}/${maxLength}`;
+                
+                if (currentLength > maxLength) {
+                    counter.style.color = '#ef4444';
+                    this.style.borderColor = '#ef4444';
+                } else if (currentLength > maxLength * 0.8) {
+                    counter.style.color = '#f59e0b';
+                    this.style.borderColor = '#f59e0b';
+                } else {
+                    counter.style.color = '#666';
+                    this.style.borderColor = '#e5e7eb';
+                }
+            });
+            
+            // Trigger on load
+            textarea.dispatchEvent(new Event('input'));
+        }
+    
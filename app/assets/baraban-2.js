@@ -0,0 +1,555 @@
+// ==================== PREMIUM INITIALIZATION ====================
+class PremiumBaraban {
+    constructor() {
+        this.isSpinning = false;
+        this.countdownInterval = null;
+        this.particles = [];
+        this.initElements();
+        this.initParticles();
+        this.setupEventListeners();
+    }
+    
+    // ==================== ELEMENT INITIALIZATION ====================
+    initElements() {
+        this.elements = {
+            wheel: document.getElementById('wheelCircle'),
+            spinBtn: document.getElementById('spinButton'),
+            resultModal: document.getElementById('resultModal'),
+            modalIcon: document.getElementById('modalIcon'),
+            modalTitle: document.getElementById('modalTitle'),
+            modalPrize: document.getElementById('modalPrize'),
+            modalMessage: document.getElementById('modalMessage'),
+            closeModalBtn: document.getElementById('closeModalBtn'),
+            hours: document.getElementById('hours'),
+            minutes: document.getElementById('minutes'),
+            seconds: document.getElementById('seconds'),
+            centerButton: document.getElementById('centerButton'),
+            prizesList: document.getElementById('prizesList')
+        };
+        
+        // Sovg'a ma'lumotlari (shablondagi window.BARABAN dan)
+        this.sovgalar = window.BARABAN.sovgalar;
+        
+        console.log("✅ Premium Baraban yuklandi. Sovg'alar:", this.sovgalar);
+    }
+    
+    // ==================== PARTICLES BACKGROUND ====================
+    initParticles() {
+        const container = document.getElementById('particles');
+        const particleCount = 50;
+        
+        for (let i = 0; i < particleCount; i++) {
+            const particle = document.createElement('div');
+            particle.style.position = 'absolute';
+            particle.style.width = Math.random() * 4 + 1 + 'px';
+            particle.style.height = particle.style.width;
+            particle.style.background = `rgba(255, 179, 71, ${Math.random() * 0.3 + 0.1})`;
+            particle.style.borderRadius = '50%';
+            particle.style.left = Math.random() * 100 + '%';
+            particle.style.top = Math.random() * 100 + '%';
+            particle.style.pointerEvents = 'none';
+            
+            this.particles.push({
+                element: particle,
+                x: parseFloat(particle.style.left),
+                y: parseFloat(particle.style.top),
+                speedX: (Math.random() - 0.5) * 0.2,
+                speedY: (Math.random() - 0.5) * 0.2
+            });
+            
+            container.appendChild(particle);
+        }
+        
+        this.animateParticles();
+    }
+    
+    animateParticles() {
+        this.particles.forEach(p => {
+            p.x += p.speedX;
+            p.y += p.speedY;
+            
+            // Ekran chegaralarini tekshirish
+            if (p.x < 0 || p.x > 100) p.speedX *= -1;
+            if (p.y < 0 || p.y > 100) p.speedY *= -1;
+            
+            p.element.style.left = p.x + '%';
+            p.element.style.top = p.y + '%';
+        });
+        
+        requestAnimationFrame(() => this.animateParticles());
+    }
+    
+    // ==================== WHEEL SEGMENTS CREATION ====================
+    createWheelSegments() {
+        console.log("🎨 Baraban segmentlari yaratilmoqda...");
+        
+        this.elements.wheel.innerHTML = '';
+        const totalSegments = 10;
+        const segmentAngle = 360 / totalSegments;
+        
+        for (let i = 0; i < totalSegments; i++) {
+            const segment = document.createElement('div');
+            segment.className = 'wheel-segment';
+            
+            const startAngle = i * segmentAngle;
+            segment.style.transform = `rotate(${startAngle}deg)`;
+            
+            const segmentNumber = i + 1;
+            const sovga = this.sovgalar.find(s => s.katak === segmentNumber);
+            
+            if (sovga && sovga.color) {
+                // Sovg'a mavjud bo'lsa
+                segment.style.background = this.createSegmentGradient(sovga.color);
+                segment.innerHTML = this.createSegmentContent(segmentNumber, sovga.name);
+            } else {
+                // Bo'sh katak uchun
+                segment.style.background = this.createEmptySegmentGradient(i);
+                segment.innerHTML = this.createSegmentContent(segmentNumber, "Bo'sh");
+                segment.style.opacity = '0.7';
+            }
+            
+            this.elements.wheel.appendChild(segment);
+        }
+        
+        console.log("✅ Baraban segmentlari yaratildi");
+        this.highlightOccupiedSegments();
+    }
+    
+    createSegmentGradient(baseColor) {
+        const darker = this.darkenColor(baseColor, 25);
+        const lightest = this.lightenColor(baseColor, 15);
+        return `linear-gradient(135deg, ${baseColor}, ${darker})`;
+    }
+    
+    createEmptySegmentGradient(index) {
+        const grays = ['#666666', '#777777', '#888888', '#999999', '#AAAAAA'];
+        return `linear-gradient(135deg, ${grays[index % grays.length]}, #444444)`;
+    }
+    
+    createSegmentContent(number, name) {
+        return `
+            <div class="segment-content">
+                <div class="segment-number">${number}</div>
+                <div class="segment-name">${name}</div>
+            </div>
+        `;
+    }
+    
+    highlightOccupiedSegments() {
+        this.sovgalar.forEach(sovga => {
+            const segment = document.querySelector(`.wheel-segment:nth-child(${sovga.katak})`);
+            if (segment) {
+                segment.style.boxShadow = 'inset 0 0 20px rgba(255, 255, 255, 0.2)';
+                segment.style.zIndex = '5';
+            }
+        });
+    }
+    
+    // ==================== COLOR UTILITIES ====================
+    darkenColor(color, percent) {
+        if (!color || color.length < 7) return '#000000';
+        
+        try {
+            let r = parseInt(color.slice(1, 3), 16);
+            let g = parseInt(color.slice(3, 5), 16);
+            let b = parseInt(color.slice(5, 7), 16);
+            
+            r = Math.floor(r * (100 - percent) / 100);
+            g = Math.floor(g * (100 - percent) / 100);
+            b = Math.floor(b * (100 - percent) / 100);
+            
+            return `#${r.toString(16).padStart(2, '0')}${g.toString(16).padStart(2, '0')}${b.toString(16).padStart(2, '0')}`;
+        } catch (e) {
+            return '#000000';
+        }
+    }
+    
+    lightenColor(color, percent) {
+        if (!color || color.length < 7) return '#FFFFFF';
+        
+        try {
+            let r = parseInt(color.slice(1, 3), 16);
+            let g = parseInt(color.slice(3, 5), 16);
+            let b = parseInt(color.slice(5, 7), 16);
+            
+            r = Math.min(255, Math.floor(r * (100 + percent) / 100));
+            g = Math.min(255, Math.floor(g * (100 + percent) / 100));
+            b = Math.min(255, Math.floor(b * (100 + percent) / 100));
+            
+            return `#${r.toString(16).padStart(2, '0')}${g.toString(16).padStart(2, '0')}${b.toString(16).padStart(2, '0')}`;
+        } catch (e) {
+            return '#FFFFFF';
+        }
+    }
+    
+    // ==================== PREMIUM COUNTDOWN TIMER ====================
+    startCountdown() {
+        const remainingSeconds = window.BARABAN.remainingTime;
+        
+        if (remainingSeconds <= 0) {
+            this.enableSpinButton();
+            this.updateTimerDisplay(0);
+            return;
+        }
+        
+        let timeLeft = remainingSeconds;
+        
+        const updateTimer = () => {
+            if (timeLeft <= 0) {
+                clearInterval(this.countdownInterval);
+                this.enableSpinButton();
+                this.updateTimerDisplay(0);
+                return;
+            }
+            
+            timeLeft--;
+            this.updateTimerDisplay(timeLeft);
+        };
+        
+        this.updateTimerDisplay(timeLeft);
+        this.countdownInterval = setInterval(updateTimer, 1000);
+    }
+    
+    updateTimerDisplay(totalSeconds) {
+        const hours = Math.floor(totalSeconds / 3600);
+        const minutes = Math.floor((totalSeconds % 3600) / 60);
+        const seconds = totalSeconds % 60;
+        
+        this.elements.hours.textContent = hours.toString().padStart(2, '0');
+        this.elements.minutes.textContent = minutes.toString().padStart(2, '0');
+        this.elements.seconds.textContent = seconds.toString().padStart(2, '0');
+        
+        // Animatsiya
+        if (seconds === 59) {
+            this.animateTimeUnit(this.elements.minutes);
+        }
+        if (seconds === 0) {
+            this.animateTimeUnit(this.elements.seconds);
+        }
+    }
+    
+    animateTimeUnit(element) {
+        element.style.transform = 'scale(1.1)';
+        setTimeout(() => {
+            element.style.transform = 'scale(1)';
+        }, 300);
+    }
+    
+    // ==================== SPIN FUNCTIONALITY ====================
+    async spinWheel() {
+        if (this.isSpinning) return;
+        
+        console.log("🌀 Baraban aylanmoqda...");
+        this.isSpinning = true;
+        this.disableSpinButton();
+        
+        try {
+            const csrfToken = this.getCSRFToken();
+            const response = await fetch(window.BARABAN.spinUrl, {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': csrfToken,
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `csrfmiddlewaretoken=${csrfToken}`
+            });
+            
+            const data = await response.json();
+            console.log("📊 Server javobi:", data);
+            
+            if (data.success) {
+                await this.animateWheelSpin(data.katak);
+                await this.showResult(data);
+                setTimeout(() => location.reload(), 10000);
+            } else {
+                this.showError(data.error);
+                this.resetSpinButton();
+            }
+            
+        } catch (error) {
+            console.error('❌ Spin xatosi:', error);
+            this.showError('Server bilan aloqa xatosi. Iltimos, qayta urinib ko\'ring.');
+            this.resetSpinButton();
+        }
+    }
+    
+    // ==================== PREMIUM WHEEL ANIMATION ====================
+    animateWheelSpin(winningSegment) {
+        return new Promise((resolve) => {
+            const totalSegments = 10;
+            const segmentAngle = 360 / totalSegments;
+            
+            // Realistik animatsiya parametrlari
+            const fullRotations = 5;
+            const targetAngle = 360 - ((winningSegment - 1) * segmentAngle) + (segmentAngle / 2);
+            const totalRotation = (fullRotations * 360) + targetAngle;
+            
+            // Fizikaga mos animatsiya
+            this.elements.wheel.style.transition = 'transform 4s cubic-bezier(0.2, 0.8, 0.2, 1)';
+            this.elements.wheel.style.transform = `rotate(${totalRotation}deg)`;
+            
+            // Ovoq chiqarish
+            this.playSpinSound();
+            
+            // Segmentalarni yoritish
+            this.highlightSegment(winningSegment);
+            
+            setTimeout(() => {
+                resolve();
+            }, 4000);
+        });
+    }
+    
+    highlightSegment(segmentNumber) {
+        setTimeout(() => {
+            const segments = document.querySelectorAll('.wheel-segment');
+            segments.forEach((seg, index) => {
+                if (index === segmentNumber - 1) {
+                    seg.style.boxShadow = 'inset 0 0 40px rgba(255, 255, 255, 0.4)';
+                    seg.style.zIndex = '10';
+                }
+            });
+        }, 3500);
+    }
+    
+    // ==================== PREMIUM RESULT DISPLAY ====================
+    async showResult(data) {
+        const isWin = data.sovga !== "Yutuq yo'q";
+        
+        // Modalni sozlash
+        this.elements.modalIcon.textContent = isWin ? '🎉' : '😔';
+        this.elements.modalTitle.textContent = isWin ? 'TABRIKLAYMIZ!' : 'AFSUSKI...';
+        this.elements.modalPrize.textContent = data.sovga;
+        this.elements.modalMessage.textContent = isWin 
+            ? 'Siz omadli insonsiz! Sovg\'angizni qo\'lga kiritdingiz.' 
+            : 'Bu safar omad yorilmadi. Keyingi imkoniyatingizda omad!';
+        
+        // Modalni ko'rsatish
+        await this.showModal();
+        
+        // Ovoq chiqarish
+        this.playResultSound(isWin);
+        
+        // Konfetti animatsiyasi
+        if (isWin) {
+            this.createConfetti();
+        }
+    }
+    
+    async showModal() {
+        this.elements.resultModal.style.display = 'flex';
+        await this.sleep(100);
+        this.elements.resultModal.style.opacity = '1';
+    }
+    
+    hideModal() {
+        this.elements.resultModal.style.opacity = '0';
+        setTimeout(() => {
+            this.elements.resultModal.style.display = 'none';
+        }, 300);
+    }
+    
+    // ==================== SOUND EFFECTS ====================
+    playSpinSound() {
+        try {
+            const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+            const oscillator = audioContext.createOscillator();
+            const gainNode = audioContext.createGain();
+            
+            oscillator.connect(gainNode);
+            gainNode.connect(audioContext.destination);
+            
+            oscillator.frequency.setValueAtTime(440, audioContext.currentTime);
+            oscillator.frequency.exponentialRampToValueAtTime(880, audioContext.currentTime + 3);
+            
+            gainNode.gain.setValueAtTime(0.1, audioContext.currentTime);
+            gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 3);
+            
+            oscillator.start();
+            oscillator.stop(audioContext.currentTime + 3);
+        } catch (e) {
+            console.log("Ovozni ijro eta olmadi");
+        }
+    }
+    
+    playResultSound(isWin) {
+        try {
+            const audio = new Audio();
+            audio.src = isWin 
+                ? 'https://assets.mixkit.co/sfx/preview/mixkit-winning-chimes-2015.mp3'
+                : 'https://assets.mixkit.co/sfx/preview/mixkit-wrong-answer-fail-notification-946.mp3';
+            audio.volume = 0.3;
+            audio.play().catch(e => console.log("Ovoz ijro etilmadi:", e));
+        } catch (error) {
+            console.log("Ovoz xatosi:", error);
+        }
+    }
+    
+    // ==================== CONFETTI EFFECT ====================
+    createConfetti() {
+        const colors = ['#FFB347', '#FFD166', '#FF9F1C', '#FF6B6B', '#2ECC71', '#3498DB'];
+        
+        for (let i = 0; i < 150; i++) {
+            const confetti = document.createElement('div');
+            confetti.style.position = 'fixed';
+            confetti.style.width = Math.random() * 10 + 5 + 'px';
+            confetti.style.height = confetti.style.width;
+            confetti.style.background = colors[Math.floor(Math.random() * colors.length)];
+            confetti.style.borderRadius = Math.random() > 0.5 ? '50%' : '0';
+            confetti.style.left = Math.random() * 100 + 'vw';
+            confetti.style.top = '-20px';
+            confetti.style.zIndex = '2001';
+            confetti.style.opacity = Math.random() * 0.7 + 0.3;
+            confetti.style.transform = `rotate(${Math.random() * 360}deg)`;
+            
+            document.body.appendChild(confetti);
+            
+            // Animatsiya
+            const animation = confetti.animate([
+                { transform: `translateY(0) rotate(0deg)`, opacity: 1 },
+                { transform: `translateY(${window.innerHeight + 100}px) rotate(${Math.random() * 720}deg)`, opacity: 0 }
+            ], {
+                duration: Math.random() * 3000 + 2000,
+                easing: 'cubic-bezier(0.215, 0.610, 0.355, 1)'
+            });
+            
+            animation.onfinish = () => confetti.remove();
+        }
+    }
+    
+    // ==================== UTILITY FUNCTIONS ====================
+    enableSpinButton() {
+        this.elements.spinBtn.disabled = false;
+        this.elements.spinBtn.innerHTML = '<i class="fas fa-play-circle"></i> BARABANNI AYLANTIRISH';
+    }
+    
+    disableSpinButton() {
+        this.elements.spinBtn.disabled = true;
+        this.elements.spinBtn.innerHTML = '<div class="spinner"></div> AYLANMOQDA...';
+    }
+    
+    resetSpinButton() {
+        this.isSpinning = false;
+        const canSpin = window.BARABAN.canSpin;
+        
+        if (canSpin) {
+            this.enableSpinButton();
+        } else {
+            this.elements.spinBtn.disabled = true;
+            this.elements.spinBtn.innerHTML = '<i class="fas fa-clock"></i> KUTISH KERAK';
+        }
+    }
+    
+    showError(message) {
+        alert(`Xatolik: ${message}`);
+    }
+    
+    getCSRFToken() {
+        const name = 'csrftoken';
+        let cookieValue = null;
+        
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        
+        return cookieValue || '';
+    }
+    
+    sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+    
+    // ==================== EVENT LISTENERS ====================
+    setupEventListeners() {
+        // Spin tugmasi
+        this.elements.spinBtn.addEventListener('click', () => this.spinWheel());
+        
+        // Markaziy tugma
+        this.elements.centerButton.addEventListener('click', () => {
+            if (!this.isSpinning) {
+                this.spinWheel();
+            }
+        });
+        
+        // Modal yopish tugmasi
+        this.elements.closeModalBtn.addEventListener('click', () => {
+            this.hideModal();
+            location.reload();
+        });
+        
+        // Modal tashqarisini bosganda yopish
+        this.elements.resultModal.addEventListener('click', (event) => {
+            if (event.target === this.elements.resultModal) {
+                this.hideModal();
+                location.reload();
+            }
+        });
+        
+        // Sovg'a elementlariga hover effekti
+        document.querySelectorAll('.prize-item').forEach(item => {
+            item.addEventListener('mouseenter', () => {
+                const katak = item.dataset.katak;
+                this.highlightWheelSegment(katak);
+            });
+            
+            item.addEventListener('mouseleave', () => {
+                this.resetWheelSegments();
+            });
+        });
+        
+        // Klaviatura boshqaruvi
+        document.addEventListener('keydown', (event) => {
+            if (event.code === 'Space' && !this.elements.spinBtn.disabled) {
+                event.preventDefault();
+                this.spinWheel();
+            }
+        });
+    }
+    
+    highlightWheelSegment(katak) {
+        const segments = document.querySelectorAll('.wheel-segment');
+        segments.forEach((seg, index) => {
+            if (index === parseInt(katak) - 1) {
+                seg.style.transform += ' scale(1.05)';
+                seg.style.zIndex = '15';
+            }
+        });
+    }
+    
+    resetWheelSegments() {
+        const segments = document.querySelectorAll('.wheel-segment');
+        segments.forEach((seg, index) => {
+            seg.style.transform = seg.style.transform.replace(' scale(1.05)', '');
+            seg.style.zIndex = 'auto';
+        });
+    }
+    
+    // ==================== INITIALIZATION ====================
+    initialize() {
+        console.log("🚀 Premium Baraban ishga tushmoqda...");
+        
+        // Baraban segmentlarini yaratish
+        this.createWheelSegments();
+        
+        // Timer boshlash
+        this.startCountdown();
+        
+        // Tugmalarni sozlash
+        this.resetSpinButton();
+        
+        console.log("✅ Premium Baraban tayyor!");
+    }
+}
+
+// ==================== APP INITIALIZATION ====================
+document.addEventListener('DOMContentLoaded', () => {
+    const premiumBaraban = new PremiumBaraban();
+    premiumBaraban.initialize();
+});
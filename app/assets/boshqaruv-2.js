@@ -0,0 +1,122 @@
+    // HIDE LOADING
+    window.addEventListener('load', function() {
+        document.getElementById('loading').classList.add('hidden');
+    });
+
+    // ACCORDION
+    document.querySelectorAll('.accordion-btn').forEach(btn => {
+        btn.addEventListener('click', function(e) {
+            e.preventDefault();
+            
+            // Close others
+            document.querySelectorAll('.accordion-btn').forEach(b => {
+                if (b !== this) {
+                    b.classList.remove('active');
+                    b.nextElementSibling.classList.remove('active');
+                }
+            });
+            
+            // Toggle current
+            this.classList.toggle('active');
+            const content = this.nextElementSibling;
+            content.classList.toggle('active');
+            
+            // Add neon effect
+            if (this.classList.contains('active')) {
+                this.style.animation = 'neonPulse 1s';
+                setTimeout(() => {
+                    this.style.animation = '';
+                }, 1000);
+            }
+        });
+    });
+
+    // PASSWORD TOGGLE
+    document.querySelectorAll('.toggle-password').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const targetId = this.getAttribute('data-target');
+            const input = document.getElementById(targetId);
+            
+            if (input.type === 'password') {
+                input.type = 'text';
+                this.innerHTML = '🔒 YASHIRISH';
+                this.style.background = '#ff00ff';
+                this.style.color = 'black';
+            } else {
+                input.type = 'password';
+                this.innerHTML = '👁️ KO\'RSAT';
+                this.style.background = 'transparent';
+                this.style.color = '#00ffff';
+            }
+            
+            // Add flash effect
+            this.style.transform = 'scale(1.1)';
+            setTimeout(() => {
+                this.style.transform = 'scale(1)';
+            }, 200);
+        });
+    });
+
+    // HASH NAVIGATION
+    document.addEventListener('DOMContentLoaded', function() {
+        const hash = window.location.hash;
+        if (hash === '#register') {
+            setTimeout(() => {
+                document.getElementById('register-btn').click();
+            }, 500);
+        } else if (hash === '#login') {
+            setTimeout(() => {
+                document.getElementById('login-btn').click();
+            }, 500);
+        }
+    });
+
+    // INPUT ANIMATIONS
+    document.querySelectorAll('.form-control').forEach(input => {
+        input.addEventListener('focus', function() {
+            this.parentElement.style.transform = 'translateX(10px)';
+            this.parentElement.style.transition = 'all 0.3s ease';
+        });
+        
+        input.addEventListener('blur', function() {
+            this.parentElement.style.transform = 'translateX(0)';
+        });
+    });
+
+    // PAROL KUCHE CHECK (REAL-TIME)
+    document.querySelectorAll('input[type="password"]').forEach(input => {
+        input.addEventListener('input', function() {
+            const val = this.value;
+            if (val.length > 0 && val.length < 8) {
+                this.style.borderColor = '#ff0000';
+                this.style.boxShadow = '0 0 20px #ff0000';
+            } else if (val.length >= 8) {
+                this.style.borderColor = '#00ff00';
+                this.style.boxShadow = '0 0 20px #00ff00';
+            } else {
+                this.style.borderColor = '#00ffff';
+                this.style.boxShadow = '0 0 20px #00ffff';
+            }
+        });
+    });
+
+    // MOUSE MOVE PARALLAX
+    document.addEventListener('mousemove', function(e) {
+        const moveX = (e.clientX / window.innerWidth - 0.5) * 20;
+        const moveY = (e.clientY / window.innerHeight - 0.5) * 20;
+        
+        document.querySelector('.header').style.transform = 
+            `rotateX(${moveY}deg) rotateY(${moveX}deg)`;
+    });
+
+    // RANDOM NEON FLICKER
+    setInterval(() => {
+        const randomItem = Math.floor(Math.random() * document.querySelectorAll('.accordion-item').length);
+        const item = document.querySelectorAll('.accordion-item')[randomItem];
+        if (item) {
+            item.style.boxShadow = '0 0 50px #ff00ff, 0 0 100px #00ffff';
+            setTimeout(() => {
+                item.style.boxShadow = '';
+            }, 200);
+        }
+    }, 3000);
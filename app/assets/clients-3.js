@@ -0,0 +1,56 @@
+    $(document).ready(function() {
+        // Keyingi sahifalarni JSON orqali yuklash (keyset: ?before=<oxirgi id>)
+        $('#loadMoreOrders').on('click', function() {
+            const button = this;
+            const cursor = button.dataset.cursor;
+            if (!cursor) return;
+
+            // Joriy filtrlar ham yuboriladi
+            const filterForm = document.getElementById('ordersFilter');
+            const params = new URLSearchParams(filterForm ? new FormData(filterForm) : undefined);
+            params.set('before', cursor);
+
+            button.disabled = true;
+            fetch(`${button.dataset.url}?${params.toString()}`, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+                .then(response => response.json())
+                .then(data => {
+                    document.querySelector('#clientsTable tbody').insertAdjacentHTML('beforeend', data.html);
+                    button.dataset.cursor = data.next_cursor || '';
+                    button.hidden = !data.next_cursor;
+                })
+                .catch(error => console.error('Buyurtmalarni yuklashda xatolik:', error))
+                .finally(() => { button.disabled = false; });
+        });
+
+        // Delegatsiya: keyin yuklangan qatorlarda ham ishlaydi
+        $(document).on('submit', '.status-form', function(e){
+            e.preventDefault();
+            let form = $(this);
+            let tr = form.closest('tr');
+            let orderId = tr.data('id');
+            let status = form.find('button[name="status"]:focus').val();
+            let csrfToken = form.find('input[name="csrfmiddlewaretoken"]').val();
+
+            $.ajax({
+                url: `/order/${orderId}/update-status/`,
+                method: 'POST',
+                data: { status: status, csrfmiddlewaretoken: csrfToken },
+                success: function(){
+                    // Badge yangilash
+                    let badge = tr.find('.status-badge');
+                    let oldStatus = ['new', 'processing', 'completed'].find(s => badge.hasClass('status-' + s));
+                    badge.removeClass('status-new status-processing status-completed')
+                         .addClass('status-' + status)
+                         .text(status.charAt(0).toUpperCase() + status.slice(1));
+
+                    // Statistika yangilash (jadvalda faqat bitta sahifa bor,
+                    // shuning uchun qatorlarni sanamasdan hisoblagichlarni o'zgartiramiz)
+                    const counters = {new: '#newOrders', processing: '#processingOrders', completed: '#completedOrders'};
+                    if (oldStatus && oldStatus !== status) {
+                        $(counters[oldStatus]).text(parseInt($(counters[oldStatus]).text()) - 1);
+                        $(counters[status]).text(parseInt($(counters[status]).text()) + 1);
+                    }
+                }
+            });
+        });
+    });
@@ -0,0 +1,96 @@
+        let currentYutuqId = null;
+        
+        function markAsUsed(yutuqId) {
+            if (confirm("Bu yutuqni ishlatilgan deb belgilamoqchimisiz?")) {
+                fetch(`/admin/mark-used/${yutuqId}/`, {
+                    method: 'POST',
+                    headers: {
+                        'X-CSRFToken': getCookie('csrftoken'),
+                        'Content-Type': 'application/x-www-form-urlencoded',
+                    },
+                    body: `csrfmiddlewaretoken=${getCookie('csrftoken')}`
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        alert('Yutuq ishlatilgan deb belgilandi!');
+                        location.reload();
+                    } else {
+                        alert('Xatolik: ' + data.error);
+                    }
+                })
+                .catch(error => {
+                    console.error('Xatolik:', error);
+                    alert('Server bilan aloqa xatosi');
+                });
+            }
+        }
+        
+        function editYutuq(yutuqId) {
+            currentYutuqId = yutuqId;
+            document.getElementById('editModal').style.display = 'flex';
+            
+            // Formani to'ldirish
+            fetch(`/admin/get-yutuq/${yutuqId}/`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        document.getElementById('izoh').value = data.izoh || '';
+                        document.getElementById('ishlatildi').checked = data.ishlatildi || false;
+                    }
+                });
+        }
+        
+        function closeModal() {
+            document.getElementById('editModal').style.display = 'none';
+            currentYutuqId = null;
+        }
+        
+        document.getElementById('editForm').addEventListener('submit', function(e) {
+            e.preventDefault();
+            
+            const formData = new FormData(this);
+            formData.append('yutuq_id', currentYutuqId);
+            
+            fetch('/admin/update-yutuq/', {
+                method: 'POST',
+                headers: {
+                    'X-CSRFToken': getCookie('csrftoken'),
+                },
+                body: formData
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    alert('Yutuq muvaffaqiyatli yangilandi!');
+                    closeModal();
+                    location.reload();
+                } else {
+                    alert('Xatolik: ' + data.error);
+                }
+            });
+        });
+        
+        function getCookie(name) {
+            let cookieValue = null;
+            if (document.cookie && document.cookie !== '') {
+                const cookies = document.cookie.split(';');
+                for (let i = 0; i < cookies.length; i++) {
+                    const cookie = cookies[i].trim();
+                    if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                        cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                        break;
+                    }
+                }
+            }
+            return cookieValue;
+        }
+        
+        // Modal tashqarisini bosganda yopish
+        window.onclick = function(event) {
+            const modal = document.getElementById('editModal');
+            if (event.target === modal) {
+                closeModal();
+            }
+        }
+    
@@ -0,0 +1,183 @@
+    // VIDEO VA SURATLAR GALEREYASI JAVASCRIPT KODLARI
+    
+    // Promo timer
+    function startPromoTimer() {
+        const promoTimer = document.getElementById('promoTimer');
+        if (!promoTimer) return;
+        let seconds = 24 * 60 * 60; // 24 soat
+        
+        const timer = setInterval(() => {
+            const hours = Math.floor(seconds / 3600);
+            const minutes = Math.floor((seconds % 3600) / 60);
+            const secs = seconds % 60;
+            
+            promoTimer.textContent = 
+                `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}`;
+            
+            if (seconds <= 0) {
+                clearInterval(timer);
+            } else {
+                seconds--;
+            }
+        }, 1000);
+    }
+
+    // Video o'ynatish
+    function playVideo(url, title) {
+        const modal = document.getElementById('videoModal');
+        const videoPlayer = document.getElementById('modalVideoPlayer');
+        const titleElement = document.getElementById('videoModalTitle');
+        
+        titleElement.textContent = title;
+        videoPlayer.src = url;
+        modal.style.display = 'flex';
+        videoPlayer.play();
+    }
+
+    // Suratni ochish
+    function openImageModal(url, title) {
+        const modal = document.getElementById('imageModal');
+        const imageElement = document.getElementById('modalImage');
+        const titleElement = document.getElementById('imageModalTitle');
+        
+        titleElement.textContent = title;
+        imageElement.src = url;
+        modal.style.display = 'flex';
+    }
+
+    // Modalni yopish funksiyalari
+    function closeVideoModal() {
+        const modal = document.getElementById('videoModal');
+        const videoPlayer = document.getElementById('modalVideoPlayer');
+        
+        modal.style.display = 'none';
+        videoPlayer.pause();
+        videoPlayer.currentTime = 0;
+    }
+
+    function closeImageModal() {
+        document.getElementById('imageModal').style.display = 'none';
+    }
+
+    // Reklamani yopish
+    function closeAd() {
+        document.querySelector('.ad-banner').style.display = 'none';
+    }
+
+    // Promo tafsilotlari
+    function showPromoDetails() {
+        alert('Maxsus chegirma: 3 ta va undan ortiq gilam yuvish uchun 10% chegirma. Taklif faqat bugun amal qiladi!');
+    }
+
+    // Rasmni yuklab olish
+    function downloadImage() {
+        const imageUrl = document.getElementById('modalImage').src;
+        const link = document.createElement('a');
+        link.href = imageUrl;
+        link.download = 'anor-gilam-' + Date.now() + '.jpg';
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+    }
+
+    // Tashqariga bosilsa modal yopiladi
+    window.addEventListener('click', function(event) {
+        const videoModal = document.getElementById('videoModal');
+        const imageModal = document.getElementById('imageModal');
+        
+        if (event.target === videoModal) {
+            closeVideoModal();
+        }
+        if (event.target === imageModal) {
+            closeImageModal();
+        }
+    });
+
+    // Sahifa yuklanganda timer ishga tushadi
+    document.addEventListener('DOMContentLoaded', function() {
+        startPromoTimer();
+        
+        // Video va surat modal elementlarini tekshirish
+        const videoModal = document.getElementById('videoModal');
+        const imageModal = document.getElementById('imageModal');
+        
+        if (!videoModal) {
+            console.log('Video modal topilmadi');
+        }
+        
+        if (!imageModal) {
+            console.log('Image modal topilmadi');
+        }
+    });
+        document.querySelectorAll('.pomegranate-btn').forEach(btn => {
+        btn.addEventListener('click', () => {
+            btn.style.transform = 'scale(0.95)';
+            setTimeout(() => {
+                btn.style.transform = 'scale(1)';
+            }, 150);
+        });
+    });
+
+        // Button click effects
+    document.querySelectorAll('.pro-btn, .pomegranate-btn').forEach(button => {
+        button.addEventListener('click', function(e) {
+            // Ripple effect
+            const ripple = document.createElement('span');
+            const rect = this.getBoundingClientRect();
+            const size = Math.max(rect.width, rect.height);
+            const x = e.clientX - rect.left - size / 2;
+            const y = e.clientY - rect.top - size / 2;
+            
+            ripple.style.cssText = `
+                position: absolute;
+                border-radius: 50%;
+                background: rgba(255, 255, 255, 0.7);
+                transform: scale(0);
+                animation: ripple 0.6s linear;
+                width: ${size}px;
+                height: ${size}px;
+                top: ${y}px;
+                left: ${x}px;
+                pointer-events: none;
+            `;
+            
+            this.appendChild(ripple);
+            
+            setTimeout(() => {
+                ripple.remove();
+            }, 600);
+        });
+    });
+
+    // Button hover sound effect (optional)
+    document.querySelectorAll('.pro-btn, .pomegranate-btn').forEach(button => {
+        button.addEventListener('mouseenter', function() {
+            this.style.transition = 'all 0.3s ease';
+        });
+        
+        button.addEventListener('mouseleave', function() {
+            this.style.transition = 'all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275)';
+        });
+    });
+
+    // Add CSS for ripple effect
+    const style = document.createElement('style');
+    style.textContent = `
+    @keyframes ripple {
+        to {
+            transform: scale(4);
+            opacity: 0;
+        }
+    }
+        `;
+        document.head.appendChild(style);
+
+        document.querySelectorAll(".profile-btn").forEach(btn => {
+        btn.addEventListener("mouseenter", () => {
+            btn.style.letterSpacing = "1px";
+        });
+
+        btn.addEventListener("mouseleave", () => {
+            btn.style.letterSpacing = "0px";
+        });
+    });
@@ -0,0 +1,364 @@
+        // Create floating geometric shapes
+        function createShapes() {
+            const shapesContainer = document.getElementById('shapes');
+            const shapeCount = 20;
+            const shapeTypes = ['triangle', 'circle', 'square'];
+            
+            for (let i = 0; i < shapeCount; i++) {
+                const shape = document.createElement('div');
+                shape.className = `shape ${shapeTypes[Math.floor(Math.random() * shapeTypes.length)]}`;
+                
+                const size = Math.random() * 80 + 20;
+                const x = Math.random() * 100;
+                const y = Math.random() * 100;
+                const duration = Math.random() * 25 + 15;
+                const delay = Math.random() * 10;
+                const color = `rgba(${Math.random() * 255}, ${Math.random() * 255}, ${Math.random() * 255}, 0.1)`;
+                
+                shape.style.width = `${size}px`;
+                shape.style.height = `${size}px`;
+                shape.style.left = `${x}vw`;
+                shape.style.top = `${y}vh`;
+                shape.style.animationDuration = `${duration}s`;
+                shape.style.animationDelay = `${delay}s`;
+                shape.style.background = color;
+                
+                shapesContainer.appendChild(shape);
+            }
+        }
+        
+        // Variables
+        let currentPhotoIndex = 0;
+        let viewer;
+        let photoItems = Array.from(document.querySelectorAll('.photo-item'));
+        
+        // gallery.js yangi rasmlarni qo'shganda ro'yxat va viewer yangilanadi
+        document.addEventListener('gallery:loaded', function() {
+            photoItems = Array.from(document.querySelectorAll('.photo-item'));
+            if (viewer) viewer.update();
+        });
+        
+        // Initialize
+        document.addEventListener('DOMContentLoaded', function() {
+            createShapes();
+            setupSwipeNavigation();
+            initializeViewer();
+            setActiveMode('normal'); // Boshlang'ich holat normal
+        });
+        
+        // Initialize image viewer
+        function initializeViewer() {
+            const images = Array.from(document.querySelectorAll('.photo-image'));
+            viewer = new Viewer(document.getElementById('photosGrid'), {
+                inline: false,
+                toolbar: {
+                    zoomIn: true,
+                    zoomOut: true,
+                    oneToOne: true,
+                    reset: true,
+                    prev: true,
+                    play: true,
+                    next: true,
+                    rotateLeft: true,
+                    rotateRight: true,
+                    flipHorizontal: true,
+                    flipVertical: true,
+                },
+                viewed() {
+                    const index = this.index;
+                    updateImageInfo(index);
+                }
+            });
+        }
+        
+        // Open image viewer (custom modal)
+        function openImageViewer(photoItem) {
+            const photoUrl = photoItem.dataset.photoUrl;
+            const photoTitle = photoItem.dataset.photoTitle;
+            
+            currentPhotoIndex = photoItems.indexOf(photoItem);
+            
+            // Update modal content
+            document.getElementById('viewerImage').src = photoUrl;
+            updateImageInfo(currentPhotoIndex);
+            
+            // Reset image mode to normal when opening
+            setImageMode('normal');
+            
+            // Show modal
+            document.getElementById('imageViewer').style.display = 'block';
+            document.body.style.overflow = 'hidden';
+        }
+        
+        // Close image viewer
+        function closeImageViewer() {
+            document.getElementById('imageViewer').style.display = 'none';
+            document.getElementById('downloadOptions').style.display = 'none';
+            document.body.style.overflow = 'auto';
+        }
+        
+        // Update image info in modal
+        function updateImageInfo(index) {
+            const photo = photoItems[index];
+            if (!photo) return;
+            
+            document.getElementById('viewerTitle').textContent = photo.dataset.photoTitle;
+            document.getElementById('viewerDescription').textContent = photo.dataset.photoDescription || 'Tasvir haqida ma\'lumot yo\'q';
+            document.getElementById('viewerDate').textContent = photo.dataset.photoDate;
+            document.getElementById('viewerViews').textContent = photo.dataset.photoViews;
+            document.getElementById('viewerLikes').textContent = photo.dataset.photoLikes;
+            document.getElementById('viewerSize').textContent = photo.dataset.photoSize;
+        }
+        
+        // YANGI FUNKSIYA: Suratni kichiklashtirish, normal va ekranni to'ldirish rejimlari
+        function setImageMode(mode) {
+            const image = document.getElementById('viewerImage');
+            
+            // Remove all mode classes
+            image.classList.remove('small-mode', 'fullscreen-mode');
+            
+            // Add class based on mode
+            switch(mode) {
+                case 'small':
+                    image.classList.add('small-mode');
+                    break;
+                case 'fullscreen':
+                    image.classList.add('fullscreen-mode');
+                    break;
+                case 'normal':
+                default:
+                    // No additional class needed
+                    break;
+            }
+            
+            // Update active button state
+            setActiveMode(mode);
+        }
+        
+        // Active rejimni ko'rsatish
+        function setActiveMode(mode) {
+            // Remove active class from all zoom buttons
+            document.getElementById('smallModeBtn').classList.remove('active');
+            document.getElementById('normalModeBtn').classList.remove('active');
+            document.getElementById('fullscreenModeBtn').classList.remove('active');
+            
+            // Add active class to selected mode
+            if (mode === 'small') {
+                document.getElementById('smallModeBtn').classList.add('active');
+            } else if (mode === 'normal') {
+                document.getElementById('normalModeBtn').classList.add('active');
+            } else if (mode === 'fullscreen') {
+                document.getElementById('fullscreenModeBtn').classList.add('active');
+            }
+        }
+        
+        // Download image
+        function downloadImage() {
+            const downloadOptions = document.getElementById('downloadOptions');
+            downloadOptions.style.display = downloadOptions.style.display === 'flex' ? 'none' : 'flex';
+        }
+        
+        // Download specific size
+        function downloadImageSize(size) {
+            const currentPhoto = photoItems[currentPhotoIndex];
+            const photoUrl = currentPhoto.dataset.photoUrl;
+            const photoTitle = currentPhoto.dataset.photoTitle;
+            
+            let downloadUrl = photoUrl;
+            
+            // In a real app, you would modify the URL based on size
+            // This is just a demo
+            if (size !== 'original') {
+                alert(`"${photoTitle}" rasmi ${size}p sifatida yuklanmoqda...\n(Demo: Faqat original o'lcham yuklanadi)`);
+            }
+            
+            const a = document.createElement('a');
+            a.href = downloadUrl;
+            a.download = `${photoTitle}_${size}p.jpg`;
+            document.body.appendChild(a);
+            a.click();
+            document.body.removeChild(a);
+            
+            document.getElementById('downloadOptions').style.display = 'none';
+        }
+        
+        // Share image
+        function shareImage() {
+            const photo = photoItems[currentPhotoIndex];
+            if (navigator.share) {
+                navigator.share({
+                    title: photo.dataset.photoTitle,
+                    text: 'Bu rasmni baham ko\'ring!',
+                    url: photo.dataset.photoUrl,
+                });
+            } else {
+                alert("Share funksiyasi brauzeringizda qo'llab-quvvatlanmaydi. Rasm URL manzili: " + photo.dataset.photoUrl);
+            }
+        }
+        
+        // Apply filters to image
+        function toggleFilters() {
+            const image = document.getElementById('viewerImage');
+            const filters = [
+                'none',
+                'grayscale(100%)',
+                'sepia(100%)',
+                'invert(100%)',
+                'hue-rotate(90deg)',
+                'saturate(200%)',
+                'contrast(200%)',
+                'brightness(150%)'
+            ];
+            
+            let currentFilter = image.style.filter || 'none';
+            let currentIndex = filters.indexOf(currentFilter);
+            let nextIndex = (currentIndex + 1) % filters.length;
+            
+            image.style.filter = filters[nextIndex];
+        }
+        
+        // Filter photos
+        function filterPhotos(filter) {
+            const filterBtns = document.querySelectorAll('.filter-btn');
+            filterBtns.forEach(btn => btn.classList.remove('active'));
+            event.target.classList.add('active');
+            
+            // In a real app, you would filter photos here
+            // This is just a demo animation
+            photoItems.forEach((item, index) => {
+                item.style.animationDelay = `${index * 0.1}s`;
+                item.style.opacity = '0';
+                item.style.transform = 'translateY(20px)';
+                
+                setTimeout(() => {
+                    item.style.opacity = '1';
+                    item.style.transform = 'translateY(0)';
+                }, index * 50 + 300);
+            });
+        }
+        
+        // Load more photos
+        function loadMorePhotos() {
+            const btn = document.querySelector('.load-more-btn');
+            btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Yuklanmoqda...';
+            
+            // Simulate loading
+            setTimeout(() => {
+                // Here you would make an AJAX request to load more photos
+                alert("Yangi rasmlar yuklandi! (Bu demo versiya)");
+                btn.innerHTML = '<i class="fas fa-check"></i> Yuklandi';
+                
+                // After 2 seconds, reset button
+                setTimeout(() => {
+                    btn.innerHTML = '<i class="fas fa-sync-alt"></i> Ko\'proq yuklash';
+                }, 2000);
+            }, 1500);
+        }
+        
+        // Swipe navigation
+        function setupSwipeNavigation() {
+            let startX, startY;
+            const threshold = 50;
+            
+            document.addEventListener('touchstart', e => {
+                startX = e.touches[0].clientX;
+                startY = e.touches[0].clientY;
+            });
+            
+            document.addEventListener('touchend', e => {
+                const endX = e.changedTouches[0].clientX;
+                const endY = e.changedTouches[0].clientY;
+                
+                const diffX = startX - endX;
+                const diffY = startY - endY;
+                
+                // Only horizontal swipe
+                if (Math.abs(diffX) > Math.abs(diffY) && Math.abs(diffX) > threshold) {
+                    if (diffX > 0) {
+                        // Swipe left - next photo
+                        navigateToPhoto('next');
+                    } else {
+                        // Swipe right - previous photo
+                        navigateToPhoto('prev');
+                    }
+                }
+            });
+        }
+        
+        // Navigate between photos
+        function navigateToPhoto(direction) {
+            if (document.getElementById('imageViewer').style.display !== 'block') return;
+            
+            if (direction === 'next' && currentPhotoIndex < photoItems.length - 1) {
+                currentPhotoIndex++;
+            } else if (direction === 'prev' && currentPhotoIndex > 0) {
+                currentPhotoIndex--;
+            } else {
+                return; // No more photos in that direction
+            }
+            
+            // Update viewer with new photo
+            const newPhoto = photoItems[currentPhotoIndex];
+            document.getElementById('viewerImage').src = newPhoto.dataset.photoUrl;
+            updateImageInfo(currentPhotoIndex);
+            
+            // Reset to normal mode when switching photos
+            setImageMode('normal');
+        }
+        
+        // Keyboard shortcuts
+        document.addEventListener('keydown', function(e) {
+            if (document.getElementById('imageViewer').style.display === 'block') {
+                switch(e.key) {
+                    case 'Escape':
+                        closeImageViewer();
+                        break;
+                    case 'ArrowLeft':
+                        navigateToPhoto('prev');
+                        break;
+                    case 'ArrowRight':
+                        navigateToPhoto('next');
+                        break;
+                    case 'd':
+                        downloadImage();
+                        break;
+                    case 'f':
+                        toggleFilters();
+                        break;
+                    case '1': // 1 - Kichiklashtirish
+                        setImageMode('small');
+                        break;
+                    case '2': // 2 - Normal holat
+                        setImageMode('normal');
+                        break;
+                    case '3': // 3 - Ekranni to'ldirish
+                        setImageMode('fullscreen');
+                        break;
+                }
+            }
+        });
+        
+        // Close download options when clicking outside
+        document.addEventListener('click', function(e) {
+            if (!e.target.closest('.download-btn') && !e.target.closest('.viewer-btn')) {
+                document.getElementById('downloadOptions').style.display = 'none';
+            }
+        });
+
+        function toggleFullscreen() {
+            const viewer = document.getElementById("imageViewer");
+            const icon = document.getElementById("fullscreenIcon");
+
+            if (!document.fullscreenElement) {
+                viewer.requestFullscreen().then(() => {
+                    icon.classList.remove("fa-expand");
+                    icon.classList.add("fa-compress");
+                });
+            } else {
+                document.exitFullscreen().then(() => {
+                    icon.classList.remove("fa-compress");
+                    icon.classList.add("fa-expand");
+                });
+            }
+        }
+    
@@ -0,0 +1,136 @@
+        // Avatar Preview
+        const avatarInput = document.getElementById('avatar');
+        const avatarPreview = document.getElementById('avatarPreview');
+        
+        avatarInput.addEventListener('change', function(e) {
+            const file = e.target.files[0];
+            if (file) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    avatarPreview.src = e.target.result;
+                    
+                    // Add animation effect
+                    avatarPreview.style.transform = 'scale(1.1)';
+                    setTimeout(() => {
+                        avatarPreview.style.transform = 'scale(1)';
+                    }, 300);
+                }
+                reader.readAsDataURL(file);
+            }
+        });
+        
+        // Form validation
+        document.querySelector('form').addEventListener('submit', function(e) {
+            const phoneInput = document.getElementById('phone');
+            const phoneValue = phoneInput.value.trim();
+            
+            if (phoneValue && !/^\+[0-9]{12}$/.test(phoneValue)) {
+                e.preventDefault();
+                alert('Iltimos, telefon raqamini toʻgʻri formatda kiriting: +998901234567');
+                phoneInput.focus();
+                phoneInput.style.borderColor = 'var(--danger)';
+                return false;
+            }
+            
+            return true;
+        });
+        
+        // Input focus effects
+        const inputs = document.querySelectorAll('.form-input');
+        inputs.forEach(input => {
+            input.addEventListener('focus', function() {
+                this.parentElement.style.transform = 'translateY(-2px)';
+            });
+            
+            input.addEventListener('blur', function() {
+                this.parentElement.style.transform = 'translateY(0)';
+            });
+        });
+        
+        // Add character counter for text inputs
+        inputs.forEach(input => {
+            if (input.type === 'text' || input.type === 'textarea') {
+                input.addEventListener('input', function() {
+                    const maxLength = this.maxLength || 100;
+                    const currentLength = this.value.length;
+                    const counter = this.parentElement.querySelector('.char-counter') || 
+                                    document.createElement('div');
+                    
+                    if (!counter.classList.contains('char-counter')) {
+                        counter.className = 'char-counter';
+                        counter.style.cssText = `
+                            position: absolute;
+                            right: 20px;
+                            bottom: -20px;
+                            font-size: 0.8rem;
+                            color: var(--gray-500);
+                        `;
+                        this.parentElement.style.position = 'relative';
+                        this.parentElement.appendChild(counter);
+                    }
+                    
+                    counter.textContent = `${currentLength}/${maxLength}`;
+                    
+                    if (currentLength > maxLength * 0.8) {
+                        counter.style.color = 'var(--warning)';
+                    } else {
+                        counter.style.color = 'var(--gray-500)';
+                    }
+                });
+            }
+        });
+        
+        // Page load animation
+        document.addEventListener('DOMContentLoaded', function() {
+            document.body.style.opacity = '0';
+            document.body.style.transition = 'opacity 0.5s ease';
+            
+            setTimeout(() => {
+                document.body.style.opacity = '1';
+            }, 100);
+            
+            // Add particles on mouse move
+            document.addEventListener('mousemove', function(e) {
+                if (Math.random() > 0.7) {
+                    createParticle(e.clientX, e.clientY);
+                }
+            });
+        });
+        
+        function createParticle(x, y) {
+            const particle = document.createElement('div');
+            particle.style.cssText = `
+                position: fixed;
+                width: 4px;
+                height: 4px;
+                background: var(--primary-light);
+                border-radius: 50%;
+                pointer-events: none;
+                z-index: 9999;
+                top: ${y}px;
+                left: ${x}px;
+                animation: particleAnimation 1s ease forwards;
+            `;
+            
+            document.body.appendChild(particle);
+            
+            setTimeout(() => {
+                particle.remove();
+            }, 1000);
+        }
+        
+        const styleSheet = document.createElement('style');
+        styleSheet.textContent = `
+            @keyframes particleAnimation {
+                0% {
+                    transform: translate(0, 0) scale(1);
+                    opacity: 1;
+                }
+                100% {
+                    transform: translate(${Math.random() * 100 - 50}px, ${Math.random() * 100 - 50}px) scale(0);
+                    opacity: 0;
+                }
+            }
+        `;
+        document.head.appendChild(styleSheet);
+    
@@ -0,0 +1,235 @@
+// Star rating functionality
+function setupStars(starsContainerId, sliderId, valueId) {
+    const stars = document.querySelectorAll(`#${starsContainerId} i`);
+    const slider = document.getElementById(sliderId);
+    const valueDisplay = document.getElementById(valueId);
+    
+    // Click stars
+    stars.forEach(star => {
+        star.addEventListener('click', function() {
+            const value = parseFloat(this.getAttribute('data-value'));
+            slider.value = value;
+            valueDisplay.textContent = value.toFixed(1);
+            updateStars(stars, value);
+        });
+    });
+    
+    // Move slider
+    slider.addEventListener('input', function() {
+        const value = parseFloat(this.value);
+        valueDisplay.textContent = value.toFixed(1);
+        updateStars(stars, value);
+    });
+    
+    function updateStars(stars, rating) {
+        stars.forEach(star => {
+            const starValue = parseFloat(star.getAttribute('data-value'));
+            star.classList.remove('fas', 'far', 'fa-star-half-alt');
+            
+            if (starValue <= rating) {
+                star.className = 'fas fa-star active';
+            } else if (starValue - 0.5 <= rating) {
+                star.className = 'fas fa-star-half-alt active';
+            } else {
+                star.className = 'far fa-star';
+            }
+        });
+    }
+    
+    // Initial update
+    updateStars(stars, parseFloat(slider.value));
+}
+
+// ANOR BURST EFFECT
+function anarBoom(x = null, y = null, count = 20) {
+    for (let i = 0; i < count; i++) {
+        let a = document.createElement('div');
+        a.className = 'anor';
+        a.innerText = '🍎';
+        a.style.left = (x || Math.random() * window.innerWidth) + 'px';
+        a.style.top = (y || window.innerHeight - 100) + 'px';
+        document.body.appendChild(a);
+        setTimeout(() => a.remove(), 1000);
+    }
+}
+
+// MESSAGE TOAST
+function showMessage(message, type = 'success') {
+    const toast = document.getElementById('messageToast');
+    toast.textContent = message;
+    toast.className = `message ${type}`;
+    toast.style.display = 'block';
+    
+    setTimeout(() => {
+        toast.style.display = 'none';
+    }, 4000);
+}
+
+// EDIT MODAL
+let currentReviewId = null;
+
+function editReview(reviewId) {
+    currentReviewId = reviewId;
+    document.getElementById('editModal').style.display = 'flex';
+    
+    // Fetch review data
+    fetch(`/api/get-review/${reviewId}/`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                document.getElementById('editRatingSlider').value = data.review.rating;
+                document.getElementById('editRatingValue').textContent = data.review.rating;
+                document.getElementById('editComment').value = data.review.comment;
+                
+                // Update stars
+                setupStars('editStars', 'editRatingSlider', 'editRatingValue');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showMessage('Xatolik yuz berdi!', 'error');
+        });
+}
+
+function closeEditModal() {
+    document.getElementById('editModal').style.display = 'none';
+    currentReviewId = null;
+}
+
+// DELETE REVIEW
+function deleteReview(reviewId) {
+    if (confirm("Haqiqatan ham bu sharhni o'chirmoqchimisiz?")) {
+        fetch(`/api/delete-review/${reviewId}/`, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
+                'Content-Type': 'application/x-www-form-urlencoded',
+            },
+            body: `csrfmiddlewaretoken=${document.querySelector('[name=csrfmiddlewaretoken]').value}`
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                showMessage('Sharh o\'chirildi!', 'success');
+                setTimeout(() => location.reload(), 1500);
+            } else {
+                showMessage(data.error, 'error');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showMessage('Server xatosi!', 'error');
+        });
+    }
+}
+
+// SUBMIT REVIEW FORM
+document.getElementById('reviewForm')?.addEventListener('submit', function(e) {
+    e.preventDefault();
+    
+    const formData = new FormData(this);
+    
+    fetch(this.action, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
+        },
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showMessage(data.message, 'success');
+            anarBoom(); // Anor burst effect
+            setTimeout(() => location.reload(), 1500);
+        } else {
+            showMessage(data.error, 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showMessage('Server xatosi!', 'error');
+    });
+});
+
+// SUBMIT EDIT FORM
+document.getElementById('editForm')?.addEventListener('submit', function(e) {
+    e.preventDefault();
+    
+    const formData = new FormData(this);
+    formData.append('review_id', currentReviewId);
+    
+    fetch(`/api/edit-review/${currentReviewId}/`, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]').value,
+        },
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showMessage('Sharh muvaffaqiyatli yangilandi!', 'success');
+            closeEditModal();
+            setTimeout(() => location.reload(), 1500);
+        } else {
+            showMessage(data.error, 'error');
+        }
+    });
+});
+
+// Initialize
+document.addEventListener('DOMContentLoaded', function() {
+    setupStars('stars', 'ratingSlider', 'ratingValue');
+    
+    // Button animation
+    document.querySelectorAll('.action-btn').forEach(btn => {
+        btn.addEventListener('click', function(e) {
+            this.style.transform = 'scale(0.9)';
+            setTimeout(() => this.style.transform = '', 120);
+            
+            if (this.classList.contains('delete-btn')) {
+                anarBoom(e.clientX, e.clientY, 10);
+            }
+        });
+    });
+    
+    // Close modal on outside click
+    document.getElementById('editModal')?.addEventListener('click', function(e) {
+        if (e.target === this) {
+            closeEditModal();
+        }
+    });
+});
+
+// Cheksiz skroll: sentinel ko'ringanda keyingi sahifa (?cursor=<next_cursor>) yuklanadi
+(function() {
+    const sentinel = document.getElementById('reviewsSentinel');
+    const feed = document.getElementById('reviewsFeed');
+    if (!sentinel || !feed || !('IntersectionObserver' in window)) return;
+
+    let loading = false;
+    const observer = new IntersectionObserver(entries => {
+        if (!entries.some(entry => entry.isIntersecting) || loading) return;
+        const cursor = sentinel.dataset.cursor;
+        if (!cursor) return;
+
+        loading = true;
+        fetch(`${sentinel.dataset.url}?cursor=${encodeURIComponent(cursor)}`, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+            .then(response => response.json())
+            .then(data => {
+                feed.insertAdjacentHTML('beforeend', data.html);
+                const shown = document.getElementById('reviewsShown');
+                if (shown) shown.textContent = feed.querySelectorAll('.review').length;
+                sentinel.dataset.cursor = data.next_cursor || '';
+                if (!data.next_cursor) {
+                    sentinel.hidden = true;
+                    observer.disconnect();
+                }
+            })
+            .catch(error => console.error('Sharhlarni yuklashda xatolik:', error))
+            .finally(() => { loading = false; });
+    }, {rootMargin: '400px 0px'});
+
+    observer.observe(sentinel);
+})();
@@ -0,0 +1,35 @@
+    // Yangi video fayllar bo'laklab yuklanadi (sekin/uziladigan aloqada ham davom etadi)
+    (function() {
+        const form = document.getElementById('mediaForm');
+        if (!form || !form.dataset.chunked) return;
+
+        form.addEventListener('submit', async function(e) {
+            const fileInput = form.querySelector('[name="video_file"]');
+            const file = fileInput && fileInput.files[0];
+            if (form.querySelector('[name="media_type"]').value !== 'video' || !file) return;
+
+            e.preventDefault();
+            const button = form.querySelector('button[type="submit"]');
+            const label = button.querySelector('.text');
+            const originalLabel = label.textContent;
+            button.disabled = true;
+
+            try {
+                await window.chunkedUpload(file, {
+                    media_type: 'video',
+                    title: form.querySelector('[name="title"]').value,
+                    description: form.querySelector('[name="description"]').value,
+                    duration: form.querySelector('[name="duration"]').value,
+                    is_active: form.querySelector('[name="is_active"]').checked,
+                }, {
+                    csrfToken: form.querySelector('[name="csrfmiddlewaretoken"]').value,
+                    onProgress: ratio => { label.textContent = `YUKLANMOQDA ${Math.round(ratio * 100)}%`; },
+                });
+                window.location.href = form.dataset.successUrl;
+            } catch (error) {
+                alert("Yuklashda xatolik: " + error.message + ". Qayta bosing - yuklash to'xtagan joyidan davom etadi.");
+                label.textContent = originalLabel;
+                button.disabled = false;
+            }
+        });
+    })();
@@ -0,0 +1,120 @@
+    // Hover effects for all interactive elements
+    document.addEventListener('DOMContentLoaded', function() {
+        // Form field focus effects
+        const formControls = document.querySelectorAll('.form-control');
+        formControls.forEach(control => {
+            control.addEventListener('focus', function() {
+                this.parentElement.style.transform = 'translateY(-5px)';
+            });
+            
+            control.addEventListener('blur', function() {
+                this.parentElement.style.transform = 'translateY(0)';
+            });
+        });
+        
+        // Table row hover effects
+        const tableRows = document.querySelectorAll('.media-table tbody tr');
+        tableRows.forEach(row => {
+            row.addEventListener('mouseenter', function() {
+                this.style.boxShadow = '0 10px 30px rgba(255, 77, 77, 0.3)';
+                this.style.zIndex = '10';
+            });
+            
+            row.addEventListener('mouseleave', function() {
+                this.style.boxShadow = 'none';
+                this.style.zIndex = '1';
+            });
+        });
+        
+        // Button hover sound effect simulation
+        const buttons = document.querySelectorAll('.pomegranate-btn, .media-action, .back-btn');
+        buttons.forEach(button => {
+            button.addEventListener('mouseenter', function() {
+                this.style.transition = 'all 0.3s ease';
+                // Create ripple effect
+                const ripple = document.createElement('span');
+                ripple.className = 'ripple';
+                this.appendChild(ripple);
+                setTimeout(() => ripple.remove(), 600);
+            });
+            
+            button.addEventListener('mouseleave', function() {
+                this.style.transition = 'all 0.5s cubic-bezier(0.175, 0.885, 0.32, 1.275)';
+            });
+        });
+        
+        // Media preview hover effects
+        const mediaPreviews = document.querySelectorAll('.media-preview');
+        mediaPreviews.forEach(preview => {
+            preview.addEventListener('mouseenter', function() {
+                this.style.zIndex = '100';
+            });
+            
+            preview.addEventListener('mouseleave', function() {
+                this.style.zIndex = '1';
+            });
+        });
+        
+        // Auto-play videos on hover
+        const videos = document.querySelectorAll('.media-preview video');
+        videos.forEach(video => {
+            video.addEventListener('mouseenter', function() {
+                this.play();
+            });
+            
+            video.addEventListener('mouseleave', function() {
+                this.pause();
+                this.currentTime = 0;
+            });
+        });
+    });
+
+    // Dynamic form field handling
+    const mediaTypeSelect = document.querySelector('[name="media_type"]');
+    if (mediaTypeSelect) {
+        function toggleFields() {
+            const imageField = document.querySelector('[name="image"]').closest('.form-group');
+            const videoFileField = document.querySelector('[name="video_file"]').closest('.form-group');
+            const videoUrlField = document.querySelector('[name="video_url"]').closest('.form-group');
+            
+            if (mediaTypeSelect.value === 'photo') {
+                imageField.style.display = 'block';
+                videoFileField.style.display = 'none';
+                videoUrlField.style.display = 'none';
+            } else {
+                imageField.style.display = 'none';
+                videoFileField.style.display = 'block';
+                videoUrlField.style.display = 'block';
+            }
+        }
+        
+        mediaTypeSelect.addEventListener('change', toggleFields);
+        toggleFields(); // Initial call
+    }
+
+    // Add CSS for ripple effect
+    const style = document.createElement('style');
+    style.textContent = `
+    .ripple {
+        position: absolute;
+        border-radius: 50%;
+        background: rgba(255, 255, 255, 0.6);
+        transform: scale(0);
+        animation: rippleEffect 0.6s linear;
+        width: 100px;
+        height: 100px;
+        top: 50%;
+        left: 50%;
+        margin-top: -50px;
+        margin-left: -50px;
+        pointer-events: none;
+    }
+
+    @keyframes rippleEffect {
+        to {
+            transform: scale(4);
+            opacity: 0;
+        }
+    }
+    `;
+    document.head.appendChild(style);
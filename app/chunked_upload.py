@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from PIL import Image
+
+from .forms import MediaUploadForm
+from .models import Media
+
+VIDEO_EXTENSIONS = ('mp4', 'mov', 'avi', 'mkv')
+IMAGE_EXTENSIONS = ('jpg', 'jpeg', 'png', 'webp', 'gif')
+MANIFEST = 'manifest.json'
+COPY_BUFFER = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Yuklash xatosi; status - qaytariladigan HTTP kodi"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class AssembledFile(File):
+    """
+    Yig'ilgan fayl. temporary_file_path() bo'lgani uchun FileSystemStorage uni
+    nusxalamaydi, balki media/ ga ko'chiradi (file_move_safe).
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def upload_root():
+    return str(getattr(settings, 'CHUNKED_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'tmp', 'uploads')))
+
+
+def chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+
+
+def upload_dir(upload_id):
+    # upload_id faqat uuid hex bo'lishi kerak - yo'l orqali boshqa papkaga chiqib bo'lmaydi
+    try:
+        uuid.UUID(hex=upload_id)
+    except (TypeError, ValueError):
+        raise UploadError("Yuklash topilmadi", status=404)
+    return os.path.join(upload_root(), upload_id)
+
+
+def chunk_path(directory, index):
+    return os.path.join(directory, f'chunk-{index:06d}')
+
+
+def load_manifest(upload_id, user):
+    directory = upload_dir(upload_id)
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except FileNotFoundError:
+        raise UploadError("Yuklash topilmadi yoki muddati o'tgan", status=404)
+    if manifest['user_id'] != user.pk:
+        raise UploadError("Yuklash topilmadi", status=404)
+    return directory, manifest
+
+
+def received_chunks(directory, manifest):
+    return [i for i in range(manifest['total_chunks']) if os.path.exists(chunk_path(directory, i))]
+
+
+def status(upload_id, user):
+    directory, manifest = load_manifest(upload_id, user)
+    return {
+        'upload_id': upload_id,
+        'filename': manifest['filename'],
+        'size': manifest['size'],
+        'chunk_size': manifest['chunk_size'],
+        'total_chunks': manifest['total_chunks'],
+        'received': received_chunks(directory, manifest),
+    }
+
+
+def validate_media_fields(data):
+    """Media maydonlarini MediaUploadForm (model validatorlari) orqali tekshiradi"""
+    form = MediaUploadForm(data=data)
+    if not form.is_valid():
+        raise UploadError(' '.join(
+            f"{form.fields[field].label}: {error}" for field, errors in form.errors.items() for error in errors
+        ))
+    return form.cleaned_data
+
+
+def init_upload(user, filename, size, media_type='video', title='', description='',
+                duration='', is_active=True, sha256=''):
+    """
+    Yangi yuklash sessiyasini ochadi va uning holatini qaytaradi. Hajm chegarasi
+    CHUNKED_UPLOAD_MAX_SIZE (MediaForm dagi 50MB emas - katta fayllar uchun yo'l).
+    """
+    purge_stale_uploads()
+
+    fields = validate_media_fields({
+        'title': (title or '').strip(),
+        'description': description or '',
+        'media_type': media_type,
+        'duration': duration or '',
+        'is_active': bool(is_active),
+    })
+
+    filename = os.path.basename(filename or '')
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    allowed = VIDEO_EXTENSIONS if fields['media_type'] == 'video' else IMAGE_EXTENSIONS
+    if ext not in allowed:
+        raise UploadError(f"Faqat {', '.join('.' + e for e in allowed)} formatidagi fayllar qabul qilinadi.")
+
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Fayl hajmi noto'g'ri")
+    max_size = getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 1024 * 1024 * 1024)
+    if size <= 0 or size > max_size:
+        raise UploadError(f"Fayl hajmi {max_size // (1024 * 1024)}MB dan oshmasligi kerak.")
+
+    upload_id = uuid.uuid4().hex
+    directory = os.path.join(upload_root(), upload_id)
+    os.makedirs(directory)
+
+    manifest = {
+        'user_id': user.pk,
+        'filename': filename,
+        'size': size,
+        'chunk_size': chunk_size(),
+        'total_chunks': -(-size // chunk_size()),
+        'sha256': (sha256 or '').lower(),
+        'media': fields,
+        'created': time.time(),
+    }
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh)
+    return status(upload_id, user)
+
+
+def save_chunk(upload_id, user, index, stream, checksum=''):
+    """
+    N-bo'lakni oqimdan yozadi. Avval vaqtinchalik faylga yoziladi, keyin atomar
+    nomlanadi - uzilgan so'rov yarim bo'lak qoldirmaydi, bir bo'lakni qayta yuborish mumkin.
+    """
+    directory, manifest = load_manifest(upload_id, user)
+    if not 0 <= index < manifest['total_chunks']:
+        raise UploadError("Bo'lak raqami noto'g'ri")
+
+    expected = min(manifest['chunk_size'], manifest['size'] - index * manifest['chunk_size'])
+    target = chunk_path(directory, index)
+    partial = f'{target}.{uuid.uuid4().hex[:8]}.part'
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(partial, 'wb') as fh:
+            while written <= expected:
+                data = stream.read(min(COPY_BUFFER, expected + 1 - written))
+                if not data:
+                    break
+                digest.update(data)
+                fh.write(data)
+                written += len(data)
+        if written != expected:
+            raise UploadError(f"Bo'lak hajmi noto'g'ri: {written} (kutilgan {expected})")
+        if checksum and checksum.lower() != digest.hexdigest():
+            raise UploadError("Bo'lak nazorat summasi mos kelmadi")
+        os.replace(partial, target)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return status(upload_id, user)
+
+
+def validate_content(path, media_type, ext):
+    """Fayl mazmuni kengaytmaga mosligini tekshiradi (faqat sarlavha o'qiladi)"""
+    if media_type == 'photo':
+        try:
+            with Image.open(path) as image:
+                image.verify()
+        except Exception:
+            raise UploadError("Fayl rasm emas yoki buzilgan")
+        return
+
+    with open(path, 'rb') as fh:
+        head = fh.read(12)
+    valid = {
+        'mp4': head[4:8] == b'ftyp',
+        'mov': head[4:8] in (b'ftyp', b'moov', b'mdat', b'wide', b'free'),
+        'mkv': head[:4] == b'\x1a\x45\xdf\xa3',
+        'avi': head[:4] == b'RIFF' and head[8:12] == b'AVI ',
+    }
+    if not valid.get(ext):
+        raise UploadError("Fayl mazmuni video formatiga mos emas")
+
+
+def finalize_upload(upload_id, user):
+    """Bo'laklarni diskda ketma-ket yig'adi, tekshiradi va Media yozuvini yaratadi"""
+    directory, manifest = load_manifest(upload_id, user)
+    missing = [i for i in range(manifest['total_chunks']) if not os.path.exists(chunk_path(directory, i))]
+    if missing:
+        raise UploadError(f"Yetishmayotgan bo'laklar: {missing[:20]}", status=409)
+
+    ext = manifest['filename'].rsplit('.', 1)[-1].lower()
+    assembled = os.path.join(directory, f'assembled.{ext}')
+    digest = hashlib.sha256()
+    with open(assembled, 'wb') as out:
+        for i in range(manifest['total_chunks']):
+            with open(chunk_path(directory, i), 'rb') as part:
+                while True:
+                    data = part.read(COPY_BUFFER)
+                    if not data:
+                        break
+                    digest.update(data)
+                    out.write(data)
+
+    if os.path.getsize(assembled) != manifest['size']:
+        os.remove(assembled)
+        raise UploadError("Yig'ilgan fayl hajmi mos kelmadi", status=409)
+    if manifest['sha256'] and manifest['sha256'] != digest.hexdigest():
+        os.remove(assembled)
+        raise UploadError("Fayl nazorat summasi mos kelmadi", status=409)
+    try:
+        validate_content(assembled, manifest['media']['media_type'], ext)
+    except UploadError:
+        os.remove(assembled)
+        raise
+
+    media = Media(**manifest['media'])
+    field = 'video_file' if media.media_type == 'video' else 'image'
+    with open(assembled, 'rb') as fh:
+        getattr(media, field).save(manifest['filename'], AssembledFile(fh), save=False)
+    media.save()
+
+    shutil.rmtree(directory, ignore_errors=True)
+    return media
+
+
+def abort_upload(upload_id, user):
+    directory, _ = load_manifest(upload_id, user)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def purge_stale_uploads(now=None):
+    """CHUNKED_UPLOAD_EXPIRE_HOURS dan eski tugallanmagan yuklashlarni o'chiradi"""
+    root = upload_root()
+    if not os.path.isdir(root):
+        return 0
+    cutoff = (now or time.time()) - getattr(settings, 'CHUNKED_UPLOAD_EXPIRE_HOURS', 24) * 3600
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
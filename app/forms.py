@@ -126,6 +126,13 @@ class MediaForm(forms.ModelForm):
         return cleaned_data
 
 
+class MediaUploadForm(forms.ModelForm):
+    """Bo'lakli yuklash uchun Media ma'lumotlari (faylning o'zi chunked_upload orqali keladi)"""
+    class Meta:
+        model = Media
+        fields = ['title', 'description', 'media_type', 'duration', 'is_active']
+
+
 class ReviewForm(forms.ModelForm):
     rating = forms.FloatField(
         widget=forms.NumberInput(attrs={
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(obj):
+    """(created_at, id) -> '<mikrosoniya>_<id>' (float emas, aniq butun son)"""
+    micros = (obj.created_at - EPOCH) // timedelta(microseconds=1)
+    return f'{micros}_{obj.id}'
+
+
+def decode_cursor(value):
+    micros, _, pk = (value or '').partition('_')
+    if not (micros.isdigit() and pk.isdigit()):
+        return None
+    try:
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except OverflowError:
+        return None
+
+
+def keyset_page(queryset, cursor, size):
+    """
+    (created_at, id) kamayish tartibida bitta sahifa: kursordan keyingi `size` ta
+    yozuv va keyingi sahifa kursori (oxirgi sahifada None). OFFSET ishlatilmaydi.
+    """
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    page = list(queryset.order_by('-created_at', '-id')[:size + 1])
+    has_more = len(page) > size
+    page = page[:size]
+    next_cursor = encode_cursor(page[-1]) if has_more else None
+    return page, next_cursor
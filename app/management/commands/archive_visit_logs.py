@@ -0,0 +1,264 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from app.models import VisitLog
+from app.visit_stats import local_today, start_of_day
+
+FIELDS = ['id', 'user_id', 'session_key', 'ip_address', 'user_agent', 'timestamp', 'path']
+CHECKPOINT_NAME = 'visitlog.checkpoint.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Eski VisitLog yozuvlarini oylik siqilgan (gzip) JSONL/CSV fayllarga arxivlab, "
+        "bazadan kichik bo'laklarda o'chiradi. --import bilan arxivni qayta yuklaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'VISIT_LOG_RETENTION_DAYS', 180),
+            help="Shuncha kundan eski yozuvlar arxivlanadi",
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=getattr(settings, 'VISIT_LOG_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'archive' / 'visitlog'),
+            help="Arxiv fayllari papkasi",
+        )
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Bitta tranzaksiyada o'chiriladigan yozuvlar")
+        parser.add_argument('--dry-run', action='store_true', help="Hech narsa yozmasdan nima qilinishini ko'rsatish")
+        parser.add_argument('--import', dest='import_path', help="Arxiv faylini VisitLog ga qayta yuklash")
+        parser.add_argument('--database', default='default', help="--import uchun baza aliasi")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size musbat bo'lishi kerak")
+
+        if options['import_path']:
+            return self.import_archive(Path(options['import_path']), options)
+
+        self.archive_dir = Path(options['archive_dir'])
+        self.format = options['format']
+        self.chunk_size = options['chunk_size']
+        cutoff = start_of_day(local_today() - timedelta(days=options['days']))
+
+        if options['dry_run']:
+            return self.dry_run(cutoff)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        resumed = self.resume()
+        archived = self.archive(cutoff)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{archived} ta yozuv arxivlandi va o'chirildi"
+            + (f" (oldingi ishdan {resumed} ta yozuv tozalandi)" if resumed else "")
+        ))
+
+    # ------------------------- arxivlash -------------------------
+
+    def month_path(self, month):
+        return self.archive_dir / f"visitlog-{month}.{self.format}.gz"
+
+    def checkpoint_path(self):
+        return self.archive_dir / CHECKPOINT_NAME
+
+    def write_checkpoint(self, state):
+        path = self.checkpoint_path()
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+
+    def resume(self):
+        """
+        Oldingi ish to'xtagan joydan davom etadi:
+        - 'writing' - bo'lak arxivga oxirigacha yozilmagan bo'lishi mumkin: fayllar
+          saqlangan hajmga qaytariladi, yozuvlar bazada qolgani uchun qayta arxivlanadi;
+        - 'written' - bo'lak arxivda, faqat o'chirib ulgurilmagan yozuvlar o'chiriladi.
+        """
+        path = self.checkpoint_path()
+        if not path.exists():
+            return 0
+
+        state = json.loads(path.read_text())
+        if state['phase'] == 'writing':
+            self.rollback_files(state['offsets'])
+            path.unlink()
+            return 0
+
+        cutoff = datetime.fromisoformat(state['cutoff'])
+        pending = VisitLog.objects.filter(id__lte=state['last_id'], timestamp__lt=cutoff)
+
+        deleted = 0
+        while True:
+            ids = list(pending.order_by('id').values_list('id', flat=True)[:self.chunk_size])
+            if not ids:
+                break
+            deleted += self.delete_chunk(ids)
+
+        path.unlink()
+        return deleted
+
+    def rollback_files(self, offsets):
+        """Fayllarni yozishdan oldingi hajmiga qaytaradi (yangi fayllar o'chiriladi)"""
+        for name, offset in offsets.items():
+            path = self.archive_dir / name
+            if offset is None:
+                path.unlink(missing_ok=True)
+            elif path.exists():
+                # gzip 'a' har safar yangi member qo'shadi: kesilgandan keyin oldingi
+                # memberlar butun qoladi
+                os.truncate(path, offset)
+
+    def archive(self, cutoff):
+        old_logs = VisitLog.objects.filter(timestamp__lt=cutoff).order_by('id')
+        total = 0
+
+        while True:
+            rows = list(old_logs.values(*FIELDS)[:self.chunk_size])
+            if not rows:
+                break
+
+            # Tartib: checkpoint (fayl hajmlari) -> arxivga yozish -> checkpoint 'written'
+            # -> o'chirish. Qayerda to'xtamasin, resume() bo'lakni ikki marta yozmaydi
+            by_month = self.group_by_month(rows)
+            last_id = rows[-1]['id']
+            state = {
+                'phase': 'writing',
+                'last_id': last_id,
+                'cutoff': cutoff.isoformat(),
+                'offsets': {
+                    self.month_path(month).name: (
+                        self.month_path(month).stat().st_size if self.month_path(month).exists() else None
+                    )
+                    for month in by_month
+                },
+            }
+            self.write_checkpoint(state)
+            self.write_rows(by_month)
+            self.write_checkpoint(dict(state, phase='written'))
+            total += self.delete_chunk([row['id'] for row in rows])
+            self.checkpoint_path().unlink()
+
+            self.stdout.write(f"  ... {total} ta yozuv (oxirgi id={last_id})")
+
+        return total
+
+    def group_by_month(self, rows):
+        by_month = {}
+        for row in rows:
+            month = timezone.localtime(row['timestamp']).strftime('%Y-%m')
+            row['timestamp'] = row['timestamp'].isoformat()
+            by_month.setdefault(month, []).append(row)
+        return by_month
+
+    def write_rows(self, by_month):
+        for month, month_rows in by_month.items():
+            path = self.month_path(month)
+            is_new = not path.exists()
+            # gzip 'a' rejimi yangi member qo'shadi, gzip.open uni bitta oqim sifatida o'qiydi
+            with gzip.open(path, 'at', encoding='utf-8', newline='') as fh:
+                if self.format == 'csv':
+                    writer = csv.DictWriter(fh, fieldnames=FIELDS)
+                    if is_new:
+                        writer.writeheader()
+                    writer.writerows(month_rows)
+                else:
+                    for row in month_rows:
+                        fh.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def delete_chunk(self, ids):
+        # Har bir bo'lak alohida qisqa tranzaksiya: yozish qulfi uzoq ushlanmaydi
+        with transaction.atomic():
+            deleted, _ = VisitLog.objects.filter(id__in=ids).delete()
+        return deleted
+
+    def dry_run(self, cutoff):
+        old_logs = VisitLog.objects.filter(timestamp__lt=cutoff)
+        months = {}
+        for timestamp in old_logs.values_list('timestamp', flat=True).iterator(chunk_size=self.chunk_size):
+            month = timezone.localtime(timestamp).strftime('%Y-%m')
+            months[month] = months.get(month, 0) + 1
+
+        self.stdout.write(f"Chegara: {cutoff:%Y-%m-%d %H:%M} dan eski yozuvlar")
+        for month, count in sorted(months.items()):
+            self.stdout.write(f"  {self.month_path(month)}: {count} ta yozuv")
+        self.stdout.write(self.style.WARNING(
+            f"[dry-run] {sum(months.values())} ta yozuv arxivlanib o'chirilardi"
+        ))
+
+    # ------------------------- qayta yuklash -------------------------
+
+    def read_archive(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as fh:
+            if '.csv' in path.suffixes:
+                for row in csv.DictReader(fh):
+                    yield {key: (value if value != '' else None) for key, value in row.items()}
+            else:
+                for line in fh:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def import_archive(self, path, options):
+        if not path.exists():
+            raise CommandError(f"Fayl topilmadi: {path}")
+
+        database = options['database']
+        chunk_size = options['chunk_size']
+        imported = skipped = 0
+        batch = []
+
+        def flush():
+            nonlocal imported, skipped
+            # Arxivlangandan keyin o'chirilgan foydalanuvchilar Guest sifatida yuklanadi
+            user_ids = {visit.user_id for visit in batch if visit.user_id}
+            existing = set(User.objects.using(database).filter(id__in=user_ids).values_list('id', flat=True))
+            for visit in batch:
+                if visit.user_id not in existing:
+                    visit.user_id = None
+            # Bazada allaqachon bor id lar o'tkazib yuboriladi: ularning vaqti ham o'zgarmasligi kerak
+            present = set(
+                VisitLog.objects.using(database).filter(id__in=[visit.id for visit in batch])
+                .values_list('id', flat=True)
+            )
+            new = [visit for visit in batch if visit.id not in present]
+            if new and not options['dry_run']:
+                # bulk_create auto_now_add ni qo'llaydi: arxivdagi vaqt keyin bulk_update bilan qaytariladi
+                timestamps = [visit.timestamp for visit in new]
+                VisitLog.objects.using(database).bulk_create(new, ignore_conflicts=True)
+                for visit, timestamp in zip(new, timestamps):
+                    visit.timestamp = timestamp
+                VisitLog.objects.using(database).bulk_update(new, ['timestamp'], batch_size=chunk_size)
+            imported += len(new)
+            skipped += len(batch) - len(new)
+            batch.clear()
+
+        for row in self.read_archive(path):
+            batch.append(VisitLog(
+                id=int(row['id']),
+                user_id=int(row['user_id']) if row['user_id'] else None,
+                session_key=row['session_key'] or '',
+                ip_address=row['ip_address'],
+                user_agent=row['user_agent'],
+                timestamp=datetime.fromisoformat(row['timestamp']),
+                path=row['path'],
+            ))
+            if len(batch) >= chunk_size:
+                flush()
+        if batch:
+            flush()
+
+        prefix = "[dry-run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{imported} ta yozuv '{database}' bazasiga yuklandi (bazada bor, o'tkazildi: {skipped} ta)"
+        ))
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.models import VisitDailyStat
+from app.visit_stats import STAT_FIELDS, aggregate_visit_logs, local_today, start_of_day
+
+
+class Command(BaseCommand):
+    help = "VisitLog tarixidan VisitDailyStat kunlik statistikasini qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Faqat oxirgi N kunni hisoblash")
+        parser.add_argument('--since', help="Shu sanadan boshlab hisoblash (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        if options['days'] and options['since']:
+            raise CommandError("--days va --since dan faqat bittasini bering")
+
+        since = None
+        if options['days']:
+            since = local_today() - timedelta(days=options['days'] - 1)
+        elif options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError("--since formati: YYYY-MM-DD")
+
+        # Barcha kunlar bitta GROUP BY so'rovi bilan hisoblanadi
+        per_day = aggregate_visit_logs(start=start_of_day(since) if since else None)
+
+        with transaction.atomic():
+            for day, values in sorted(per_day.items()):
+                VisitDailyStat.objects.update_or_create(
+                    date=day,
+                    defaults={field: values[field] for field in STAT_FIELDS},
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"{len(per_day)} kun statistikasi yangilandi"))
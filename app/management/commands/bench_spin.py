@@ -0,0 +1,229 @@
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from app.models import BarabanSpin, Profile, Sovga, SpinCooldown
+
+SPIN_PATH = '/baraban/spin/'
+LOCK_MARKERS = ('database is locked', 'database table is locked')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def classify(status_code, payload):
+    if status_code >= 500:
+        return 'error'
+    if payload.get('success'):
+        return 'ok'
+    error = payload.get('error', '')
+    if any(marker in error for marker in LOCK_MARKERS):
+        return 'locked'
+    if "vaqt o'tmagan" in error:
+        return 'cooldown'
+    return 'error'
+
+
+def spin_via_client(session_cookie):
+    """Bitta spin so'rovi Django test Client orqali (oqim ichida)"""
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_cookie
+    started = time.perf_counter()
+    try:
+        response = client.post(SPIN_PATH)
+        outcome = classify(response.status_code, response.json())
+    except Exception as e:
+        outcome = 'locked' if any(m in str(e) for m in LOCK_MARKERS) else 'error'
+    finally:
+        connections.close_all()
+    return outcome, time.perf_counter() - started
+
+
+def spin_via_http(args):
+    """Bitta spin so'rovi haqiqiy HTTP orqali (oqim yoki jarayon ichida)"""
+    base_url, cookie_name, session_cookie = args
+    import requests
+    started = time.perf_counter()
+    try:
+        response = requests.post(base_url + SPIN_PATH, cookies={cookie_name: session_cookie}, timeout=30)
+        outcome = classify(response.status_code, response.json())
+    except Exception as e:
+        outcome = 'locked' if any(m in str(e) for m in LOCK_MARKERS) else 'error'
+    return outcome, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Baraban uchun eng yuqori yuklama benchmarki: N ta foydalanuvchining kutish vaqti "
+        "bir vaqtda tugaydi va hammasi /baraban/spin/ ga parallel so'rov yuboradi. "
+        "Vaqtinchalik SQLite bazada ishlaydi, asosiy bazaga tegmaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--prizes', type=int, default=6)
+        parser.add_argument('--requests-per-user', type=int, default=2,
+                            help="Har bir foydalanuvchidan parallel so'rovlar (double-click simulyatsiyasi)")
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--mode', choices=['client', 'server'], default='client',
+                            help="client - Django test Client, server - lokal WSGI server orqali HTTP")
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help="process faqat --mode server bilan")
+        parser.add_argument('--output', default='bench_spin.json', help="Natija JSON fayli")
+
+    def handle(self, *args, **options):
+        if options['pool'] == 'process' and options['mode'] != 'server':
+            raise CommandError("--pool process faqat --mode server bilan ishlaydi")
+
+        # Oqimlar bitta faylni bo'lishishi uchun in-memory emas, fayl bazasi
+        tmp_dir = tempfile.mkdtemp(prefix='bench_spin_')
+        old_name = connection.settings_dict['NAME']
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tmp_dir, 'bench.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        setup_test_environment()
+        # teardown_test_environment() asl qiymatni qaytaradi
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, '127.0.0.1']
+        try:
+            result = self.run_benchmark(options)
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        with open(options['output'], 'w', encoding='utf-8') as fh:
+            json.dump(result, fh, indent=2, ensure_ascii=False)
+
+        self.report(result)
+        self.stdout.write(self.style.SUCCESS(f"Natija yozildi: {options['output']}"))
+
+    def seed(self, options):
+        Sovga.objects.bulk_create([
+            Sovga(nomi=f"Sovg'a {i}", foiz=max(1, 60 // options['prizes']), katak_raqami=i % 10 + 1)
+            for i in range(options['prizes'])
+        ])
+
+        users = User.objects.bulk_create([
+            User(username=f'bench_{i}') for i in range(options['users'])
+        ])
+        # bulk_create signal yubormaydi - profillarni o'zimiz yaratamiz
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        # Hamma foydalanuvchining 24 soatlik kutish vaqti hozirgina tugagan
+        expired = timezone.now() - timedelta(seconds=1)
+        SpinCooldown.objects.bulk_create([SpinCooldown(user=user, next_spin_at=expired) for user in users])
+
+        cookies = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            cookies.append(client.cookies[settings.SESSION_COOKIE_NAME].value)
+        return cookies
+
+    def run_benchmark(self, options):
+        cookies = self.seed(options)
+        jobs = [cookie for cookie in cookies for _ in range(options['requests_per_user'])]
+
+        server = None
+        if options['mode'] == 'server':
+            server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+            server.set_app(get_wsgi_application())
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f'http://127.0.0.1:{server.server_port}'
+            func = spin_via_http
+            jobs = [(base_url, settings.SESSION_COOKIE_NAME, cookie) for cookie in jobs]
+        else:
+            func = spin_via_client
+
+        executor_cls = ProcessPoolExecutor if options['pool'] == 'process' else ThreadPoolExecutor
+        started = time.perf_counter()
+        try:
+            with executor_cls(max_workers=options['workers']) as executor:
+                samples = list(executor.map(func, jobs))
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        elapsed = time.perf_counter() - started
+
+        outcomes = {}
+        for outcome, _ in samples:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        latencies_ms = [latency * 1000 for _, latency in samples]
+
+        # Kutish vaqti ichida bir foydalanuvchiga 1 tadan ko'p spin - buzilish
+        violations = (
+            BarabanSpin.objects.values('user').annotate(n=Count('id')).filter(n__gt=1).count()
+        )
+
+        return {
+            'commit': git_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'config': {key: options[key] for key in (
+                'users', 'prizes', 'requests_per_user', 'workers', 'mode', 'pool'
+            )},
+            'requests': len(samples),
+            'elapsed_s': round(elapsed, 4),
+            'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+            'latency_ms': {
+                'mean': round(statistics.mean(latencies_ms), 2) if latencies_ms else 0,
+                'p50': round(percentile(latencies_ms, 50), 2),
+                'p95': round(percentile(latencies_ms, 95), 2),
+                'p99': round(percentile(latencies_ms, 99), 2),
+                'max': round(max(latencies_ms), 2) if latencies_ms else 0,
+            },
+            'outcomes': outcomes,
+            'lock_errors': outcomes.get('locked', 0),
+            'double_spin_violations': violations,
+            'spins_created': BarabanSpin.objects.count(),
+        }
+
+    def report(self, result):
+        latency = result['latency_ms']
+        self.stdout.write(
+            f"So'rovlar: {result['requests']}  vaqt: {result['elapsed_s']}s  "
+            f"throughput: {result['throughput_rps']} req/s"
+        )
+        self.stdout.write(
+            f"Latency ms  p50={latency['p50']}  p95={latency['p95']}  p99={latency['p99']}  max={latency['max']}"
+        )
+        self.stdout.write(f"Natijalar: {result['outcomes']}")
+        style = self.style.ERROR if result['double_spin_violations'] or result['lock_errors'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"SQLite lock xatolari: {result['lock_errors']}  double-spin buzilishlari: {result['double_spin_violations']}"
+        ))
@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.utils import timezone
+
+from app import media_gallery, review_feed
+from app.management.commands.bench_spin import git_commit, percentile
+from app.models import Media, Review, VisitLog
+from app.visit_stats import local_today, save_visits
+
+LOCK_MARKERS = ('database is locked', 'database table is locked')
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite profili benchmarki: aralash o'qish/yozish yuklamasi (galereya va sharhlar "
+        "sahifalari + VisitLog yozuvlari) profilsiz va SQLITE_PRAGMAS bilan solishtiriladi. "
+        "Har bir rejim alohida vaqtinchalik fayl bazada ishlaydi, asosiy bazaga tegmaydi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help="Har bir rejim davomiyligi (soniya)")
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--write-ratio', type=float, default=0.3, help="Yozish operatsiyalari ulushi (0..1)")
+        parser.add_argument('--profile', choices=['both', 'off', 'on'], default='both')
+        parser.add_argument('--rows', type=int, default=500, help="Boshlang'ich media/sharh/kirishlar soni")
+        parser.add_argument('--output', default='bench_sqlite.json', help="Natija JSON fayli")
+
+    def handle(self, *args, **options):
+        if not 0 <= options['write_ratio'] <= 1:
+            raise CommandError("--write-ratio 0 va 1 orasida bo'lishi kerak")
+        if connection.vendor != 'sqlite':
+            raise CommandError("Benchmark faqat SQLite uchun")
+
+        profiles = ['off', 'on'] if options['profile'] == 'both' else [options['profile']]
+        results = {profile: self.run_profile(profile, options) for profile in profiles}
+
+        output = {
+            'commit': git_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'config': {key: options[key] for key in ('duration', 'threads', 'write_ratio', 'rows')},
+            'pragmas': getattr(settings, 'SQLITE_PRAGMAS', {}),
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as fh:
+            json.dump(output, fh, indent=2, ensure_ascii=False)
+
+        self.report(results)
+        self.stdout.write(self.style.SUCCESS(f"Natija yozildi: {options['output']}"))
+
+    def run_profile(self, profile, options):
+        """Yangi fayl bazada bitta rejim: off - SQLite standartlari, on - SQLITE_PRAGMAS"""
+        old_profile = getattr(settings, 'SQLITE_PRODUCTION_PROFILE', False)
+        settings.SQLITE_PRODUCTION_PROFILE = profile == 'on'
+
+        tmp_dir = tempfile.mkdtemp(prefix='bench_sqlite_')
+        old_name = connection.settings_dict['NAME']
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tmp_dir, 'bench.sqlite3')
+        connection.close()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with connection.cursor() as cursor:
+                journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
+            self.seed(options['rows'])
+            result = self.run_workload(options)
+            result['journal_mode'] = journal_mode
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            settings.SQLITE_PRODUCTION_PROFILE = old_profile
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return result
+
+    def seed(self, rows):
+        users = User.objects.bulk_create([User(username=f'bench_{i}') for i in range(rows)])
+        Media.objects.bulk_create([
+            Media(title=f'Rasm {i}', media_type='photo', description='Gilam yuvish jarayoni')
+            for i in range(rows)
+        ])
+        Review.objects.bulk_create([
+            Review(user=user, rating=random.choice([3, 3.5, 4, 4.5, 5]), comment='Zo\'r xizmat')
+            for user in users
+        ])
+        save_visits([
+            VisitLog(session_key=f'seed{i}', ip_address='127.0.0.1', path='/')
+            for i in range(rows)
+        ])
+
+    def run_workload(self, options):
+        deadline = time.perf_counter() + options['duration']
+        counter = iter(range(10 ** 9))
+        counter_lock = threading.Lock()
+
+        def next_session():
+            with counter_lock:
+                return f'bench{next(counter)}'
+
+        def worker(seed):
+            rng = random.Random(seed)
+            samples = {'read': [], 'write': []}
+            locked = errors = 0
+            try:
+                while time.perf_counter() < deadline:
+                    kind = 'write' if rng.random() < options['write_ratio'] else 'read'
+                    started = time.perf_counter()
+                    try:
+                        if kind == 'write':
+                            # VisitLogMiddleware bilan bir xil yo'l: statistika + log bitta tranzaksiyada
+                            save_visits([VisitLog(
+                                session_key=next_session(), ip_address='127.0.0.1', path='/',
+                            )], local_today())
+                        else:
+                            media_gallery.gallery_page('photo')
+                            review_feed.reviews_page({})
+                    except OperationalError as e:
+                        if any(marker in str(e) for marker in LOCK_MARKERS):
+                            locked += 1
+                        else:
+                            errors += 1
+                        continue
+                    samples[kind].append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+            return samples, locked, errors
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            outcomes = list(executor.map(worker, range(options['threads'])))
+        elapsed = time.perf_counter() - started
+
+        result = {'elapsed_s': round(elapsed, 3), 'lock_errors': 0, 'errors': 0}
+        total = 0
+        for kind in ('read', 'write'):
+            latencies_ms = [sample * 1000 for samples, _, _ in outcomes for sample in samples[kind]]
+            total += len(latencies_ms)
+            result[kind] = {
+                'ops': len(latencies_ms),
+                'ops_per_s': round(len(latencies_ms) / elapsed, 2) if elapsed else 0,
+                'mean_ms': round(statistics.mean(latencies_ms), 2) if latencies_ms else 0,
+                'p95_ms': round(percentile(latencies_ms, 95), 2),
+                'p99_ms': round(percentile(latencies_ms, 99), 2),
+            }
+        for _, locked, errors in outcomes:
+            result['lock_errors'] += locked
+            result['errors'] += errors
+        result['throughput_ops'] = round(total / elapsed, 2) if elapsed else 0
+        return result
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'rejim':<6}{'journal':>9}{'ops/s':>10}{'read/s':>10}{'write/s':>10}"
+            f"{'read p95':>10}{'write p95':>11}{'locked':>8}"
+        )
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile:<6}{result['journal_mode']:>9}{result['throughput_ops']:>10}"
+                f"{result['read']['ops_per_s']:>10}{result['write']['ops_per_s']:>10}"
+                f"{result['read']['p95_ms']:>10}{result['write']['p95_ms']:>11}{result['lock_errors']:>8}"
+            )
+        if 'off' in results and 'on' in results and results['off']['throughput_ops']:
+            ratio = results['on']['throughput_ops'] / results['off']['throughput_ops']
+            self.stdout.write(self.style.SUCCESS(f"Profil bilan umumiy throughput: x{ratio:.2f}"))
@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.models import Advertisement, Media, Profile
+from app.thumbnails import generate_thumbnails, remember_thumbnail_info
+
+# Nusxasi yaratiladigan rasm maydonlari
+IMAGE_FIELDS = (
+    (Media, 'image'),
+    (Profile, 'avatar'),
+    (Advertisement, 'image'),
+)
+
+
+def build(name, force):
+    """Alohida jarayonda bitta rasmning nusxalarini yaratadi"""
+    try:
+        return name, generate_thumbnails(name, force=force), None
+    except Exception as e:
+        return name, None, str(e)
+
+
+class Command(BaseCommand):
+    help = "media/ dagi mavjud rasmlar uchun kichraytirilgan va WebP nusxalarni yaratadi (jarayonlar puli bilan)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+        parser.add_argument('--force', action='store_true', help="Mavjud nusxalarni ham qayta yaratish")
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, field in IMAGE_FIELDS:
+            names.update(
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True)
+            )
+
+        missing = {name for name in names if not default_storage.exists(name)}
+        names = sorted(names - missing)
+        self.stdout.write(f"Rasmlar: {len(names)} ta (topilmadi: {len(missing)} ta)")
+
+        # Ishchi jarayonlar bazaga murojaat qilmaydi; ochiq ulanishlarni fork dan oldin yopamiz
+        connections.close_all()
+
+        built = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(build, name, options['force']) for name in names]
+            for future in as_completed(futures):
+                name, info, error = future.result()
+                if error:
+                    failed += 1
+                    self.stderr.write(f"{name}: {error}")
+                    continue
+                # Ishchi jarayon keshi bu jarayonga ko'rinmaydi (LocMemCache)
+                remember_thumbnail_info(name, info)
+                built += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {built} ta rasm, xatolik: {failed} ta"))
@@ -0,0 +1,287 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+APP_DIR = Path(settings.BASE_DIR) / 'app'
+TEMPLATES_DIR = APP_DIR / 'templates' / 'app'
+# Tahrirlanadigan manbalar (git da) va ulardan quriladigan minify bundle lar (git da emas).
+# Ikkalasi ham static/bundles/ prefiksi ostida beriladi: STATIC_BUILD=False bo'lsa manbalar,
+# True bo'lsa bundle lar (settings.STATICFILES_DIRS). Hash ni collectstatic manifesti qo'shadi.
+ASSETS_DIR = APP_DIR / 'assets'
+BUNDLES_DIR = Path(getattr(settings, 'STATIC_BUNDLES_DIR', Path(settings.BASE_DIR) / 'build' / 'bundles'))
+
+BLOCK_RE = re.compile(r'(?P<indent>[ \t]*)<(?P<tag>style|script)(?P<attrs>\s[^>]*)?>(?P<body>.*?)</(?P=tag)>', re.S | re.I)
+JS_TYPES = ('', 'text/javascript', 'application/javascript', 'module')
+
+# CSS: satrlar, url(...) va izohlar - ularning ichidagi matn minify da o'zgarmaydi
+CSS_STRING = r'"(?:\\.|[^"\\\n])*"' + r"|'(?:\\.|[^'\\\n])*'"
+CSS_TOKEN_RE = re.compile(rf'({CSS_STRING}|url\(\s*(?:{CSS_STRING}|[^)]*)\s*\)|/\*.*?\*/)', re.S | re.I)
+# JS: bu belgilar yoki kalit so'zlardan keyingi / - regex boshlanishi, aks holda bo'lish
+JS_REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'instanceof', 'yield', 'await',
+}
+
+
+def _squeeze_css(code):
+    code = re.sub(r'\s+', ' ', code)
+    # Selektorlardagi bo'shliqlar (a :hover, a + b) ma'noli: faqat shu belgilar atrofida
+    code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+    code = re.sub(r':\s+', ':', code)
+    return code.replace(';}', '}')
+
+
+def minify_css(source):
+    """
+    Satrlar, url(...) va izohlar alohida token: bo'shliqlar faqat ulardan tashqarida
+    qisqartiriladi, satr va url ichidagi matnga tegilmaydi.
+    """
+    segments, code, after_comment = [], '', False
+    for i, part in enumerate(CSS_TOKEN_RE.split(source)):
+        if i % 2 == 0:
+            # Izoh ikki so'zni ajratib turgan bo'lsa (0/**/auto), ular yopishib qolmasin
+            if after_comment and re.search(r'[\w-]$', code) and re.match(r'[\w-]', part):
+                code += ' '
+            code += part
+            after_comment = False
+        elif part.startswith('/*'):
+            after_comment = True
+        else:
+            segments += [_squeeze_css(code), part]
+            code = ''
+    segments.append(_squeeze_css(code))
+    return ''.join(segments).strip()
+
+
+def js_line_states(source):
+    """
+    Har bir satr boshida kod holatidami: satr, shablon (`...`), izoh yoki regex ichida
+    bo'lmasa True. Shablon ichidagi ${...} ifodalari va regex /.../ lar hisobga olinadi.
+    """
+    states = [True]
+    stack = []      # '`' - shablon matni, '${' - shablon ifodasi, '{' - oddiy qavs
+    quote = None    # "'", '"', '//', '/*', 're', 're['
+    prev = ''       # oxirgi bo'sh bo'lmagan kod belgisi
+    word = ''       # oxirgi identifikator (return /re/ va a / b farqi uchun)
+    i, n = 0, len(source)
+
+    while i < n:
+        c = source[i]
+        if c == '\n':
+            if quote == '//':
+                quote = None
+            states.append(quote is None and not (stack and stack[-1] == '`'))
+            i += 1
+            continue
+        in_template = quote is None and stack and stack[-1] == '`'
+        if c == '\\' and (quote in ("'", '"', 're', 're[') or in_template):
+            # Ekranlangan belgi; satr oxiridagi \ keyingi satrni ham satr ichida qoldiradi
+            if source[i + 1:i + 2] == '\n':
+                states.append(False)
+            i += 2
+            continue
+
+        if quote in ("'", '"'):
+            if c == quote:
+                quote, prev = None, c
+        elif quote == '/*':
+            if source.startswith('*/', i):
+                quote = None
+                i += 1
+        elif quote == '//':
+            pass
+        elif quote == 're':
+            if c == '[':
+                quote = 're['
+            elif c == '/':
+                quote, prev, word = None, ')', ''
+        elif quote == 're[':
+            if c == ']':
+                quote = 're'
+        elif in_template:
+            if c == '`':
+                stack.pop()
+                prev, word = '`', ''
+            elif source.startswith('${', i):
+                stack.append('${')
+                prev = '{'
+                i += 1
+        elif c in '\'"':
+            quote = c
+        elif c == '`':
+            stack.append('`')
+        elif source.startswith('//', i):
+            quote = '//'
+        elif source.startswith('/*', i):
+            quote = '/*'
+        elif c == '/':
+            if (word if prev.isalnum() or prev in '_$' else None) in JS_REGEX_KEYWORDS \
+                    or not prev or prev in JS_REGEX_PREFIX:
+                quote = 're'
+            else:
+                prev = c
+            word = ''
+        elif not c.isspace():
+            if c.isalnum() or c in '_$':
+                word = word + c if prev.isalnum() or prev in '_$' else c
+            else:
+                word = ''
+            if c == '{':
+                stack.append('{')
+            elif c == '}' and stack:
+                stack.pop()
+            prev = c
+        i += 1
+    return states
+
+
+def minify_js(source):
+    """
+    Ehtiyotkor minify: kod holatida boshlanib tugaydigan satrlarning chetidagi
+    bo'shliqlar, bo'sh satrlar va to'liq satrli // izohlar olib tashlanadi. Shablon
+    (`...`) yoki izoh ichidagi satrlar o'zgarmaydi, yangi satrlar saqlanadi (ASI).
+    """
+    lines = source.split('\n')
+    states = js_line_states(source)
+    out = []
+    for index, line in enumerate(lines):
+        starts_in_code = states[index]
+        ends_in_code = index + 1 >= len(states) or states[index + 1]
+        if starts_in_code:
+            line = line.lstrip()
+            if line.startswith('//') or (not line.strip() and ends_in_code):
+                continue
+        if ends_in_code:
+            line = line.rstrip()
+        out.append(line)
+    return '\n'.join(out).strip('\n')
+
+
+MINIFIERS = {'css': minify_css, 'js': minify_js}
+
+
+def reference(name, ext):
+    if ext == 'css':
+        return f'<link rel="stylesheet" href="{{% static \'bundles/{name}\' %}}">'
+    return f'<script src="{{% static \'bundles/{name}\' %}}"></script>'
+
+
+class Command(BaseCommand):
+    help = (
+        "app/templates/app/ dagi inline <style>/<script> bloklarini app/assets/ ga ko'chiradi "
+        "va shablonlarni {% static 'bundles/<nom>' %} ga havola qiladigan qilib qayta yozadi. "
+        "Har ishga tushganda app/assets/ dan minify qilingan bundle lar STATIC_BUNDLES_DIR ga "
+        "quriladi - collectstatic dan oldingi build qadami."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('templates', nargs='*', help="Shablon nomlari (masalan index.html); bo'sh bo'lsa hammasi")
+        parser.add_argument('--min-size', type=int, default=1024,
+                            help="Bundan kichik bloklar inline qoladi (alohida so'rovga arzimaydi)")
+        parser.add_argument('--dry-run', action='store_true', help="Faqat hisobot, fayllar yozilmaydi")
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.bundle_sizes = {}
+        names = options['templates'] or sorted(p.name for p in TEMPLATES_DIR.glob('*.html'))
+
+        report = []
+        for name in names:
+            path = TEMPLATES_DIR / name
+            original = path.read_text(encoding='utf-8')
+            text, skipped = self.extract(path.stem, original, options['min_size'])
+            text = self.relink(path.stem, text)
+            if text != original:
+                if not self.dry_run:
+                    path.write_text(text, encoding='utf-8')
+                report.append((name, len(original.encode()), len(text.encode()), skipped))
+            elif skipped:
+                report.append((name, len(original.encode()), len(original.encode()), skipped))
+
+        self.print_report(report)
+
+    def extract(self, stem, text, min_size):
+        """Shablon sintaksisisiz (kontekstga bog'liq bo'lmagan) bloklarni manbaga ko'chiradi"""
+        index = len(list(ASSETS_DIR.glob(f'{stem}-*.*'))) if ASSETS_DIR.exists() else 0
+        skipped = 0
+        parts, last = [], 0
+
+        for match in BLOCK_RE.finditer(text):
+            tag, attrs, body = match.group('tag').lower(), match.group('attrs') or '', match.group('body')
+            if tag == 'script':
+                type_match = re.search(r'type=["\']([^"\']*)', attrs)
+                if 'src=' in attrs or (type_match and type_match.group(1).lower() not in JS_TYPES):
+                    continue
+            if not body.strip() or len(body.encode()) < min_size:
+                continue
+            if '{{' in body or '{%' in body:
+                skipped += 1
+                continue
+
+            index += 1
+            ext = 'css' if tag == 'style' else 'js'
+            source_name = f'{stem}-{index}.{ext}'
+            if not self.dry_run:
+                ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+                (ASSETS_DIR / source_name).write_text(body.strip('\n') + '\n', encoding='utf-8')
+            bundle = self.build(stem, index, ext, body)
+
+            parts.append(text[last:match.start()])
+            parts.append(match.group('indent') + reference(bundle, ext))
+            last = match.end()
+
+        if last:
+            parts.append(text[last:])
+            text = ''.join(parts)
+            if '{% load static %}' not in text:
+                text = '{% load static %}\n' + text
+        return text, skipped
+
+    def build(self, stem, index, ext, source):
+        """Manbadan minify qilingan bundle yozadi va uning (o'zgarmas) nomini qaytaradi"""
+        minified = MINIFIERS[ext](source)
+        name = f'{stem}-{index}.{ext}'
+        if not self.dry_run:
+            BUNDLES_DIR.mkdir(parents=True, exist_ok=True)
+            (BUNDLES_DIR / name).write_text(minified + '\n', encoding='utf-8')
+        self.bundle_sizes[name] = (len(source.encode()), len(minified.encode()))
+        return name
+
+    def relink(self, stem, text):
+        """
+        app/assets/ dagi (qo'lda tahrirlangan) manbalardan shablon ishlatadigan bundle larni
+        qayta quradi. Eski hashlangan havolalar (bundles/x-1.<hash>.css) o'zgarmas nomga o'tadi.
+        """
+        if not ASSETS_DIR.exists():
+            return text
+        for source in sorted(ASSETS_DIR.glob(f'{stem}-*.*')):
+            index, ext = source.stem.rsplit('-', 1)[1], source.suffix[1:]
+            pattern = re.compile(rf"bundles/{re.escape(stem)}-{index}(?:\.[0-9a-f]{{10}})?\.{ext}")
+            if not pattern.search(text):
+                continue
+            name = self.build(stem, int(index), ext, source.read_text(encoding='utf-8'))
+            text = pattern.sub(f'bundles/{name}', text)
+        return text
+
+    def print_report(self, report):
+        if not report:
+            self.stdout.write("O'zgarish yo'q")
+            return
+
+        self.stdout.write(f"{'Shablon':<28}{'oldin':>10}{'keyin':>10}{'tejaldi':>10}  shablonli bloklar")
+        total_before = total_after = 0
+        for name, before, after, skipped in report:
+            total_before += before
+            total_after += after
+            self.stdout.write(f"{name:<28}{before:>10}{after:>10}{before - after:>10}  {skipped or ''}")
+        self.stdout.write(f"{'Jami':<28}{total_before:>10}{total_after:>10}{total_before - total_after:>10}")
+
+        raw = sum(size[0] for size in self.bundle_sizes.values())
+        minified = sum(size[1] for size in self.bundle_sizes.values())
+        self.stdout.write(
+            f"Bundle lar: {len(self.bundle_sizes)} ta, manba {raw} bayt -> minify {minified} bayt"
+            + (" (dry-run, fayllar yozilmadi)" if self.dry_run else "")
+        )
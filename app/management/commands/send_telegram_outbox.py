@@ -0,0 +1,145 @@
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from app.models import TelegramOutbox
+from app.telegram_bot import MESSAGE_LIMIT, CircuitOpen, TelegramClient, TelegramError
+
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+def backoff_delay(attempts, base, maximum):
+    """Eksponensial kechikish (jitter bilan): base * 2^(urinish-1), maximum gacha"""
+    delay = min(base * (2 ** (attempts - 1)), maximum)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def pack_digest(messages):
+    """Xabarlarni 4096 belgidan oshmaydigan dayjest guruhlariga ajratadi"""
+    groups, current, length = [], [], 0
+    for message in messages:
+        extra = len(message.text) + (len(DIGEST_SEPARATOR) if current else 0)
+        if current and length + extra > MESSAGE_LIMIT - 100:
+            groups.append(current)
+            current, length = [], 0
+            extra = len(message.text)
+        current.append(message)
+        length += extra
+    if current:
+        groups.append(current)
+    return groups
+
+
+def digest_text(group):
+    if len(group) == 1:
+        return group[0].text
+    header = f"📬 *{len(group)} ta yangi xabar*"
+    return header + DIGEST_SEPARATOR + DIGEST_SEPARATOR.join(m.text.strip() for m in group)
+
+
+class Command(BaseCommand):
+    help = "TelegramOutbox dagi xabarlarni Telegramga yuboradi (qayta urinish, circuit breaker, dayjest)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Navbatni bir marta bo'shatib chiqib ketish")
+        parser.add_argument('--interval', type=float, default=2.0, help="Navbatni tekshirish oralig'i (soniya)")
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        self.client = TelegramClient()
+        self.max_attempts = getattr(settings, 'TELEGRAM_MAX_ATTEMPTS', 8)
+        self.backoff_base = getattr(settings, 'TELEGRAM_BACKOFF_BASE', 5.0)
+        self.backoff_max = getattr(settings, 'TELEGRAM_BACKOFF_MAX', 3600.0)
+        self.digest_threshold = getattr(settings, 'TELEGRAM_DIGEST_THRESHOLD', 5)
+
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        try:
+            while True:
+                close_old_connections()
+                result = self.drain(options['batch_size'])
+                for key, value in result.items():
+                    totals[key] += value
+
+                if options['once'] and not any(result.values()):
+                    break
+                if not any(result.values()):
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Yuborildi: {totals['sent']}, qayta urinish: {totals['retried']}, xatolik: {totals['failed']}"
+        ))
+
+    def drain(self, batch_size):
+        result = {'sent': 0, 'retried': 0, 'failed': 0}
+        if not self.client.breaker.allow():
+            return result
+
+        due = list(
+            TelegramOutbox.objects.filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('id')[:batch_size]
+        )
+        if not due:
+            return result
+
+        # Bir vaqtda ko'p xabar yig'ilsa, ularni bitta dayjest sifatida yuboramiz
+        if len(due) >= self.digest_threshold:
+            groups = pack_digest(due)
+        else:
+            groups = [[message] for message in due]
+
+        for group in groups:
+            if not self.send_group(group, result):
+                break
+
+        return result
+
+    def send_group(self, group, result):
+        """Guruhni (yoki bitta xabarni) yuboradi; circuit ochilsa False - qolganlari keyinga"""
+        ids = [message.id for message in group]
+        try:
+            self.client.send(digest_text(group))
+        except TelegramError as e:
+            if e.permanent and len(group) > 1:
+                # Dayjestdagi bitta buzuq xabar (masalan Markdown 400) butun guruhni
+                # yiqitmasin: xabarlar birma-bir yuboriladi, faqat o'sha xabar failed bo'ladi
+                return all(self.send_group([message], result) for message in group)
+            retried, failed = self.schedule_retry(group, e)
+            result['retried'] += retried
+            result['failed'] += failed
+            return not isinstance(e, CircuitOpen) and self.client.breaker.allow()
+
+        TelegramOutbox.objects.filter(id__in=ids).update(
+            status='sent', sent_at=timezone.now(), attempts=F('attempts') + 1, last_error=''
+        )
+        result['sent'] += len(ids)
+        return True
+
+    def schedule_retry(self, group, error):
+        retried = failed = 0
+        now = timezone.now()
+        for message in group:
+            # Circuit ochiq bo'lsa urinish sanalmaydi - xabar yuborilmagan
+            attempts = message.attempts if isinstance(error, CircuitOpen) else message.attempts + 1
+            # Doimiy xatolik (429 dan boshqa 4xx) qayta urinilmaydi
+            if error.permanent or attempts >= self.max_attempts:
+                status, next_attempt_at = 'failed', now
+                failed += 1
+            else:
+                delay = backoff_delay(max(attempts, 1), self.backoff_base, self.backoff_max)
+                if error.retry_after:
+                    delay = max(delay, float(error.retry_after))
+                status, next_attempt_at = 'pending', now + timedelta(seconds=delay)
+                retried += 1
+
+            TelegramOutbox.objects.filter(id=message.id).update(
+                status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error)[:1000]
+            )
+        return retried, failed
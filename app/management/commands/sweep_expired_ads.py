@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from app.ad_rotation import invalidate_plan
+from app.models import Advertisement
+from app.page_cache import bump_generation
+
+
+class Command(BaseCommand):
+    help = (
+        "Muddati o'tgan reklamalarni arxivlangan deb belgilaydi (is_archived=True), "
+        "shunda faol reklamalar so'rovi faqat jonli yozuvlarni ko'radi. Cron orqali ishga tushiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int, default=0,
+                            help="Muddati kamida shuncha soat oldin tugaganlar arxivlanadi")
+        parser.add_argument('--dry-run', action='store_true', help="Faqat nechta reklama arxivlanishini ko'rsatish")
+
+    def handle(self, *args, **options):
+        if options['grace_hours'] < 0:
+            raise CommandError("--grace-hours manfiy bo'lmasligi kerak")
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        expired = Advertisement.objects.expired(cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"Arxivlanadigan reklamalar: {expired.count()} ta (dry-run)")
+            return
+
+        with transaction.atomic():
+            # update() signal yubormaydi - sahifa keshi va aylanish rejasini o'zimiz yangilaymiz
+            archived = expired.update(is_archived=True)
+            if archived:
+                transaction.on_commit(lambda: bump_generation('Advertisement'))
+                transaction.on_commit(invalidate_plan)
+
+        self.stdout.write(self.style.SUCCESS(f"Arxivlandi: {archived} ta reklama"))
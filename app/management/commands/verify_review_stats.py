@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app.models import ReviewRatingSummary
+from app.review_stats import SUMMARY_FIELDS, SUMMARY_PK, compute_review_summary, rebuild_review_summary
+
+
+class Command(BaseCommand):
+    help = "ReviewRatingSummary ni Review jadvali bilan solishtiradi; --fix bilan qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Farq bo'lsa statistikani qayta hisoblash")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = compute_review_summary()
+            summary = ReviewRatingSummary.objects.filter(pk=SUMMARY_PK).first()
+
+            drift = {}
+            for field in SUMMARY_FIELDS:
+                stored = getattr(summary, field) if summary else None
+                # rating_sum F() bilan qo'shilgan floatlar yig'indisi - yaxlitlash farqiga yo'l qo'yamiz
+                if stored is None or abs(stored - expected[field]) > 1e-6:
+                    drift[field] = (stored, expected[field])
+
+            if not drift:
+                self.stdout.write(self.style.SUCCESS("Sharhlar statistikasi to'g'ri"))
+                return
+
+            for field, (stored, actual) in drift.items():
+                self.stdout.write(f"{field}: saqlangan={stored} haqiqiy={actual}")
+
+            if not options['fix']:
+                raise CommandError("Statistika mos emas (tuzatish uchun --fix)")
+            rebuild_review_summary()
+
+        self.stdout.write(self.style.SUCCESS("Sharhlar statistikasi qayta hisoblandi"))
@@ -0,0 +1,59 @@
+from django.urls import reverse
+
+from .keyset import keyset_page
+from .models import Media
+
+PAGE_SIZE = 12
+MAX_PAGE_SIZE = 48
+# Bosh sahifada birinchi ko'rsatiladiganlar, qolgani skroll qilinganda yuklanadi
+HOME_VIDEOS = 4
+HOME_PHOTOS = 6
+
+# Galereya kartalari uchun yetarli ustunlar (boshqalari SELECT ga kirmaydi)
+CARD_FIELDS = (
+    'id', 'title', 'description', 'media_type', 'image', 'video_file',
+    'video_url', 'duration', 'views', 'likes', 'created_at',
+)
+
+# layout -> media turi -> kartalar shabloni (sahifa ham, JSON ham bir xil partial ni ishlatadi)
+CARD_TEMPLATES = {
+    'index': {'video': 'app/index_video_cards.html', 'photo': 'app/index_photo_cards.html'},
+    'list': {'video': 'app/video_cards.html', 'photo': 'app/photo_items.html'},
+}
+
+
+def parse_page_size(value, default=PAGE_SIZE):
+    """?limit= qiymati, 1..MAX_PAGE_SIZE oralig'ida"""
+    try:
+        return min(max(int(value), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return default
+
+
+def gallery_page(media_type, cursor=None, size=PAGE_SIZE, include_inactive=False):
+    """
+    Bitta media turi bo'yicha keyset sahifa (yangisi birinchi). Faol yozuvlar
+    (media_type, is_active, created_at) indeksidan o'qiladi; xodimlar boshqaruv
+    sahifalarida nofaollarni ham ko'radi.
+    """
+    media = Media.objects.filter(media_type=media_type).only(*CARD_FIELDS)
+    if not include_inactive:
+        media = media.filter(is_active=True)
+    return keyset_page(media, cursor, size)
+
+
+def media_item(media):
+    """JSON uchun bitta karta ma'lumoti"""
+    return {
+        'id': media.id,
+        'title': media.title,
+        'description': media.description,
+        'media_type': media.media_type,
+        'image': media.image.url if media.image else None,
+        'stream_url': reverse('stream_media_video', args=[media.pk]) if media.video_file else None,
+        'video_url': media.video_url,
+        'duration': media.duration,
+        'views': media.views,
+        'likes': media.likes,
+        'created_at': media.created_at.isoformat(),
+    }
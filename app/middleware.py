@@ -1,48 +1,76 @@
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.sessions.models import Session
 from django.contrib.auth.models import User
 from .models import VisitLog
+from .visit_cache import get_visit_cache
+from .visit_stats import local_today, save_visits, start_of_day
+from .visit_writer import get_visit_log_writer
 
 
 class VisitLogMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        # Write-behind rejimi: kirishlar navbatga qo'yiladi, fon oqimi partiyalab yozadi
+        self.writer = get_visit_log_writer() if getattr(settings, 'VISIT_LOG_WRITE_BEHIND', False) else None
+        # Bugun log qilingan sessiyalar keshi (None bo'lsa o'chirilgan)
+        self.seen_cache = get_visit_cache()
 
     def __call__(self, request):
         # Faqat asosiy sahifaga kirishlarni log qilamiz yoki barchasini
         if not request.path.startswith('/static/') and not request.path.startswith('/media/'):
             try:
-                user = request.user if request.user.is_authenticated else None
-                session_key = request.session.session_key
-
-                # Har bir sessiya uchun kuniga bir marta log yozamiz
-                today = timezone.now().date()
-                start_of_day = timezone.make_aware(timezone.datetime(today.year, today.month, today.day))
-
-                existing_log = VisitLog.objects.filter(
-                    user=user,
-                    session_key=session_key,
-                    timestamp__gte=start_of_day
-                ).exists()
-
-                if not existing_log and session_key:
-                    VisitLog.objects.create(
-                        user=user,
-                        session_key=session_key,
-                        ip_address=self.get_client_ip(request),
-                        user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                        path=request.path
-                    )
+                self.log_visit(request)
             except:
                 pass  # Log qilishda xatolik bo'lsa ham ish davom etsin
 
         response = self.get_response(request)
         return response
 
+    def log_visit(self, request):
+        user = request.user if request.user.is_authenticated else None
+        session_key = request.session.session_key
+        if not session_key:
+            return
+
+        today = local_today()
+        user_id = user.id if user else None
+        if self.seen_cache is not None and self.seen_cache.seen(user_id, session_key, today):
+            return
+
+        visit = VisitLog(
+            user=user,
+            session_key=session_key,
+            ip_address=self.get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            path=request.path
+        )
+
+        if self.writer is not None:
+            # Takrorlarni fon oqimi bitta so'rov bilan tekshiradi
+            if self.writer.submit(visit):
+                self.remember(user_id, session_key, today)
+            return
+
+        # Har bir sessiya uchun kuniga bir marta log yozamiz
+        existing_log = VisitLog.objects.filter(
+            user=user,
+            session_key=session_key,
+            timestamp__gte=start_of_day(today)
+        ).exists()
+
+        if not existing_log:
+            save_visits([visit], today)
+        self.remember(user_id, session_key, today)
+
+    def remember(self, user_id, session_key, day):
+        if self.seen_cache is not None:
+            self.seen_cache.mark(user_id, session_key, day)
+
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+        return ip
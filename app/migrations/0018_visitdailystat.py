@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_advertisement_color_advertisement_expires_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Sana')),
+                ('visits', models.PositiveIntegerField(default=0, verbose_name='Kirishlar')),
+                ('guests', models.PositiveIntegerField(default=0, verbose_name='Mehmonlar')),
+                ('users', models.PositiveIntegerField(default=0, verbose_name='Foydalanuvchilar')),
+                ('admins', models.PositiveIntegerField(default=0, verbose_name='Adminlar')),
+                ('staff', models.PositiveIntegerField(default=0, verbose_name='Xodimlar')),
+                ('customers', models.PositiveIntegerField(default=0, verbose_name='Mijozlar')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Kunlik kirish statistikasi',
+                'verbose_name_plural': 'Kunlik kirish statistikasi',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
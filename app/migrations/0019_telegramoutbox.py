@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 09:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0018_visitdailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelegramOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Xabar matni')),
+                ('status', models.CharField(choices=[('pending', 'Kutilmoqda'), ('sent', 'Yuborildi'), ('failed', 'Xatolik')], default='pending', max_length=10, verbose_name='Holat')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Urinishlar')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Keyingi urinish')),
+                ('last_error', models.TextField(blank=True, verbose_name='Oxirgi xatolik')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Telegram xabari',
+                'verbose_name_plural': 'Telegram xabarlari',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='app_telegra_status_426b1c_idx')],
+            },
+        ),
+    ]
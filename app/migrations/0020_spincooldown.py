@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_telegramoutbox'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpinCooldown',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='spin_cooldown', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('next_spin_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Keyingi spin vaqti')),
+            ],
+            options={
+                'verbose_name': 'Spin kutish vaqti',
+                'verbose_name_plural': 'Spin kutish vaqtlari',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='barabanspin',
+            index=models.Index(fields=['user', 'spin_vaqti'], name='app_baraban_user_id_87e1c8_idx'),
+        ),
+        migrations.AddField(
+            model_name='spincooldown',
+            name='last_spin',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app.barabanspin'),
+        ),
+    ]
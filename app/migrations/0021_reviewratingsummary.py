@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_spincooldown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Jami sharhlar')),
+                ('rating_sum', models.FloatField(default=0, verbose_name="Reytinglar yig'indisi")),
+                ('one_star', models.PositiveIntegerField(default=0)),
+                ('two_star', models.PositiveIntegerField(default=0)),
+                ('three_star', models.PositiveIntegerField(default=0)),
+                ('four_star', models.PositiveIntegerField(default=0)),
+                ('five_star', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sharhlar statistikasi',
+                'verbose_name_plural': 'Sharhlar statistikasi',
+            },
+        ),
+    ]
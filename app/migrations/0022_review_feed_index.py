@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0021_reviewratingsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='app_review_is_acti_8daa95_idx'),
+        ),
+    ]
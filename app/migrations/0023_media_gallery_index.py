@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0022_review_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='media',
+            index=models.Index(fields=['media_type', 'is_active', '-created_at', '-id'], name='app_media_media_t_179b4c_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_expires_at(apps, schema_editor):
+    """Eski reklamalar: expires_at = created_at + duration_days"""
+    Advertisement = apps.get_model('app', 'Advertisement')
+    ads = list(Advertisement.objects.filter(expires_at__isnull=True))
+    for ad in ads:
+        ad.expires_at = ad.created_at + timedelta(days=ad.duration_days)
+    Advertisement.objects.bulk_update(ads, ['expires_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0023_media_gallery_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advertisement',
+            name='is_archived',
+            field=models.BooleanField(default=False, verbose_name='Arxivlangan'),
+        ),
+        migrations.AlterField(
+            model_name='advertisement',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_expires_at, migrations.RunPython.noop),
+    ]
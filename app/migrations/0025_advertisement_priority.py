@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0024_advertisement_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='advertisement',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Ustuvorlik'),
+        ),
+    ]
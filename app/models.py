@@ -96,7 +96,27 @@ class VisitLog(models.Model):
 
     def __str__(self):
         return f"{self.user.username if self.user else 'Guest'} - {self.timestamp}"
-    
+
+
+# Kunlik kirishlar statistikasi (VisitLog dan yig'ilgan, har kun uchun bitta qator)
+class VisitDailyStat(models.Model):
+    date = models.DateField(unique=True, verbose_name="Sana")
+    visits = models.PositiveIntegerField(default=0, verbose_name="Kirishlar")
+    guests = models.PositiveIntegerField(default=0, verbose_name="Mehmonlar")
+    users = models.PositiveIntegerField(default=0, verbose_name="Foydalanuvchilar")
+    admins = models.PositiveIntegerField(default=0, verbose_name="Adminlar")
+    staff = models.PositiveIntegerField(default=0, verbose_name="Xodimlar")
+    customers = models.PositiveIntegerField(default=0, verbose_name="Mijozlar")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = "Kunlik kirish statistikasi"
+        verbose_name_plural = "Kunlik kirish statistikasi"
+
+    def __str__(self):
+        return f"{self.date} - {self.visits}"
+
 # video / rasim uchun
 class Media(models.Model):
     MEDIA_CHOICES = (
@@ -123,6 +143,10 @@ class Media(models.Model):
         verbose_name = "Media"
         verbose_name_plural = "Mediyalar"
         ordering = ['-created_at']
+        indexes = [
+            # Galereyalar: media_type + is_active bo'yicha (created_at, id) keyset sahifalash
+            models.Index(fields=['media_type', 'is_active', '-created_at', '-id']),
+        ]
 
 class Sovga(models.Model):
     nomi = models.CharField(max_length=255, verbose_name="Sovg'a nomi")
@@ -157,6 +181,9 @@ class BarabanSpin(models.Model):
     
     class Meta:
         ordering = ['-spin_vaqti']
+        indexes = [
+            models.Index(fields=['user', 'spin_vaqti']),
+        ]
     
     def __str__(self):
         sovga_nomi = self.sovga.nomi if self.sovga else "Yutuq yo'q"
@@ -169,6 +196,23 @@ class BarabanSpin(models.Model):
             self.keyingi_spin_vaqti = timezone.now() + timedelta(hours=24)
         super().save(*args, **kwargs)
 
+    def can_spin_again(self):
+        return timezone.now() >= self.keyingi_spin_vaqti
+
+
+class SpinCooldown(models.Model):
+    """Foydalanuvchi keyingi marta qachon aylantira olishi (har bir user uchun bitta qator)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='spin_cooldown')
+    next_spin_at = models.DateTimeField(default=timezone.now, verbose_name="Keyingi spin vaqti")
+    last_spin = models.ForeignKey(BarabanSpin, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        verbose_name = "Spin kutish vaqti"
+        verbose_name_plural = "Spin kutish vaqtlari"
+
+    def __str__(self):
+        return f"{self.user_id} - {self.next_spin_at}"
+
 
 User = get_user_model()
 
@@ -213,6 +257,10 @@ class Review(models.Model):
         ordering = ['-created_at']
         verbose_name = "Sharh"
         verbose_name_plural = "Sharhlar"
+        indexes = [
+            # reviews_json keyset sahifalash: is_active=True, (created_at, id) kamayish tartibida
+            models.Index(fields=['is_active', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.rating} ★"
@@ -231,8 +279,47 @@ class Review(models.Model):
     
 
 
+class ReviewRatingSummary(models.Model):
+    """
+    Faol sharhlar bo'yicha yagona qator: jami, reytinglar yig'indisi va yulduzlar
+    bo'yicha taqsimot. add/edit/delete_review ichida tranzaksiyada yangilanadi.
+    """
+    total = models.PositiveIntegerField(default=0, verbose_name="Jami sharhlar")
+    rating_sum = models.FloatField(default=0, verbose_name="Reytinglar yig'indisi")
+    one_star = models.PositiveIntegerField(default=0)
+    two_star = models.PositiveIntegerField(default=0)
+    three_star = models.PositiveIntegerField(default=0)
+    four_star = models.PositiveIntegerField(default=0)
+    five_star = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Sharhlar statistikasi"
+        verbose_name_plural = "Sharhlar statistikasi"
+
+    def __str__(self):
+        return f"{self.total} ta sharh, o'rtacha {self.average:.2f}"
+
+    @property
+    def average(self):
+        return self.rating_sum / self.total if self.total else 0
+
+
 # ____________________________________
 
+class AdvertisementQuerySet(models.QuerySet):
+    def active(self, now=None):
+        """Hozir ko'rsatiladigan reklamalar (SQL da, expires_at indeksi orqali)"""
+        now = now or timezone.now()
+        return self.filter(is_archived=False).filter(
+            models.Q(expires_at__isnull=True) | models.Q(expires_at__gte=now)
+        )
+
+    def expired(self, now=None):
+        """Muddati o'tgan, lekin hali arxivlanmagan reklamalar (sweep_expired_ads uchun)"""
+        return self.filter(is_archived=False, expires_at__lt=now or timezone.now())
+
+
 class Advertisement(models.Model):
 
     AD_TYPE_CHOICES = (
@@ -249,15 +336,61 @@ class Advertisement(models.Model):
     image = models.ImageField(upload_to='ads/images/', blank=True, null=True)
     video = models.FileField(upload_to='ads/videos/', blank=True, null=True)
 
-    expires_at = models.DateTimeField(null=True, blank=True)
+    # save() da duration_days dan hisoblanadi
+    expires_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    # sweep_expired_ads muddati o'tganlarni belgilaydi (faol to'plam kichik qoladi)
+    is_archived = models.BooleanField(default=False, verbose_name="Arxivlangan")
 
     color = models.CharField(max_length=20, default="#ff6a00")
 
     views = models.PositiveIntegerField(default=0)
     duration_days = models.PositiveIntegerField(default=1)
+    # Aylanishdagi ulushi qolgan kunlar soniga ko'paytiriladi (app/ad_rotation.py)
+    priority = models.PositiveSmallIntegerField(default=1, verbose_name="Ustuvorlik")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = AdvertisementQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.expires_at = (self.created_at or timezone.now()) + timedelta(days=self.duration_days)
+        # Muddat uzaytirilsa arxivdan qaytadi
+        if self.is_archived and self.expires_at >= timezone.now():
+            self.is_archived = False
+        super().save(*args, **kwargs)
+
     def is_active(self):
+        if self.is_archived:
+            return False
         if self.expires_at:
             return timezone.now() <= self.expires_at
         return True
+
+
+# ____________________________telegram outbox________________________________
+
+class TelegramOutbox(models.Model):
+    """Telegramga yuborilishi kerak bo'lgan xabarlar (worker yuboradi)"""
+    STATUS_CHOICES = [
+        ('pending', 'Kutilmoqda'),
+        ('sent', 'Yuborildi'),
+        ('failed', 'Xatolik'),
+    ]
+
+    text = models.TextField(verbose_name="Xabar matni")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Holat")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Urinishlar")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="Keyingi urinish")
+    last_error = models.TextField(blank=True, verbose_name="Oxirgi xatolik")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Telegram xabari"
+        verbose_name_plural = "Telegram xabarlari"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.status} ({self.attempts})"
@@ -0,0 +1,129 @@
+import hashlib
+import re
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+GENERATION_KEY = 'page_gen:{model}'
+LOCK_KEY = 'page_lock:{key}'
+# Keshlangan HTML da CSRF token o'rniga qo'yiladi, har bir so'rovda yangisi bilan almashtiriladi
+CSRF_PLACEHOLDER = '__PAGE_CACHE_CSRF_TOKEN__'
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([A-Za-z0-9]+)"')
+
+
+def page_cache_enabled():
+    return getattr(settings, 'PAGE_CACHE_ENABLED', False)
+
+
+def generations(models):
+    keys = [GENERATION_KEY.format(model=model) for model in models]
+    values = cache.get_many(keys)
+    return '.'.join(str(values.get(key, 0)) for key in keys)
+
+
+def bump_generation(model):
+    """Model o'zgarganda unga bog'liq barcha sahifalar kaliti o'zgaradi (eski yozuvlar TTL bilan o'chadi)"""
+    key = GENERATION_KEY.format(model=model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def page_key(request, view_name, models):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'page:{view_name}:{generations(models)}:{digest}'
+
+
+def has_pending_messages(request):
+    # FallbackStorage: avval cookie, sig'masa sessiya
+    return 'messages' in request.COOKIES or bool(request.session.get('_messages'))
+
+
+def build_response(request, entry, state):
+    content = entry['content']
+    if CSRF_PLACEHOLDER in content:
+        # get_token() CSRF cookie ham o'rnatilishini ta'minlaydi
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request))
+    response = HttpResponse(content, content_type=entry['content_type'], status=entry['status'])
+    response.headers['X-Page-Cache'] = state
+    return response
+
+
+def store(key, response, ttl):
+    content = response.content.decode(response.charset)
+    tokens = set(CSRF_INPUT_RE.findall(content))
+    for token in tokens:
+        content = content.replace(token, CSRF_PLACEHOLDER)
+
+    entry = {
+        'content': content,
+        'content_type': response['Content-Type'],
+        'status': response.status_code,
+        'expires': time.time() + ttl,
+    }
+    stale = getattr(settings, 'PAGE_CACHE_STALE', 300)
+    cache.set(key, entry, ttl + stale)
+
+
+def cache_anonymous_page(*models):
+    """
+    Anonim GET so'rovlar uchun to'liq sahifa keshi (PAGE_CACHE_ENABLED bo'lsa).
+
+    Kalit: view, yo'l va saralangan query hamda `models` avlod raqamlari. Model
+    o'zgarganda (signals.py) avlod oshadi va sahifa darhol yangilanadi.
+    Stampede himoyasi: muddati o'tgan sahifani faqat qulfni olgan bitta worker
+    qayta render qiladi, qolganlari eski nusxani beradi yoki qisqa kutadi.
+    """
+    def decorator(view):
+        view_name = view.__name__
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if (
+                not page_cache_enabled()
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+                or has_pending_messages(request)
+            ):
+                return view(request, *args, **kwargs)
+
+            ttl = getattr(settings, 'PAGE_CACHE_TTL', 60)
+            key = page_key(request, view_name, models)
+            entry = cache.get(key)
+            if entry is not None and entry['expires'] > time.time():
+                return build_response(request, entry, 'hit')
+
+            lock_key = LOCK_KEY.format(key=key)
+            lock_timeout = getattr(settings, 'PAGE_CACHE_LOCK_TIMEOUT', 10)
+            if not cache.add(lock_key, 1, lock_timeout):
+                # Boshqa worker render qilyapti
+                if entry is not None:
+                    return build_response(request, entry, 'stale')
+                deadline = time.monotonic() + getattr(settings, 'PAGE_CACHE_WAIT', 2.0)
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    entry = cache.get(key)
+                    if entry is not None:
+                        return build_response(request, entry, 'hit')
+                response = view(request, *args, **kwargs)
+                response.headers['X-Page-Cache'] = 'bypass'
+                return response
+
+            try:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming and not response.cookies:
+                    store(key, response, ttl)
+            finally:
+                cache.delete(lock_key)
+            response.headers['X-Page-Cache'] = 'miss'
+            return response
+
+        return wrapped
+    return decorator
@@ -0,0 +1,133 @@
+import random
+import secrets
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Barabandagi bitta katak: sovga_id None bo'lsa - "Yutuq yo'q"
+Prize = namedtuple('Prize', ['sovga_id', 'nomi', 'katak_raqami', 'foiz'])
+
+NO_PRIZE_NAME = "Yutuq yo'q"
+VERSION_KEY = 'prize_sampler:version'
+
+
+class PrizeSampler:
+    """
+    Walker alias usuli: jadval bir marta O(n) da quriladi, har bir tanlash O(1).
+
+    Foizlar yig'indisi 100 dan kam bo'lsa, qolgan qism "Yutuq yo'q" ga tegishli.
+    Foizi 0 bo'lgan sovg'alar jadvalga kirmaydi, lekin faol sovg'a sifatida sanaladi:
+    hammasi 0 bo'lsa baraban har doim "Yutuq yo'q" ga to'xtaydi.
+    """
+
+    def __init__(self, prizes, rng=None):
+        self.rng = rng or random.Random()
+        prizes = list(prizes)
+        self.active_count = len(prizes)
+        self.prizes = [prize for prize in prizes if prize.foiz > 0]
+
+        total = sum(prize.foiz for prize in self.prizes)
+        if self.active_count and total < 100:
+            self.prizes.append(Prize(None, NO_PRIZE_NAME, None, 100 - total))
+
+        self.total = sum(prize.foiz for prize in self.prizes)
+        self.prob, self.alias = self._build([prize.foiz for prize in self.prizes])
+
+    @classmethod
+    def from_db(cls, rng=None):
+        from .models import Sovga
+        prizes = [
+            Prize(*row)
+            for row in Sovga.objects.filter(is_active=True)
+            .order_by('katak_raqami')
+            .values_list('id', 'nomi', 'katak_raqami', 'foiz')
+        ]
+        return cls(prizes, rng=rng)
+
+    @staticmethod
+    def _build(weights):
+        n = len(weights)
+        if not n:
+            return [], []
+
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Yaxlitlash xatolari tufayli qolganlar
+        for i in large + small:
+            prob[i] = 1.0
+        return prob, alias
+
+    @property
+    def empty(self):
+        """Faol sovg'a yo'q (foizi 0 bo'lsa ham faol sovg'a bor bo'lsa - bo'sh emas)"""
+        return not self.active_count
+
+    def draw(self):
+        """Bitta katakni tanlaydi (O(1)). "Yutuq yo'q" uchun katak tasodifiy bo'ladi."""
+        i = self.rng.randrange(len(self.prizes))
+        if self.rng.random() >= self.prob[i]:
+            i = self.alias[i]
+
+        prize = self.prizes[i]
+        if prize.sovga_id is None:
+            prize = prize._replace(katak_raqami=self.rng.randint(1, 10))
+        return prize
+
+    def probabilities(self):
+        """Audit uchun: har bir sovg'aning yutish ehtimoli"""
+        return [(prize.nomi, prize.foiz / self.total) for prize in self.prizes]
+
+
+def get_rng():
+    """
+    BARABAN_RNG = 'system' - secrets.SystemRandom (OS entropiyasi, bashorat qilib bo'lmaydi),
+    'random' - random.Random (BARABAN_RNG_SEED bilan takrorlanadigan natijalar, testlar uchun).
+    """
+    kind = getattr(settings, 'BARABAN_RNG', 'system')
+    if kind == 'system':
+        return secrets.SystemRandom()
+    return random.Random(getattr(settings, 'BARABAN_RNG_SEED', None))
+
+
+_sampler = None
+_sampler_version = None
+_sampler_lock = threading.Lock()
+
+
+def get_prize_sampler():
+    """
+    Jarayon uchun keshlangan sampler. Sovga o'zgarganda versiya oshiriladi;
+    umumiy cache backend (Redis/Memcached) bilan boshqa workerlar ham qayta quradi.
+    """
+    global _sampler, _sampler_version
+    version = cache.get(VERSION_KEY, 0)
+    with _sampler_lock:
+        if _sampler is None or _sampler_version != version:
+            _sampler = PrizeSampler.from_db(rng=get_rng())
+            _sampler_version = version
+        return _sampler
+
+
+def invalidate_prize_sampler():
+    global _sampler
+    with _sampler_lock:
+        _sampler = None
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
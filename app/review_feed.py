@@ -0,0 +1,62 @@
+import hashlib
+
+from django.db.models import Count, Max
+
+from .keyset import keyset_page
+from .models import Review
+
+PAGE_SIZE = 10
+
+# Yulduz turi -> Font Awesome klasslari
+STAR_CLASSES = {
+    'full': 'fas fa-star',
+    'half': 'fas fa-star-half-alt',
+    'empty': 'far fa-star',
+}
+
+
+def star_breakdown(rating):
+    """Review.get_stars bilan bir xil qoida, lekin JSON ga yaroqli sonlar"""
+    full = int(rating)
+    half = rating - full >= 0.5
+    return {'full': full, 'half': half, 'empty': 5 - full - int(half)}
+
+
+def star_classes(rating):
+    stars = star_breakdown(rating)
+    return (
+        [STAR_CLASSES['full']] * stars['full']
+        + [STAR_CLASSES['half']] * stars['half']
+        + [STAR_CLASSES['empty']] * stars['empty']
+    )
+
+
+def reviews_page(params):
+    """
+    Keyset sahifalash (created_at, id) bo'yicha, eng yangisi birinchi: ?cursor=<oldingi
+    sahifaning next_cursor i>. Har bir sharhga tayyor `stars` va `star_classes` qo'shiladi.
+    """
+    reviews = Review.objects.filter(is_active=True).select_related('user')
+    page, next_cursor = keyset_page(reviews, params.get('cursor'), PAGE_SIZE)
+    for review in page:
+        review.stars = star_breakdown(review.rating)
+        review.star_classes = star_classes(review.rating)
+    return page, next_cursor
+
+
+def feed_validators(request):
+    """
+    Shartli GET uchun (etag, last_modified): eng so'nggi o'zgargan sharh vaqti.
+    Soft-delete ham updated_at ni yangilaydi, qattiq o'chirish esa soni orqali seziladi.
+    ETag foydalanuvchi va so'rovga bog'liq (tahrirlash tugmalari, kursor).
+    """
+    state = Review.objects.aggregate(latest=Max('updated_at'), count=Count('id'))
+    latest = state['latest']
+    key = '|'.join((
+        latest.isoformat() if latest else '',
+        str(state['count']),
+        str(request.user.pk or ''),
+        request.GET.urlencode(),
+    ))
+    etag = '"%s"' % hashlib.md5(key.encode()).hexdigest()
+    return etag, latest
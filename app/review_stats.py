@@ -0,0 +1,95 @@
+from django.db.models import Count, F, Q, Sum
+
+from .models import Review, ReviewRatingSummary
+
+SUMMARY_PK = 1
+
+# Yulduzlar soni -> maydon ([n, n+1) oralig'i, 5 - faqat 5.0)
+BUCKET_FIELDS = {
+    5: 'five_star',
+    4: 'four_star',
+    3: 'three_star',
+    2: 'two_star',
+    1: 'one_star',
+}
+SUMMARY_FIELDS = ('total', 'rating_sum') + tuple(BUCKET_FIELDS.values())
+
+
+def bucket_field(rating):
+    return BUCKET_FIELDS[min(max(int(rating), 1), 5)]
+
+
+def compute_review_summary():
+    """Review jadvalidan to'liq hisob (bitta aggregate so'rov)"""
+    active = Q(is_active=True)
+    values = Review.objects.aggregate(
+        total=Count('id', filter=active),
+        rating_sum=Sum('rating', filter=active),
+        five_star=Count('id', filter=active & Q(rating__gte=5)),
+        four_star=Count('id', filter=active & Q(rating__gte=4, rating__lt=5)),
+        three_star=Count('id', filter=active & Q(rating__gte=3, rating__lt=4)),
+        two_star=Count('id', filter=active & Q(rating__gte=2, rating__lt=3)),
+        one_star=Count('id', filter=active & Q(rating__lt=2)),
+    )
+    values['rating_sum'] = values['rating_sum'] or 0
+    return values
+
+
+def rebuild_review_summary():
+    summary, _ = ReviewRatingSummary.objects.update_or_create(pk=SUMMARY_PK, defaults=compute_review_summary())
+    return summary
+
+
+def get_review_summary():
+    """Yagona statistika qatori (yo'q bo'lsa Review dan quriladi)"""
+    return ReviewRatingSummary.objects.filter(pk=SUMMARY_PK).first() or rebuild_review_summary()
+
+
+def apply_review_change(old=None, new=None):
+    """
+    Sharh o'zgarishini qatorga qo'shadi. old/new - o'zgarishdan oldingi va keyingi
+    (rating, is_active) holati; yangi sharh uchun old=None, o'chirilganda new=None.
+
+    Chaqiruvchining transaction.atomic() bloki ichida, sharh saqlangandan keyin
+    chaqiriladi: qator hali yo'q bo'lsa u to'liq qayta hisoblanadi (o'zgarish ham kiradi).
+    """
+    deltas = {}
+
+    def add(state, sign):
+        if not state or not state[1]:
+            return
+        rating = state[0]
+        deltas['total'] = deltas.get('total', 0) + sign
+        deltas['rating_sum'] = deltas.get('rating_sum', 0) + sign * rating
+        field = bucket_field(rating)
+        deltas[field] = deltas.get(field, 0) + sign
+
+    add(old, -1)
+    add(new, 1)
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    updated = ReviewRatingSummary.objects.filter(pk=SUMMARY_PK).update(
+        **{field: F(field) + value for field, value in deltas.items()}
+    )
+    if not updated:
+        rebuild_review_summary()
+
+
+def review_state(review):
+    return (review.rating, review.is_active)
+
+
+def summary_payload(summary):
+    """get_review_stats JSON formati"""
+    total = summary.total
+    rating_counts = {str(stars): getattr(summary, field) for stars, field in BUCKET_FIELDS.items()}
+    return {
+        'total': total,
+        'average': float(summary.average),
+        'rating_counts': rating_counts,
+        'rating_percentages': {
+            stars: (count / (total or 1)) * 100 for stars, count in rating_counts.items()
+        },
+    }
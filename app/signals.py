@@ -1,10 +1,104 @@
 from django.contrib.auth.models import User
-from .models import Profile
-from django.db.models.signals import post_save
+from .models import Profile, Order, Sovga, Media, Advertisement, CarpetType, Review
+from .ad_rotation import invalidate_plan
+from .page_cache import bump_generation
+from .prize_sampler import invalidate_prize_sampler
+from .sqlite_profile import apply_sqlite_profile
+from .stats import invalidate_site_stats
+from .thumbnails import delete_thumbnails, schedule_thumbnails
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 
 @receiver(post_save, sender=User)
 def create_or_update_user_profile(sender, instance, created, **kwargs):
     Profile.objects.get_or_create(user=instance)
-    instance.profile.save()
\ No newline at end of file
+    instance.profile.save()
+
+
+# Buyurtma o'zgarsa keshlangan statistika tozalanadi
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_stats(sender, instance, **kwargs):
+    invalidate_site_stats()
+
+
+# Sovg'a o'zgarsa baraban sampleri qayta quriladi
+@receiver(post_save, sender=Sovga)
+@receiver(post_delete, sender=Sovga)
+def invalidate_sovga_sampler(sender, instance, **kwargs):
+    invalidate_prize_sampler()
+
+
+# Reklama o'zgarsa aylanish rejasi qayta quriladi (commitdan keyin)
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+def invalidate_ad_rotation(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_plan)
+
+
+# Yuklangan rasmlar uchun kichraytirilgan nusxalar (tranzaksiya tugagach)
+@receiver(post_save, sender=Media)
+@receiver(post_save, sender=Advertisement)
+def build_image_thumbnails(sender, instance, **kwargs):
+    transaction.on_commit(lambda: schedule_thumbnails(instance.image))
+
+
+@receiver(post_save, sender=Profile)
+def build_avatar_thumbnails(sender, instance, **kwargs):
+    if instance.avatar:
+        transaction.on_commit(lambda: schedule_thumbnails(instance.avatar))
+
+
+# Nusxalari yaratiladigan rasm maydonlari
+THUMBNAIL_FIELDS = {Media: 'image', Advertisement: 'image', Profile: 'avatar'}
+
+
+# Yozuv o'chirilsa uning rasm nusxalari ham o'chiriladi (commitdan keyin)
+@receiver(post_delete, sender=Media)
+@receiver(post_delete, sender=Advertisement)
+@receiver(post_delete, sender=Profile)
+def delete_image_thumbnails(sender, instance, **kwargs):
+    field = getattr(instance, THUMBNAIL_FIELDS[sender])
+    if field and field.name:
+        name, storage = field.name, field.storage
+        transaction.on_commit(lambda: delete_thumbnails(name, storage))
+
+
+# Rasm almashtirilsa eski faylning nusxalari o'chiriladi
+@receiver(pre_save, sender=Media)
+@receiver(pre_save, sender=Advertisement)
+@receiver(pre_save, sender=Profile)
+def delete_replaced_thumbnails(sender, instance, raw=False, update_fields=None, **kwargs):
+    attname = THUMBNAIL_FIELDS[sender]
+    if raw or instance.pk is None or (update_fields is not None and attname not in update_fields):
+        return
+    old_name = sender._default_manager.filter(pk=instance.pk).values_list(attname, flat=True).first()
+    field = getattr(instance, attname)
+    if old_name and old_name != field.name:
+        storage = field.storage
+        transaction.on_commit(lambda: delete_thumbnails(old_name, storage))
+
+
+# Anonim sahifa keshi: shu modellarga bog'liq sahifalar yangidan render qilinadi
+@receiver(post_save, sender=CarpetType)
+@receiver(post_delete, sender=CarpetType)
+@receiver(post_save, sender=Media)
+@receiver(post_delete, sender=Media)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_page_cache(sender, instance, **kwargs):
+    # Commitdan keyin: aks holda parallel render eski ma'lumotni yangi kalit ostida saqlashi mumkin
+    transaction.on_commit(lambda: bump_generation(sender.__name__))
+
+
+# SQLite production profili: har bir yangi ulanishda PRAGMA lar
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    apply_sqlite_profile(connection)
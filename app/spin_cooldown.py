@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import BarabanSpin, SpinCooldown
+
+
+def cooldown_period():
+    return timedelta(hours=getattr(settings, 'BARABAN_COOLDOWN_HOURS', 24))
+
+
+def get_cooldown(user):
+    """Foydalanuvchining kutish holati (oxirgi spin bilan birga, bitta so'rov)"""
+    return (
+        SpinCooldown.objects.select_related('last_spin__sovga')
+        .filter(user=user)
+        .first()
+    )
+
+
+def initial_next_spin(user, now):
+    """
+    Qator hali yo'q foydalanuvchi uchun: oxirgi spin tarixidan boshlang'ich qiymat
+    ((user, spin_vaqti) indeksi orqali bitta so'rov).
+    """
+    last_spin = BarabanSpin.objects.filter(user=user).order_by('-spin_vaqti').first()
+    if last_spin and last_spin.keyingi_spin_vaqti > now:
+        return last_spin.keyingi_spin_vaqti, last_spin
+    return now, last_spin
+
+
+def claim_spin(user, now=None):
+    """
+    Spin huquqini atomar band qiladi: shartli UPDATE faqat kutish vaqti o'tgan
+    bo'lsa qatorni yangilaydi, shuning uchun parallel so'rovlardan faqat bittasi yutadi.
+
+    Chaqiruvchining transaction.atomic() bloki ichida ishlatiladi.
+    (band_qilindimi, keyingi_spin_vaqti) qaytaradi.
+    """
+    now = now or timezone.now()
+    next_spin_at = now + cooldown_period()
+
+    claimed = SpinCooldown.objects.filter(user=user, next_spin_at__lte=now).update(next_spin_at=next_spin_at)
+    if claimed:
+        return True, next_spin_at
+
+    existing = SpinCooldown.objects.filter(user=user).values_list('next_spin_at', flat=True).first()
+    if existing is not None:
+        return False, existing
+
+    # Birinchi marta: qatorni yaratamiz (unique PK parallel yaratishdan himoya qiladi)
+    initial, last_spin = initial_next_spin(user, now)
+    if initial > now:
+        SpinCooldown.objects.get_or_create(user=user, defaults={'next_spin_at': initial, 'last_spin': last_spin})
+        return False, initial
+
+    try:
+        with transaction.atomic():
+            SpinCooldown.objects.create(user=user, next_spin_at=next_spin_at, last_spin=last_spin)
+    except IntegrityError:
+        return False, SpinCooldown.objects.values_list('next_spin_at', flat=True).get(user=user)
+    return True, next_spin_at
+
+
+def record_spin(user, spin):
+    SpinCooldown.objects.filter(user=user).update(last_spin=spin)
@@ -0,0 +1,32 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def is_memory_database(connection):
+    name = str(connection.settings_dict['NAME'])
+    return name == ':memory:' or 'mode=memory' in name
+
+
+def apply_sqlite_profile(connection):
+    """
+    Yangi SQLite ulanishiga settings.SQLITE_PRAGMAS ni qo'llaydi (SQLITE_PRODUCTION_PROFILE
+    yoqilgan bo'lsa). journal_mode fayl sarlavhasida saqlanadi, qolganlari ulanish
+    bo'yicha - shuning uchun har bir ulanishda qayta o'rnatiladi.
+    """
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_PRODUCTION_PROFILE', False):
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # In-memory bazada WAL ishlamaydi (testlar)
+            if name == 'journal_mode' and is_memory_database(connection):
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
+            if name == 'journal_mode':
+                mode = cursor.fetchone()[0]
+                if mode.lower() != str(value).lower():
+                    logger.warning("SQLite journal_mode=%s o'rnatilmadi (hozirgi: %s)", value, mode)
@@ -0,0 +1,23 @@
+// Reklama o'rinlari: har bir .ad-slot uchun navbatdagi banner api/ads/next/ dan olinadi
+// (sahifa keshlangan bo'lsa ham reklama aylanadi). Ko'rish banner qo'yilgandan keyingina
+// beacon bilan sanaladi - JS bajarmaydigan botlar va prefetch so'rovlari hisobga kirmaydi.
+(function() {
+    function sendImpression(url) {
+        if (navigator.sendBeacon && navigator.sendBeacon(url)) return;
+        fetch(url, {method: 'POST', keepalive: true}).catch(() => {});
+    }
+
+    document.querySelectorAll('.ad-slot[data-ad-url]').forEach(slot => {
+        const url = slot.dataset.adUrl;
+        slot.removeAttribute('data-ad-url');
+        fetch(url, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success || !data.ad) return;
+                slot.innerHTML = data.html;
+                const banner = slot.querySelector('.ad-banner[data-impression-url]');
+                if (banner) sendImpression(banner.dataset.impressionUrl);
+            })
+            .catch(error => console.error('Reklamani yuklashda xatolik:', error));
+    });
+})();
@@ -0,0 +1,82 @@
+// Katta fayllarni bo'laklab yuklash: aloqa uzilsa, sahifa qayta ochilganda ham
+// server qabul qilgan bo'laklar o'tkazib yuboriladi va yuklash davom etadi.
+(function(window) {
+    'use strict';
+
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+    async function request(url, options) {
+        const response = await fetch(url, Object.assign({credentials: 'same-origin'}, options));
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            const error = new Error(data.error || response.statusText);
+            error.status = response.status;
+            throw error;
+        }
+        return data;
+    }
+
+    // Tarmoq xatolari va 5xx qayta uriniladi, qolgan 4xx - darhol xato
+    function isRetryable(error) {
+        return !error.status || error.status >= 500 || error.status === 408 || error.status === 429;
+    }
+
+    async function chunkedUpload(file, meta, options) {
+        options = options || {};
+        const base = options.baseUrl || '/uploads/';
+        const headers = {'X-CSRFToken': options.csrfToken};
+        const retries = options.retries || 8;
+        const storageKey = 'chunked-upload:' + [file.name, file.size, file.lastModified].join(':');
+
+        let state = null;
+        const savedId = localStorage.getItem(storageKey);
+        if (savedId) {
+            try {
+                state = await request(`${base}${savedId}/`, {headers: headers});
+            } catch (e) {
+                localStorage.removeItem(storageKey);
+            }
+        }
+        if (!state) {
+            state = await request(base, {
+                method: 'POST',
+                headers: Object.assign({'Content-Type': 'application/json'}, headers),
+                body: JSON.stringify(Object.assign({filename: file.name, size: file.size}, meta)),
+            });
+            localStorage.setItem(storageKey, state.upload_id);
+        }
+
+        const received = new Set(state.received);
+        let done = received.size;
+        const report = () => options.onProgress && options.onProgress(done / state.total_chunks);
+        report();
+
+        for (let i = 0; i < state.total_chunks; i++) {
+            if (received.has(i)) continue;
+            const start = i * state.chunk_size;
+            const blob = file.slice(start, Math.min(file.size, start + state.chunk_size));
+
+            for (let attempt = 1; ; attempt++) {
+                try {
+                    await request(`${base}${state.upload_id}/chunks/${i}/`, {
+                        method: 'PUT',
+                        headers: Object.assign({'Content-Type': 'application/octet-stream'}, headers),
+                        body: blob,
+                    });
+                    break;
+                } catch (e) {
+                    if (!isRetryable(e) || attempt >= retries) throw e;
+                    await sleep(Math.min(1000 * 2 ** (attempt - 1), 30000));
+                }
+            }
+            done++;
+            report();
+        }
+
+        const result = await request(`${base}${state.upload_id}/finalize/`, {method: 'POST', headers: headers});
+        localStorage.removeItem(storageKey);
+        return result;
+    }
+
+    window.chunkedUpload = chunkedUpload;
+})(window);
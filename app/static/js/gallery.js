@@ -0,0 +1,34 @@
+// Media galereyalari: sentinel ko'ringanda keyingi kartalar api/media/ dan yuklanadi
+// (keyset: ?cursor=<next_cursor>). Qo'shilgandan keyin konteynerga 'gallery:loaded' hodisasi yuboriladi.
+(function() {
+    if (!('IntersectionObserver' in window)) return;
+
+    document.querySelectorAll('.gallery-sentinel').forEach(sentinel => {
+        const target = document.getElementById(sentinel.dataset.galleryTarget);
+        if (!target) return;
+
+        let loading = false;
+        const observer = new IntersectionObserver(entries => {
+            if (!entries.some(entry => entry.isIntersecting) || loading) return;
+            const cursor = sentinel.dataset.cursor;
+            if (!cursor) return;
+
+            loading = true;
+            fetch(`${sentinel.dataset.url}&cursor=${encodeURIComponent(cursor)}`, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+                .then(response => response.json())
+                .then(data => {
+                    target.insertAdjacentHTML('beforeend', data.html);
+                    target.dispatchEvent(new CustomEvent('gallery:loaded', {bubbles: true, detail: data}));
+                    sentinel.dataset.cursor = data.next_cursor || '';
+                    if (!data.next_cursor) {
+                        sentinel.hidden = true;
+                        observer.disconnect();
+                    }
+                })
+                .catch(error => console.error('Galereyani yuklashda xatolik:', error))
+                .finally(() => { loading = false; });
+        }, {rootMargin: '300px 0px'});
+
+        observer.observe(sentinel);
+    });
+})();
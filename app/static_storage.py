@@ -0,0 +1,64 @@
+import gzip
+import os
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+# Siqishdan foyda bo'ladigan matnli fayllar
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml', '.ico', '.ttf', '.eot')
+MIN_COMPRESS_SIZE = 256
+
+# style.3f9a1c2b4d5e.css - ManifestStaticFilesStorage qo'shgan 12 belgili hash
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+
+def is_hashed(name):
+    return bool(HASHED_NAME_RE.search(name))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    collectstatic: fayl nomlariga mazmun hashi qo'shiladi (staticfiles.json manifest),
+    matnli fayllarning yonida oldindan siqilgan .gz nusxa yaratiladi.
+
+    Manifestda topilmagan fayl uchun xato o'rniga asl nom qaytariladi
+    (shablonlardagi mavjud bo'lmagan rasmlar sahifani sindirmasin).
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        for name in self.hashed_files.values():
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            compressed = self.compress(name)
+            if compressed:
+                yield name, compressed, True
+
+    def compress(self, name):
+        """name.gz ni yaratadi; siqish foyda bermasa None"""
+        path = self.path(name)
+        if os.path.getsize(path) < MIN_COMPRESS_SIZE:
+            return None
+
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        # mtime=0 - bir xil mazmun uchun bir xil .gz (qayta build diff bermaydi)
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(packed) >= len(data) * 0.95:
+            return None
+
+        gz_path = path + '.gz'
+        with open(gz_path, 'wb') as fh:
+            fh.write(packed)
+        return name + '.gz'
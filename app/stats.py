@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Order
+from .visit_stats import STAT_FIELDS, get_day_stats, local_today, start_of_day
+
+STATS_CACHE_KEY = 'site_stats:{day}'
+
+
+def compute_order_stats(day):
+    """Barcha buyurtma hisoblagichlari bitta so'rovda (Count + filter)"""
+    today = Q(created_at__gte=start_of_day(day), created_at__lt=start_of_day(day + timedelta(days=1)))
+    return Order.objects.aggregate(
+        # Bugungi buyurtmalar
+        new_orders=Count('id', filter=today & Q(status='new')),
+        processing_orders=Count('id', filter=today & Q(status='processing')),
+        completed_orders=Count('id', filter=today & Q(status='completed')),
+
+        # Umumiy buyurtmalar
+        total_orders=Count('id'),
+        total_new_orders=Count('id', filter=Q(status='new')),
+        total_processing_orders=Count('id', filter=Q(status='processing')),
+        total_completed_orders=Count('id', filter=Q(status='completed')),
+    )
+
+
+def compute_visit_stats(day):
+    """Bugungi kirishlar (VisitDailyStat dan bitta qator)"""
+    visit_stats = get_day_stats(day)
+    values = {field: getattr(visit_stats, field) for field in STAT_FIELDS}
+    return {
+        'today_visits': values['visits'],
+        'guests_today': values['guests'],
+        'users_today': values['users'],
+        'admins_today': values['admins'],
+        'staff_today': values['staff'],
+        'customers_today': values['customers'],
+    }
+
+
+def get_site_stats(day=None):
+    """
+    Bosh sahifa, mijozlar va dashboard uchun umumiy statistika.
+    Natija STATS_CACHE_TTL soniya keshlanadi, Order o'zgarganda tozalanadi.
+    """
+    day = day or local_today()
+    key = STATS_CACHE_KEY.format(day=day.isoformat())
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = {**compute_visit_stats(day), **compute_order_stats(day)}
+        cache.set(key, stats, getattr(settings, 'STATS_CACHE_TTL', 30))
+    return stats
+
+
+def invalidate_site_stats(day=None):
+    day = day or local_today()
+    cache.delete(STATS_CACHE_KEY.format(day=day.isoformat()))
@@ -0,0 +1,158 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+
+from .static_storage import is_hashed
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeReader:
+    """
+    Fayldan faqat [start, start + length) oralig'ini o'qiydigan obyekt.
+
+    fileno() ochiq qoldirilgan: wsgi.file_wrapper (masalan gunicorn) faylning joriy
+    pozitsiyasi va Content-Length bo'yicha os.sendfile() dan foydalana oladi.
+    Aks holda CHUNK_SIZE bo'laklarda o'qiladi.
+    """
+
+    def __init__(self, fh, start, length):
+        self.fh = fh
+        self.remaining = length
+        fh.seek(start)
+
+    def read(self, size=CHUNK_SIZE):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fh.fileno()
+
+    def close(self):
+        self.fh.close()
+
+
+def parse_range(header, size):
+    """
+    'bytes=a-b', 'bytes=a-', 'bytes=-n' ko'rinishidagi bitta oraliq -> (start, end).
+    Sintaksis noto'g'ri yoki bir nechta oraliq bo'lsa None (to'liq javob),
+    qondirib bo'lmasa ValueError.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and start > end:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request, etag, mtime):
+    """If-Range sarlavhasi bo'lmasa yoki fayl o'zgarmagan bo'lsa True"""
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    since = parse_http_date_safe(value)
+    return since is not None and int(mtime) <= since
+
+
+def stream_file(request, path, content_type=None):
+    """
+    Faylni HTTP Range qo'llab-quvvatlashi bilan qaytaradi: 206 Partial Content,
+    416, If-Range, ETag / Last-Modified (304) va HEAD.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = http_date(stat.st_mtime)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        not_modified.headers['Accept-Ranges'] = 'bytes'
+        return not_modified
+
+    content_type = content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    start, end, status = 0, size - 1, 200
+
+    header = request.META.get('HTTP_RANGE')
+    if header and size and if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{size}'
+            response.headers['Accept-Ranges'] = 'bytes'
+            return response
+        if byte_range:
+            start, end = byte_range
+            status = 206
+
+    length = end - start + 1 if size else 0
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type, status=status)
+    else:
+        response = FileResponse(RangeReader(open(path, 'rb'), start, length), content_type=content_type, status=status)
+        response.block_size = CHUNK_SIZE
+
+    response.headers['Content-Length'] = str(length)
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = last_modified
+    if status == 206:
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def serve_static(request, path):
+    """
+    STATIC_BUILD rejimida STATIC_ROOT dan fayl beradi: brauzer gzip qabul qilsa
+    oldindan siqilgan .gz nusxa, hashlangan nomlar uchun Cache-Control: immutable.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Fayl topilmadi")
+    if not os.path.isfile(full_path):
+        raise Http404("Fayl topilmadi")
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    gzipped = 'gzip' in request.headers.get('Accept-Encoding', '') and os.path.isfile(full_path + '.gz')
+    response = stream_file(request, full_path + '.gz' if gzipped else full_path, content_type)
+
+    if gzipped and response.status_code in (200, 206):
+        response.headers['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if is_hashed(path):
+        max_age = getattr(settings, 'STATIC_IMMUTABLE_MAX_AGE', 365 * 24 * 60 * 60)
+        response.headers['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
@@ -1,21 +1,130 @@
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
-def send_telegram_message(text):
-    bot_token = settings.TELEGRAM_BOT_TOKEN
-    chat_id = settings.TELEGRAM_CHAT_ID
+# Telegram bitta xabarga 4096 belgidan ortiq qabul qilmaydi
+MESSAGE_LIMIT = 4096
+
+
+class TelegramError(Exception):
+    def __init__(self, message, retry_after=None, status_code=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+    @property
+    def permanent(self):
+        """4xx (429 dan tashqari): xabarning o'zi noto'g'ri, qayta yuborish yordam bermaydi"""
+        return self.status_code is not None and 400 <= self.status_code < 500 and self.status_code != 429
+
+
+class CircuitOpen(TelegramError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Ketma-ket `failure_threshold` ta xatolikdan keyin `reset_timeout` soniya
+    so'rov yubormaydi (open), so'ng bitta sinov so'roviga ruxsat beradi (half-open).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        return self.state != 'open'
+
+    def remaining(self):
+        if self.opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (self.clock() - self.opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = self.clock()
+
+
+class TelegramClient:
+    """Ulanishlar pulini qayta ishlatadigan, timeout va circuit breaker bilan klient"""
+
+    def __init__(self, token=None, chat_id=None, api_url=None, timeout=None, breaker=None, session=None):
+        self.token = token or settings.TELEGRAM_BOT_TOKEN
+        self.chat_id = chat_id or settings.TELEGRAM_CHAT_ID
+        self.api_url = (api_url or getattr(settings, 'TELEGRAM_API_URL', 'https://api.telegram.org')).rstrip('/')
+        self.timeout = timeout or getattr(settings, 'TELEGRAM_TIMEOUT', (3.05, 10))
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=getattr(settings, 'TELEGRAM_BREAKER_THRESHOLD', 5),
+            reset_timeout=getattr(settings, 'TELEGRAM_BREAKER_RESET', 60.0),
+        )
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def send(self, text):
+        """Xabarni yuboradi, muvaffaqiyatsiz bo'lsa TelegramError ko'taradi"""
+        if not self.breaker.allow():
+            raise CircuitOpen("Telegram vaqtincha o'chirilgan (circuit open)", retry_after=self.breaker.remaining())
+
+        url = f"{self.api_url}/bot{self.token}/sendMessage"
+        data = {
+            "chat_id": self.chat_id,
+            "text": text[:MESSAGE_LIMIT],
+            "parse_mode": "Markdown"
+        }
+
+        try:
+            response = self.session.post(url, data=data, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            raise TelegramError(f"Tarmoq xatosi: {e}")
 
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        if response.status_code == 200:
+            self.breaker.record_success()
+            return response
 
-    data = {
-        "chat_id": chat_id,
-        "text": text,
-        "parse_mode": "Markdown"
-    }
+        retry_after = None
+        try:
+            retry_after = response.json().get('parameters', {}).get('retry_after')
+        except ValueError:
+            pass
 
-    try:
-        requests.post(url, data=data)
-    except Exception as e:
-        print("Telegram error:", e)
+        # 4xx (429 dan tashqari) - xabarning o'zida muammo, API ishlayapti
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        raise TelegramError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retry_after=retry_after, status_code=response.status_code,
+        )
 
 
+def enqueue_telegram_message(text):
+    """Xabarni outboxga yozadi; chaqiruvchining tranzaksiyasi ichida ishlatiladi"""
+    from .models import TelegramOutbox
+    return TelegramOutbox.objects.create(text=text)
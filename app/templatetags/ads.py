@@ -0,0 +1,13 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('app/ad_slot_placeholder.html')
+def ad_slot(slot='default'):
+    """
+    Reklama o'rni: sahifada faqat bo'sh joy, banner brauzerda api/ads/next/ dan
+    olinadi (js/ad_slot.js). Shu tufayli keshlangan sahifada ham har ko'rishda
+    navbatdagi reklama chiqadi va impression har safar sanaladi.
+    """
+    return {'slot': slot}
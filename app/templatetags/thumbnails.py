@@ -0,0 +1,32 @@
+from django import template
+from django.utils.html import format_html
+
+from app import thumbnails
+
+register = template.Library()
+
+DEFAULT_SIZES = '100vw'
+
+
+@register.simple_tag
+def srcset(image, sizes=DEFAULT_SIZES):
+    """<img> uchun srcset va sizes atributlari (nusxalar bo'lmasa hech narsa)"""
+    value = thumbnails.build_srcset(image)
+    if not value:
+        return ''
+    return format_html('srcset="{}" sizes="{}"', value, sizes)
+
+
+@register.simple_tag
+def webp_source(image, sizes=DEFAULT_SIZES):
+    """<picture> ichidagi WebP <source> elementi"""
+    value = thumbnails.build_srcset(image, webp=True)
+    if not value:
+        return ''
+    return format_html('<source type="image/webp" srcset="{}" sizes="{}">', value, sizes)
+
+
+@register.simple_tag
+def thumbnail_url(image, width):
+    """Kamida width pikselli eng kichik nusxa (avatar kabi kichik rasmlar uchun)"""
+    return thumbnails.thumbnail_url(image, int(width))
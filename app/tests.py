@@ -1,3 +1,1484 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from PIL import Image
+
+from app import ad_rotation, chunked_upload, media_gallery, thumbnails, urls as app_urls
+from app.management.commands import archive_visit_logs
+from app.management.commands.extract_inline_assets import minify_css, minify_js
+from app.management.commands.send_telegram_outbox import digest_text, pack_digest
+from app.models import (
+    Advertisement, BarabanSpin, CarpetType, Media, Order, Review, ReviewRatingSummary, Sovga, TelegramOutbox,
+    VisitDailyStat, VisitLog, Yutuq,
+)
+from app.keyset import encode_cursor
+from app.prize_sampler import NO_PRIZE_NAME, Prize, PrizeSampler, invalidate_prize_sampler
+from app.review_stats import (
+    SUMMARY_FIELDS, SUMMARY_PK, apply_review_change, compute_review_summary, rebuild_review_summary, review_state,
+)
+from app.spin_cooldown import claim_spin
+from app.streaming import parse_range, stream_file
+from app.telegram_bot import (
+    MESSAGE_LIMIT, CircuitBreaker, CircuitOpen, TelegramClient, TelegramError, enqueue_telegram_message,
+)
+from app.view_counter import flush_views, pending_views, record_view, view_counter
+from app.visit_stats import STAT_FIELDS, local_today, rebuild_day, save_visits
+from app.visit_writer import VisitLogWriter
+
+ROLES = ('anonymous', 'customer', 'staff')
+
+# view nomi -> (maksimal SQL so'rovlar, maksimal javob hajmi baytda), har uchala rol uchun.
+# Ro'yxatda bo'lmagan nom testni yiqitadi: yangi URL qo'shilsa byudjeti ham yoziladi.
+# Bu maqsadli ko'rsatkichlar emas: qiymatlar joriy holatda o'lchangan eng katta son (seed
+# ma'lumotlari bilan, PERF_TABLE jadvali) + biroz zaxira. Demak test faqat shu zaxiradan
+# kattaroq regressiyani ushlaydi (masalan, N+1 so'rov); sahifa tezlashtirilsa byudjet ham kamaytiriladi.
+BUDGETS = {
+    'ad_detail': (12, 1_000),
+    'ad_impression': (10, 1_000),
+    'add_photo': (10, 5_000),
+    'add_review': (10, 1_000),
+    'add_video': (13, 31_000),
+    'ads': (11, 1_000),
+    'baraban': (13, 45_000),
+    'boshqaruv': (10, 9_000),
+    'clients': (14, 98_000),
+    'clients_json': (11, 111_000),
+    'create_ad': (10, 2_000),
+    'create_order': (10, 1_000),
+    'delete_media': (6, 1_000),
+    'delete_order': (10, 1_000),
+    'delete_photo': (12, 1_000),
+    'delete_review': (15, 1_000),
+    'delete_video': (12, 1_000),
+    'edit_media': (6, 230_000),
+    'edit_photo': (11, 6_000),
+    'edit_review': (11, 1_000),
+    'edit_video': (14, 31_000),
+    'foydalanuvchi_detail': (16, 6_000),
+    'foydalanuvchilar_list': (13, 58_000),
+    'get_review': (12, 1_000),
+    'get_yutuq_info': (13, 1_000),
+    'index': (18, 27_000),
+    'mark_yutuq_used': (12, 1_000),
+    'media_json': (11, 20_000),
+    'next_ad': (12, 1_000),
+    'photo_list': (13, 23_000),
+    'profile': (11, 9_000),
+    'review_stats': (11, 1_000),
+    'reviews_json': (12, 17_000),
+    'reviews_list': (13, 21_000),
+    'sovga_management': (11, 26_000),
+    'sozlamalar': (11, 7_000),
+    'spin_baraban': (10, 1_000),
+    'stream_ad_video': (11, 6_000),
+    'stream_media_video': (15, 6_000),
+    'update_order_status': (10, 1_000),
+    'update_yutuq': (10, 1_000),
+    'upload_chunk': (10, 1_000),
+    'upload_finalize': (10, 1_000),
+    'upload_init': (10, 1_000),
+    'upload_status': (10, 1_000),
+    'video_list': (13, 31_000),
+    'video_rasim': (5, 230_000),
+}
+
+# URL dagi <pk> qaysi seed obyektiga tegishli (qolganlari - cls.photo)
+PK_OBJECTS = {
+    'ad_detail': 'ad',
+    'ad_impression': 'ad',
+    'stream_ad_video': 'video_ad',
+    'edit_video': 'video',
+    'delete_video': 'video',
+    'stream_media_video': 'video',
+}
+
+# Parametrsiz 400 qaytaradigan JSON endpointlar uchun GET parametrlari
+QUERY_PARAMS = {
+    'media_json': {'type': 'photo', 'layout': 'list'},
+    'next_ad': {'slot': 'home'},
+}
+
+
+def image_file(name, size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 60)).save(buffer, 'JPEG')
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def named_patterns():
+    """app/urls.py dagi nomli URL lar (admin include siz), har bir nom bir marta"""
+    seen = {}
+    for pattern in app_urls.urlpatterns:
+        if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in seen:
+            seen[pattern.name] = pattern
+    return seen
+
+
+@override_settings(PAGE_CACHE_ENABLED=False, VIEW_COUNTER_FLUSH_INTERVAL=0)
+class ViewBudgetTests(TestCase):
+    """
+    Har bir nomli URL ni anonim, mijoz va xodim sifatida so'raydi va SQL so'rovlar
+    soni hamda javob hajmi BUDGETS dan oshmasligini tekshiradi. Oxirida commitlar
+    orasida solishtirish uchun jadval PERF_TABLE muhit o'zgaruvchisidagi faylga yoziladi
+    (PERF_TABLE=- bo'lsa stderr ga).
+    """
+
+    results = []
+
+    @classmethod
+    def setUpClass(cls):
+        # Seed rasmlari vaqtinchalik papkaga, tearDownClass da o'chiriladi
+        cls.media_root = tempfile.mkdtemp(prefix='gilam_perf_')
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.media_override.disable()
+            shutil.rmtree(cls.media_root, ignore_errors=True)
+            raise
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('mijoz', password='parol123', first_name='Ali')
+        cls.staff = User.objects.create_superuser('admin', 'admin@example.com', 'parol123')
+        customers = [User.objects.create_user(f'mijoz{i}', password='parol123') for i in range(30)]
+
+        carpets = [CarpetType.objects.create(name=f'Gilam {i}', price_per_m2=10000 + i * 1000) for i in range(5)]
+        today = timezone.localdate()
+        Order.objects.bulk_create([
+            Order(
+                name=f'Mijoz {i}', phone='+998901234567', address=f"Ko'cha {i}",
+                carpet_type=carpets[i % 5], other_carpet_name='', date=today - timedelta(days=i % 20),
+                status=('new', 'processing', 'completed')[i % 3],
+            )
+            for i in range(120)
+        ])
+        cls.order = Order.objects.first()
+
+        sovgalar = [Sovga.objects.create(nomi=f"Sovg'a {i}", foiz=10, katak_raqami=i + 1) for i in range(6)]
+        for i, user in enumerate(customers):
+            spin = BarabanSpin.objects.create(
+                user=user, sovga=sovgalar[i % 6], keyingi_spin_vaqti=timezone.now() + timedelta(hours=24)
+            )
+            Yutuq.objects.create(user=user, sovga=spin.sovga)
+        cls.yutuq = Yutuq.objects.first()
+
+        cls.photo = Media.objects.create(title='Rasm 0', media_type='photo', image=image_file('rasm0.jpg'))
+        for i in range(1, 40):
+            Media.objects.create(title=f'Rasm {i}', media_type='photo', image=image_file(f'rasm{i}.jpg'))
+        cls.video = Media.objects.create(
+            title='Video 0', media_type='video', video_file=ContentFile(b'\x00' * 4096, name='video0.mp4')
+        )
+        for i in range(1, 20):
+            Media.objects.create(title=f'Video {i}', media_type='video', video_url='https://example.com/v.mp4')
+
+        for user in [cls.customer] + customers:
+            Review.objects.create(user=user, rating=4.5, comment='Juda yaxshi xizmat')
+        cls.review = Review.objects.get(user=cls.customer)
+        rebuild_review_summary()
+
+        cls.ad = Advertisement.objects.create(
+            title='Chegirma', description='Bugun 10% chegirma', ad_type='image', image=image_file('ad.jpg'),
+            duration_days=7,
+        )
+        cls.video_ad = Advertisement.objects.create(
+            title='Video reklama', description='Yangi xizmat', ad_type='video',
+            video=ContentFile(b'\x00' * 4096, name='ad.mp4'), duration_days=3,
+        )
+        VisitLog.objects.bulk_create([
+            VisitLog(user=customers[i % 30], session_key=f's{i}', ip_address='127.0.0.1', path='/')
+            for i in range(200)
+        ])
+        # Kunlik statistika qatori tayyor: birinchi so'rov uni qayta qurmasin
+        rebuild_day(local_today())
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls.media_override.disable()
+            shutil.rmtree(cls.media_root, ignore_errors=True)
+        cls.write_table(os.environ.get('PERF_TABLE'))
+
+    @classmethod
+    def write_table(cls, target):
+        if not target or not cls.results:
+            return
+        table = cls.format_table()
+        if target == '-':
+            sys.stderr.write('\n' + table)
+            return
+        with open(target, 'w', encoding='utf-8') as fh:
+            fh.write(table)
+
+    @classmethod
+    def format_table(cls):
+        lines = [f"{'view':<24}{'rol':<11}{'status':>7}{'so`rov':>8}{'bayt':>9}{'ms':>9}"]
+        for row in sorted(cls.results):
+            name, role, status, queries, size, ms = row
+            lines.append(f"{name:<24}{role:<11}{status:>7}{queries:>8}{size:>9}{ms:>9.1f}")
+        return '\n'.join(lines) + '\n'
+
+    def setUp(self):
+        # Oldingi testlardan qolgan ko'rishlar bu testning so'rovlariga qo'shilmasin
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+
+    def url_kwargs(self, name, pattern):
+        values = {
+            'order_id': self.order.pk,
+            'user_id': self.customer.pk,
+            'yutuq_id': self.yutuq.pk,
+            'review_id': self.review.pk,
+            'upload_id': 'mavjud-emas',
+            'index': 0,
+        }
+        values['pk'] = getattr(self, PK_OBJECTS.get(name, 'photo')).pk
+        return {key: values[key] for key in pattern.pattern.converters}
+
+    def client_for(self, role):
+        client = Client(raise_request_exception=False)
+        if role != 'anonymous':
+            client.force_login(self.staff if role == 'staff' else self.customer)
+        return client
+
+    def measure(self, name, role, url):
+        client = self.client_for(role)
+        # Har bir so'rov sovuq keshdan (statistika, sampler, reklama rejasi)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url, QUERY_PARAMS.get(name, {}))
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        self.results.append((name, role, response.status_code, len(queries), len(content), elapsed_ms))
+        return response, len(queries), len(content)
+
+    def view_url(self, name):
+        pattern = named_patterns()[name]
+        return reverse(name, kwargs=self.url_kwargs(name, pattern))
+
+    def check_view(self, name):
+        url = self.view_url(name)
+        self.assertIn(name, BUDGETS, f"{name} uchun BUDGETS da byudjet yo'q")
+        max_queries, max_bytes = BUDGETS[name]
+
+        # Xodim oxirida: GET bilan o'chiradigan sahifalar qolgan rollarga ta'sir qilmasin
+        for role in ROLES:
+            with self.subTest(role=role):
+                response, queries, size = self.measure(name, role, url)
+                self.assertLess(response.status_code, 500, f"{url} ({role})")
+                self.assertLessEqual(queries, max_queries, f"{url} ({role}): SQL so'rovlar")
+                self.assertLessEqual(size, max_bytes, f"{url} ({role}): javob hajmi")
+
+
+def make_test(name):
+    def test(self):
+        self.check_view(name)
+    test.__name__ = f'test_{name}'
+    return test
+
+
+for _name in named_patterns():
+    setattr(ViewBudgetTests, f'test_{_name}', make_test(_name))
+
+
+class VisitStatsTests(TestCase):
+    """record_visits: kunlik qator rollar bo'yicha oshiriladi va rebuild_day bilan bir xil"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('mijoz', password='parol123')
+        cls.staff = User.objects.create_user('xodim', password='parol123', is_staff=True)
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'parol123')
+
+    def visit(self, user=None, session='s'):
+        return VisitLog(user=user, session_key=session, ip_address='127.0.0.1', path='/')
+
+    def stat_row(self, day):
+        stat = VisitDailyStat.objects.get(date=day)
+        return {field: getattr(stat, field) for field in STAT_FIELDS}
+
+    def assert_matches_rebuild(self, day):
+        row = self.stat_row(day)
+        self.assertEqual(row, {field: getattr(rebuild_day(day), field) for field in STAT_FIELDS})
+        return row
+
+    def test_role_buckets(self):
+        today = local_today()
+        save_visits([
+            self.visit(session='g1'), self.visit(session='g2'),
+            self.visit(self.customer, 'c1'), self.visit(self.customer, 'c2'),
+            self.visit(self.staff, 'x1'), self.visit(self.admin, 'a1'),
+        ], today)
+
+        row = self.assert_matches_rebuild(today)
+        self.assertEqual(row, {'visits': 6, 'guests': 2, 'users': 3, 'admins': 1, 'staff': 1, 'customers': 1})
+
+    def test_user_counted_once_across_batches(self):
+        today = local_today()
+        save_visits([self.visit(self.customer, 'c1')], today)
+        save_visits([self.visit(self.customer, 'c2'), self.visit(session='g1')], today)
+
+        row = self.assert_matches_rebuild(today)
+        self.assertEqual((row['visits'], row['users'], row['customers'], row['guests']), (3, 1, 1, 1))
+
+    def test_day_rollover_starts_new_row(self):
+        tz = timezone.get_default_timezone()
+        day = local_today() - timedelta(days=3)
+        late = timezone.make_aware(datetime.combine(day, datetime.max.time()), tz) - timedelta(minutes=1)
+
+        with mock.patch('django.utils.timezone.now', return_value=late):
+            save_visits([self.visit(self.customer, 'c1')], local_today())
+        # Yarim tundan keyin: o'sha mijoz yangi kunda yana noyob foydalanuvchi
+        with mock.patch('django.utils.timezone.now', return_value=late + timedelta(minutes=2)):
+            save_visits([self.visit(self.customer, 'c1'), self.visit(session='g1')], local_today())
+
+        first = self.assert_matches_rebuild(day)
+        second = self.assert_matches_rebuild(day + timedelta(days=1))
+        self.assertEqual((first['visits'], first['users'], first['guests']), (1, 1, 0))
+        self.assertEqual((second['visits'], second['users'], second['guests']), (2, 1, 1))
+
+
+class ReviewStatsTests(TestCase):
+    """ReviewRatingSummary: qo'shish/tahrirlash/o'chirish to'liq qayta hisob bilan bir xil, drift tuzatiladi"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(f'baholovchi{i}', password='parol123') for i in range(3)]
+
+    def stored(self):
+        summary = ReviewRatingSummary.objects.get(pk=SUMMARY_PK)
+        return {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+    def assert_in_sync(self):
+        self.assertEqual(self.stored(), compute_review_summary())
+
+    def post(self, user, name, data=None, **kwargs):
+        self.client.force_login(user)
+        response = self.client.post(reverse(name, kwargs=kwargs), data or {})
+        self.assertTrue(response.json()['success'], response.json())
+        return response.json()
+
+    def test_view_changes_match_full_recount(self):
+        rebuild_review_summary()
+        ids = [
+            self.post(user, 'add_review', {'rating': rating, 'comment': 'Zo\'r'})['review_id']
+            for user, rating in zip(self.users, (5, 4.5, 1))
+        ]
+        self.assert_in_sync()
+        self.assertEqual(self.stored()['total'], 3)
+
+        # Boshqa yulduz guruhiga o'tish: 4.5 -> 2
+        self.post(self.users[1], 'edit_review', {'rating': 2, 'comment': 'Yomonlashdi'}, review_id=ids[1])
+        self.assert_in_sync()
+        self.assertEqual((self.stored()['four_star'], self.stored()['two_star']), (0, 1))
+
+        self.post(self.users[0], 'delete_review', review_id=ids[0])
+        self.assert_in_sync()
+        self.assertEqual((self.stored()['total'], self.stored()['five_star']), (2, 0))
+
+    def test_missing_row_is_rebuilt_with_change(self):
+        review = Review.objects.create(user=self.users[0], rating=3)
+        self.assertFalse(ReviewRatingSummary.objects.exists())
+        apply_review_change(new=review_state(review))
+        self.assert_in_sync()
+        self.assertEqual(self.stored()['total'], 1)
+
+    def test_inactive_to_inactive_is_noop(self):
+        rebuild_review_summary()
+        with self.assertNumQueries(0):
+            apply_review_change((4, False), (2, False))
+
+    def test_verify_reports_and_repairs_drift(self):
+        for user, rating in zip(self.users, (5, 3, 2)):
+            Review.objects.create(user=user, rating=rating)
+        rebuild_review_summary()
+        call_command('verify_review_stats', stdout=io.StringIO())
+
+        ReviewRatingSummary.objects.filter(pk=SUMMARY_PK).update(total=F('total') + 4, five_star=0)
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('verify_review_stats', stdout=out)
+        self.assertIn('total: saqlangan=7 haqiqiy=3', out.getvalue())
+        self.assertIn('five_star: saqlangan=0 haqiqiy=1', out.getvalue())
+
+        call_command('verify_review_stats', fix=True, stdout=io.StringIO())
+        self.assert_in_sync()
+
+
+class ReviewFeedTests(TestCase):
+    """reviews_json: (created_at, id) kursori teng vaqtlarda ham takrorsiz va bo'shliqsiz"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('yozuvchi', password='parol123')
+        reviews = Review.objects.bulk_create([
+            Review(user=cls.user, rating=4, comment=f'Sharh {i}', is_active=i % 6 != 0) for i in range(30)
+        ])
+        # Hammasi bir xil vaqtda: tartibni faqat id hal qiladi
+        cls.moment = timezone.now() - timedelta(days=1)
+        Review.objects.update(created_at=cls.moment)
+        cls.active_ids = sorted((r.id for r in reviews if r.is_active), reverse=True)
+
+    def walk(self, **params):
+        ids, sizes, cursor = [], [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get(reverse('reviews_json'), query).json()
+            ids += [review['id'] for review in data['reviews']]
+            sizes.append(len(data['reviews']))
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids, sizes
+
+    def test_pages_with_equal_created_at(self):
+        ids, sizes = self.walk()
+        self.assertEqual(ids, self.active_ids)
+        self.assertEqual(sizes, [10, 10, 5])
+
+    def test_cursor_is_exclusive_boundary(self):
+        pivot = Review.objects.get(pk=self.active_ids[3])
+        data = self.client.get(reverse('reviews_json'), {'cursor': encode_cursor(pivot)}).json()
+        self.assertEqual([review['id'] for review in data['reviews']], self.active_ids[4:14])
+
+        # Bir mikrosoniya keyinroq yozilgan sharh birinchi keladi (kursor mikrosoniya aniqligida)
+        newer = Review.objects.create(user=self.user, rating=5, comment='Yangi')
+        Review.objects.filter(pk=newer.pk).update(created_at=self.moment + timedelta(microseconds=1))
+        self.assertEqual(self.walk()[0], [newer.pk] + self.active_ids)
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        for cursor in ('', 'abc', '12_', '-5_3', '9' * 40 + '_1'):
+            with self.subTest(cursor=cursor):
+                data = self.client.get(reverse('reviews_json'), {'cursor': cursor}).json()
+                self.assertEqual([review['id'] for review in data['reviews']], self.active_ids[:10])
+
+    def test_not_modified_until_a_review_changes(self):
+        response = self.client.get(reverse('reviews_json'))
+        etag = response['ETag']
+        self.assertEqual(self.client.get(reverse('reviews_json'), headers={'If-None-Match': etag}).status_code, 304)
+
+        Review.objects.filter(pk=self.active_ids[0]).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.client.get(reverse('reviews_json'), headers={'If-None-Match': etag}).status_code, 200)
+
+
+class MediaFeedTests(TestCase):
+    """media_json: teng created_at da keyset sahifalar, nofaollar faqat xodimga, limit chegarasi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('xodim', password='parol123', is_staff=True)
+        videos = Media.objects.bulk_create([
+            Media(title=f'Video {i}', media_type='video', video_url='https://example.com/v.mp4', is_active=i % 4 != 0)
+            for i in range(14)
+        ])
+        Media.objects.create(title='Rasm', media_type='photo', image='media/photos/yoq.jpg')
+        Media.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        cls.all_ids = sorted((video.id for video in videos), reverse=True)
+        cls.active_ids = sorted((video.id for video in videos if video.is_active), reverse=True)
+
+    def walk(self, limit, **params):
+        ids, sizes, cursor = [], [], None
+        while True:
+            query = dict(params, type='video', limit=limit, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get(reverse('media_json'), query).json()
+            self.assertEqual([item['id'] for item in data['items']].count(None), 0)
+            ids += [item['id'] for item in data['items']]
+            sizes.append(len(data['items']))
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids, sizes
+
+    def test_pages_with_equal_created_at(self):
+        ids, sizes = self.walk(4)
+        self.assertEqual(ids, self.active_ids)
+        self.assertEqual(sizes, [4, 4, 2])
+
+    def test_exact_multiple_has_no_empty_last_page(self):
+        ids, sizes = self.walk(5)
+        self.assertEqual((ids, sizes), (self.active_ids, [5, 5]))
+
+    def test_staff_sees_inactive_only_in_list_layout(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.walk(6, layout='list')[0], self.all_ids)
+        self.assertEqual(self.walk(6, layout='index')[0], self.active_ids)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(media_gallery.parse_page_size('1000'), media_gallery.MAX_PAGE_SIZE)
+        self.assertEqual(media_gallery.parse_page_size('0'), 1)
+        self.assertEqual(media_gallery.parse_page_size('abc'), media_gallery.PAGE_SIZE)
+        data = self.client.get(reverse('media_json'), {'type': 'video', 'limit': 0}).json()
+        self.assertEqual(len(data['items']), 1)
+
+    def test_invalid_type_or_layout(self):
+        for params in ({'type': 'audio'}, {'type': 'video', 'layout': 'grid'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('media_json'), params).status_code, 400)
+
+
+class VisitLogWriterTests(TransactionTestCase):
+    """Write-behind yozuvchi: flush() fon oqimi bilan parallel yozmaydi, atexit bir marta"""
+
+    def make_writer(self):
+        writer = VisitLogWriter(batch_size=1, flush_interval=0.05)
+        self.addCleanup(writer.stop)
+        return writer
+
+    def test_flush_waits_for_worker_batch(self):
+        writing = threading.Event()
+
+        def slow_save(visits, day=None):
+            writing.set()
+            time.sleep(0.2)
+            save_visits(visits, day)
+
+        writer = self.make_writer()
+        with mock.patch('app.visit_writer.save_visits', slow_save):
+            writer.start()
+            writer.submit(VisitLog(session_key='s1', ip_address='127.0.0.1', path='/'))
+            self.assertTrue(writing.wait(5))
+            # Fon oqimi birinchisini yozayotganda o'sha sessiya yana keladi
+            writer.submit(VisitLog(session_key='s1', ip_address='127.0.0.1', path='/narx/'))
+            writer.flush()
+
+        self.assertEqual(VisitLog.objects.filter(session_key='s1').count(), 1)
+        self.assertEqual(writer.stats()['duplicates'], 1)
+        self.assertEqual(writer.stats()['pending'], 0)
+
+    def test_restart_registers_atexit_once(self):
+        writer = self.make_writer()
+        with mock.patch('app.visit_writer.atexit.register') as register:
+            for _ in range(3):
+                writer.start()
+                writer.stop()
+        register.assert_called_once_with(writer.stop)
+
+
+class ArchiveVisitLogsTests(TestCase):
+    """archive_visit_logs: to'xtab qolgan ishni davom ettirish va qayta yuklash"""
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp(prefix='gilam_archive_')
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        VisitLog.objects.bulk_create([
+            VisitLog(session_key=f's{i}', ip_address='127.0.0.1', path=f'/sahifa/{i}') for i in range(25)
+        ])
+        # auto_now_add ni update() chetlab o'tadi
+        self.old_time = timezone.now() - timedelta(days=200)
+        VisitLog.objects.update(timestamp=self.old_time)
+
+    def archived_ids(self):
+        command = archive_visit_logs.Command()
+        ids = []
+        for path in sorted(Path(self.archive_dir).glob('visitlog-*.jsonl.gz')):
+            ids += [int(row['id']) for row in command.read_archive(path)]
+        return ids
+
+    def test_resume_after_crash_does_not_duplicate_rows(self):
+        write_rows = archive_visit_logs.Command.write_rows
+
+        def crash_after_write(command, by_month):
+            write_rows(command, by_month)
+            raise RuntimeError("jarayon to'xtadi")
+
+        with mock.patch.object(archive_visit_logs.Command, 'write_rows', crash_after_write):
+            with self.assertRaises(RuntimeError):
+                call_command('archive_visit_logs', archive_dir=self.archive_dir, chunk_size=10, stdout=io.StringIO())
+        self.assertEqual(len(self.archived_ids()), 10)
+
+        call_command('archive_visit_logs', archive_dir=self.archive_dir, chunk_size=10, stdout=io.StringIO())
+        ids = self.archived_ids()
+        self.assertEqual(sorted(ids), sorted(set(ids)))
+        self.assertEqual(len(ids), 25)
+        self.assertFalse(VisitLog.objects.exists())
+
+    def test_import_keeps_archived_timestamps(self):
+        call_command('archive_visit_logs', archive_dir=self.archive_dir, stdout=io.StringIO())
+        path = next(Path(self.archive_dir).glob('visitlog-*.jsonl.gz'))
+        call_command('archive_visit_logs', import_path=str(path), stdout=io.StringIO())
+
+        self.assertEqual(VisitLog.objects.count(), 25)
+        self.assertEqual(set(VisitLog.objects.values_list('timestamp', flat=True)), {self.old_time})
+
+    def test_import_leaves_existing_rows_untouched(self):
+        call_command('archive_visit_logs', archive_dir=self.archive_dir, stdout=io.StringIO())
+        path = next(Path(self.archive_dir).glob('visitlog-*.jsonl.gz'))
+        ids = self.archived_ids()
+        # Bitta yozuv allaqachon qaytarilgan va keyin o'zgargan
+        kept = VisitLog.objects.create(id=ids[0], session_key='yangi', ip_address='127.0.0.1', path='/')
+
+        out = io.StringIO()
+        call_command('archive_visit_logs', import_path=str(path), stdout=out)
+        self.assertIn("24 ta yozuv", out.getvalue())
+        self.assertIn("o'tkazildi: 1 ta", out.getvalue())
+
+        refreshed = VisitLog.objects.get(id=kept.id)
+        self.assertEqual((refreshed.session_key, refreshed.timestamp), ('yangi', kept.timestamp))
+        self.assertEqual(VisitLog.objects.exclude(id=kept.id).filter(timestamp=self.old_time).count(), 24)
+
+
+class TelegramStub:
+    """Mahalliy http.server: navbatdagi (status, json) javoblarni qaytaradi va so'rovlarni yozib boradi"""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                stub.requests.append(parse_qs(self.rfile.read(length).decode()))
+                status, payload = stub.responses.pop(0) if stub.responses else (200, {'ok': True})
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def texts(self):
+        return [request['text'][0] for request in self.requests]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TelegramOutboxTests(TestCase):
+    """send_telegram_outbox worker i mahalliy HTTP stubga qarshi"""
+
+    def setUp(self):
+        self.stub = TelegramStub()
+        self.addCleanup(self.stub.close)
+        settings_override = override_settings(
+            TELEGRAM_API_URL=self.stub.url,
+            TELEGRAM_TIMEOUT=2,
+            TELEGRAM_BACKOFF_BASE=10.0,
+            TELEGRAM_BACKOFF_MAX=100.0,
+            TELEGRAM_MAX_ATTEMPTS=3,
+            TELEGRAM_BREAKER_THRESHOLD=5,
+            TELEGRAM_DIGEST_THRESHOLD=5,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def run_worker(self):
+        call_command('send_telegram_outbox', once=True, stdout=io.StringIO())
+
+    def test_429_waits_for_retry_after(self):
+        message = enqueue_telegram_message('Yangi buyurtma')
+        self.stub.responses = [(429, {'ok': False, 'parameters': {'retry_after': 50}})]
+        started = timezone.now()
+        self.run_worker()
+
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+        self.assertGreaterEqual(message.next_attempt_at, started + timedelta(seconds=50))
+
+        TelegramOutbox.objects.update(next_attempt_at=timezone.now())
+        self.run_worker()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('sent', 2))
+        self.assertEqual(self.stub.texts(), ['Yangi buyurtma'] * 2)
+
+    def test_5xx_backs_off_exponentially_then_fails(self):
+        message = enqueue_telegram_message('Yangi buyurtma')
+        self.stub.responses = [(500, {'ok': False})] * 3
+        delays = []
+        for attempt in range(3):
+            started = timezone.now()
+            self.run_worker()
+            message.refresh_from_db()
+            delays.append((message.next_attempt_at - started).total_seconds())
+            TelegramOutbox.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual((message.status, message.attempts), ('failed', 3))
+        # base=10: 10 va 20 soniya (+-20% jitter)
+        self.assertTrue(8 <= delays[0] <= 12.5, delays)
+        self.assertTrue(16 <= delays[1] <= 24.5, delays)
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_circuit_breaker_opens_and_closes(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+        client = TelegramClient(token='test', chat_id='1', breaker=breaker)
+        self.stub.responses = [(502, {'ok': False})] * 2
+
+        for _ in range(2):
+            with self.assertRaises(TelegramError):
+                client.send('salom')
+        self.assertEqual(breaker.state, 'open')
+        with self.assertRaises(CircuitOpen):
+            client.send('salom')
+        self.assertEqual(len(self.stub.requests), 2)
+
+        now[0] = 31
+        self.assertEqual(breaker.state, 'half-open')
+        client.send('salom')
+        self.assertEqual(breaker.state, 'closed')
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_client_errors_do_not_open_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        client = TelegramClient(token='test', chat_id='1', breaker=breaker)
+        self.stub.responses = [(400, {'ok': False, 'description': 'Bad Request'})]
+        with self.assertRaises(TelegramError):
+            client.send('salom')
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_client_error_fails_without_retry(self):
+        message = enqueue_telegram_message('*buzuq markdown')
+        self.stub.responses = [(400, {'ok': False, 'description': "Bad Request: can't parse entities"})]
+        self.run_worker()
+
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', 1))
+        self.assertIn("can't parse entities", message.last_error)
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_digest_client_error_falls_back_to_single_messages(self):
+        messages = [enqueue_telegram_message(f'Buyurtma #{i}') for i in range(6)]
+        # Dayjest rad etiladi, birma-bir yuborilganda faqat #1 buzuq
+        self.stub.responses = [(400, {'ok': False}), (200, {'ok': True}), (400, {'ok': False})]
+        self.run_worker()
+
+        statuses = dict(TelegramOutbox.objects.values_list('id', 'status'))
+        self.assertEqual(statuses.pop(messages[1].id), 'failed')
+        self.assertEqual(set(statuses.values()), {'sent'})
+        self.assertIn('6 ta yangi xabar', self.stub.texts()[0])
+        self.assertEqual(self.stub.texts()[1:], [f'Buyurtma #{i}' for i in range(6)])
+
+    def test_backlog_is_sent_as_digest(self):
+        for i in range(6):
+            enqueue_telegram_message(f'Buyurtma #{i}')
+        self.run_worker()
+
+        self.assertEqual(len(self.stub.requests), 1)
+        text = self.stub.texts()[0]
+        self.assertIn('6 ta yangi xabar', text)
+        self.assertTrue(all(f'Buyurtma #{i}' in text for i in range(6)))
+        self.assertEqual(TelegramOutbox.objects.filter(status='sent').count(), 6)
+
+    def test_few_messages_are_sent_one_by_one(self):
+        for i in range(3):
+            enqueue_telegram_message(f'Buyurtma #{i}')
+        self.run_worker()
+        self.assertEqual(self.stub.texts(), ['Buyurtma #0', 'Buyurtma #1', 'Buyurtma #2'])
+
+    def test_digest_groups_fit_message_limit(self):
+        messages = [TelegramOutbox(text='x' * 1500) for _ in range(7)]
+        groups = pack_digest(messages)
+        self.assertEqual(sum(len(group) for group in groups), 7)
+        self.assertTrue(all(len(digest_text(group)) <= MESSAGE_LIMIT for group in groups))
+        self.assertGreater(len(groups), 1)
+
+
+class ClientsAccessTests(TestCase):
+    """Buyurtmalar konsoli (mijozlarning ismi, telefoni, manzili) faqat xodimlar uchun"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('mijoz', password='parol123')
+        cls.staff = User.objects.create_user('xodim', password='parol123', is_staff=True)
+        Order.objects.create(
+            name='Ali', phone='+998901234567', address="Ko'cha 1", other_carpet_name='Palos',
+            date=timezone.localdate(),
+        )
+
+    def test_clients_pages_require_staff(self):
+        for name in ('clients', 'clients_json'):
+            with self.subTest(name=name):
+                url = reverse(name)
+                self.assertEqual(self.client.get(url).status_code, 302)
+                self.client.force_login(self.customer)
+                self.assertEqual(self.client.get(url).status_code, 302)
+                self.client.force_login(self.staff)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, '+998901234567')
+                self.client.logout()
+
+
+class PrizeSamplerTests(TestCase):
+    """Alias usulidagi sampler: taqsimot va foizi 0 bo'lgan sovg'alar"""
+
+    def draw_counts(self, prizes, draws=100_000):
+        sampler = PrizeSampler(prizes, rng=random.Random(42))
+        counts = {}
+        for _ in range(draws):
+            name = sampler.draw().nomi
+            counts[name] = counts.get(name, 0) + 1
+        return sampler, counts
+
+    def test_distribution_matches_percentages(self):
+        prizes = [Prize(1, 'Choynak', 1, 50), Prize(2, 'Sochiq', 2, 25), Prize(3, 'Chegirma', 3, 5)]
+        sampler, counts = self.draw_counts(prizes)
+
+        expected = {'Choynak': 0.50, 'Sochiq': 0.25, 'Chegirma': 0.05, NO_PRIZE_NAME: 0.20}
+        self.assertEqual(dict(sampler.probabilities()), expected)
+        for name, probability in expected.items():
+            self.assertAlmostEqual(counts[name] / 100_000, probability, delta=0.01)
+
+    def test_zero_weight_prize_is_never_drawn(self):
+        prizes = [Prize(1, 'Choynak', 1, 60), Prize(2, 'Sochiq', 2, 0)]
+        sampler, counts = self.draw_counts(prizes, draws=20_000)
+        self.assertNotIn('Sochiq', counts)
+        self.assertFalse(sampler.empty)
+
+    def test_all_zero_weights_always_draw_no_prize(self):
+        sampler, counts = self.draw_counts([Prize(1, 'Choynak', 1, 0)], draws=1000)
+        self.assertFalse(sampler.empty)
+        self.assertEqual(counts, {NO_PRIZE_NAME: 1000})
+
+    def test_no_active_prizes_is_empty(self):
+        self.assertTrue(PrizeSampler([]).empty)
+
+    def test_over_100_percent_has_no_empty_slot(self):
+        sampler = PrizeSampler([Prize(1, 'Choynak', 1, 80), Prize(2, 'Sochiq', 2, 40)])
+        self.assertNotIn(NO_PRIZE_NAME, dict(sampler.probabilities()))
+
+    def test_spin_with_only_zero_percent_prizes_lands_on_no_prize(self):
+        user = User.objects.create_user('mijoz', password='parol123')
+        Sovga.objects.create(nomi='Choynak', foiz=0, katak_raqami=1)
+        invalidate_prize_sampler()
+        self.client.force_login(user)
+
+        data = self.client.post(reverse('spin_baraban')).json()
+        self.assertTrue(data['success'], data)
+        self.assertEqual(data['sovga'], NO_PRIZE_NAME)
+
+
+@override_settings(BARABAN_COOLDOWN_HOURS=24)
+class SpinCooldownTests(TestCase):
+    """claim_spin: kutish vaqti ichidagi ikkinchi urinish rad etiladi"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('mijoz', password='parol123')
+        self.now = timezone.now()
+
+    def test_second_claim_within_cooldown_is_rejected(self):
+        claimed, next_spin_at = claim_spin(self.user, self.now)
+        self.assertTrue(claimed)
+        self.assertEqual(next_spin_at, self.now + timedelta(hours=24))
+
+        claimed, until = claim_spin(self.user, self.now + timedelta(hours=1))
+        self.assertFalse(claimed)
+        self.assertEqual(until, next_spin_at)
+
+    def test_claim_succeeds_after_cooldown(self):
+        claim_spin(self.user, self.now)
+        claimed, next_spin_at = claim_spin(self.user, self.now + timedelta(hours=24))
+        self.assertTrue(claimed)
+        self.assertEqual(next_spin_at, self.now + timedelta(hours=48))
+
+    def test_existing_spin_history_is_respected(self):
+        sovga = Sovga.objects.create(nomi='Choynak', foiz=10, katak_raqami=1)
+        BarabanSpin.objects.create(user=self.user, sovga=sovga, keyingi_spin_vaqti=self.now + timedelta(hours=5))
+
+        claimed, until = claim_spin(self.user, self.now)
+        self.assertFalse(claimed)
+        self.assertEqual(until, self.now + timedelta(hours=5))
+
+    def test_second_spin_request_is_rejected(self):
+        Sovga.objects.create(nomi='Choynak', foiz=100, katak_raqami=1)
+        invalidate_prize_sampler()
+        self.client.force_login(self.user)
+
+        self.assertTrue(self.client.post(reverse('spin_baraban')).json()['success'])
+        second = self.client.post(reverse('spin_baraban')).json()
+        self.assertFalse(second['success'])
+        self.assertEqual(BarabanSpin.objects.filter(user=self.user).count(), 1)
+
+
+class RangeStreamingTests(SimpleTestCase):
+    """parse_range va stream_file: 206, 416, If-Range, HEAD"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.mp4')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(bytes(range(100)))
+        self.addCleanup(os.remove, self.path)
+        self.factory = RequestFactory()
+
+    def get(self, method='get', **headers):
+        request = getattr(self.factory, method)('/video', headers=headers)
+        response = stream_file(request, self.path)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_parse_range(self):
+        cases = {
+            'bytes=0-9': (0, 9),
+            'bytes=10-': (10, 99),          # ochiq oxirli
+            'bytes=-10': (90, 99),          # suffiks: oxirgi 10 bayt
+            'bytes=-500': (0, 99),          # fayldan uzun suffiks - butun fayl
+            'bytes=90-500': (90, 99),       # oxiri fayl hajmigacha qisqartiriladi
+            'bytes=9-0': None,              # teskari oraliq - e'tiborsiz, 200
+            'bytes=0-1,5-6': None,          # bir nechta oraliq qo'llab-quvvatlanmaydi
+            'items=0-1': None,
+            'bytes=-': None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 100), expected)
+
+    def test_parse_range_unsatisfiable(self):
+        for header in ('bytes=100-', 'bytes=150-200', 'bytes=-0'):
+            with self.subTest(header=header), self.assertRaises(ValueError):
+                parse_range(header, 100)
+
+    def test_partial_content(self):
+        response, body = self.get(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, bytes(range(10, 20)))
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response, body = self.get(Range='bytes=-5')
+        self.assertEqual((response.status_code, body), (206, bytes(range(95, 100))))
+
+    def test_unsatisfiable_range_returns_416(self):
+        response, _ = self.get(Range='bytes=200-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_if_range_mismatch_returns_full_file(self):
+        response, body = self.get(Range='bytes=0-9', If_Range='"eskirgan"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(body), 100)
+
+        etag = self.get()[0]['ETag']
+        response, body = self.get(Range='bytes=0-9', If_Range=etag)
+        self.assertEqual((response.status_code, len(body)), (206, 10))
+
+    def test_head_has_headers_without_body(self):
+        response, body = self.get('head', Range='bytes=0-49')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '50')
+        self.assertEqual(body, b'')
+
+    def test_conditional_get_returns_304(self):
+        etag = self.get()[0]['ETag']
+        response, _ = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(VIEW_COUNTER_FLUSH_INTERVAL=60)
+class MediaVideoViewsTests(TestCase):
+    """stream_media_video: seek (Range) so'rovlari bitta ko'rish, sessiyaga hech narsa yozilmaydi"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp(prefix='gilam_video_')
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+
+        self.video = Media.objects.create(
+            title='Video', media_type='video', video_file=ContentFile(b'\x00' * 1000, name='v.mp4')
+        )
+        self.url = reverse('stream_media_video', args=[self.video.pk])
+        self.user = User.objects.create_user('tomoshabin', password='parol123')
+
+    def watch(self, client):
+        for header in ('bytes=0-99', 'bytes=500-', 'bytes=100-199'):
+            response = client.get(self.url, headers={'Range': header})
+            self.assertEqual(response.status_code, 206)
+            response.close()
+
+    def test_range_requests_count_once_per_session(self):
+        self.client.force_login(self.user)
+        self.watch(self.client)
+        self.assertEqual(pending_views(Media, self.video.pk), 1)
+        self.assertNotIn('viewed_media', self.client.session.keys())
+
+        other = Client()
+        other.force_login(self.user)
+        self.watch(other)
+        self.assertEqual(pending_views(Media, self.video.pk), 2)
+
+    def test_view_counts_again_after_ttl(self):
+        self.watch(self.client)
+        self.assertEqual(pending_views(Media, self.video.pk), 1)
+        # Belgi keshdan chiqib ketgandek (TTL o'tdi)
+        cache.clear()
+        self.watch(self.client)
+        self.assertEqual(pending_views(Media, self.video.pk), 2)
+
+
+class ChunkedUploadTests(TestCase):
+    """Bo'lakli yuklash: tartibsiz va takroriy bo'laklar, finalize tekshiruvlari"""
+
+    VIDEO = b'\x00\x00\x00\x18ftypmp42' + bytes(range(18))   # 30 bayt, mp4 sarlavhasi bilan
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='gilam_upload_')
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=os.path.join(self.tmp, 'media'),
+            CHUNKED_UPLOAD_DIR=os.path.join(self.tmp, 'uploads'),
+            CHUNKED_UPLOAD_CHUNK_SIZE=8,
+            CHUNKED_UPLOAD_MAX_SIZE=64,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user('admin', password='parol123', is_staff=True, is_superuser=True)
+
+    def start(self, data=None, **fields):
+        data = self.VIDEO if data is None else data
+        options = {'filename': 'klip.mp4', 'size': len(data), 'title': 'Klip', **fields}
+        return chunked_upload.init_upload(self.user, **options)['upload_id']
+
+    def send(self, upload_id, index, data=None):
+        data = self.VIDEO if data is None else data
+        return chunked_upload.save_chunk(upload_id, self.user, index, io.BytesIO(data[index * 8:(index + 1) * 8]))
+
+    def test_out_of_order_and_duplicate_chunks_assemble_in_order(self):
+        upload_id = self.start()
+        for index in (3, 1, 0, 1, 2):
+            state = self.send(upload_id, index)
+        self.assertEqual(state['received'], [0, 1, 2, 3])
+
+        media = chunked_upload.finalize_upload(upload_id, self.user)
+        with media.video_file.open('rb') as fh:
+            self.assertEqual(fh.read(), self.VIDEO)
+        self.assertFalse(os.path.exists(chunked_upload.upload_dir(upload_id)))
+
+    def test_resent_chunk_replaces_previous_copy(self):
+        upload_id = self.start()
+        self.send(upload_id, 0, b'X' * 30)
+        for index in range(4):
+            self.send(upload_id, index)
+        media = chunked_upload.finalize_upload(upload_id, self.user)
+        with media.video_file.open('rb') as fh:
+            self.assertEqual(fh.read(), self.VIDEO)
+
+    def test_chunk_with_wrong_size_is_rejected(self):
+        upload_id = self.start()
+        with self.assertRaises(chunked_upload.UploadError):
+            chunked_upload.save_chunk(upload_id, self.user, 0, io.BytesIO(b'short'))
+        with self.assertRaises(chunked_upload.UploadError):
+            chunked_upload.save_chunk(upload_id, self.user, 4, io.BytesIO(b'x' * 8))
+        self.assertEqual(chunked_upload.status(upload_id, self.user)['received'], [])
+
+    def test_finalize_rejects_missing_chunks(self):
+        upload_id = self.start()
+        self.send(upload_id, 0)
+        with self.assertRaises(chunked_upload.UploadError) as error:
+            chunked_upload.finalize_upload(upload_id, self.user)
+        self.assertEqual(error.exception.status, 409)
+
+    def test_finalize_rejects_checksum_and_content_mismatch(self):
+        upload_id = self.start(sha256='0' * 64)
+        for index in range(4):
+            self.send(upload_id, index)
+        with self.assertRaises(chunked_upload.UploadError) as error:
+            chunked_upload.finalize_upload(upload_id, self.user)
+        self.assertEqual(error.exception.status, 409)
+
+        not_video = b'x' * 30
+        upload_id = self.start(not_video)
+        for index in range(4):
+            self.send(upload_id, index, not_video)
+        with self.assertRaises(chunked_upload.UploadError):
+            chunked_upload.finalize_upload(upload_id, self.user)
+        self.assertFalse(Media.objects.exists())
+
+    def test_init_enforces_size_limit_and_media_fields(self):
+        invalid = {
+            'size': {'size': 65},
+            'empty': {'size': 0},
+            'extension': {'filename': 'klip.exe'},
+            'title': {'title': ''},
+            'duration': {'duration': '0' * 21},
+            'media_type': {'media_type': 'audio'},
+        }
+        for case, fields in invalid.items():
+            with self.subTest(case=case), self.assertRaises(chunked_upload.UploadError):
+                self.start(**fields)
+
+    def test_upload_through_api(self):
+        client = Client()
+        client.force_login(self.user)
+        response = client.post(
+            reverse('upload_init'),
+            json.dumps({'filename': 'klip.mp4', 'size': 30, 'title': 'Klip', 'duration': '00:00:05'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.json()['upload_id']
+
+        for index in (2, 0, 3, 1):
+            response = client.put(
+                reverse('upload_chunk', args=[upload_id, index]),
+                self.VIDEO[index * 8:(index + 1) * 8], content_type='application/octet-stream',
+            )
+            self.assertEqual(response.status_code, 200)
+
+        response = client.post(reverse('upload_finalize', args=[upload_id]))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Media.objects.get().duration, '00:00:05')
+
+
+class ThumbnailLifecycleTests(TestCase):
+    """Rasm nusxalari: EXIF burilishi va o'chirilganda tozalash"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='gilam_thumbs_')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, THUMBNAIL_WIDTHS=(160, 320))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def derivatives(self):
+        return sorted(
+            name for _, _, files in os.walk(self.media_root) for name in files if 'w.' in name
+        )
+
+    def create_photo(self, name='rasm.jpg'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Media.objects.create(title='Rasm', media_type='photo', image=image_file(name, (640, 480)))
+
+    def test_info_uses_exif_rotated_size(self):
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6   # 90 gradusga burilgan telefon rasmi
+        Image.new('RGB', (400, 200)).save(buffer, 'JPEG', exif=exif)
+        name = default_storage.save('media/photos/telefon.jpg', ContentFile(buffer.getvalue()))
+
+        info = thumbnails.get_thumbnail_info(name)
+        self.assertEqual((info['width'], info['height']), (200, 400))
+
+        generated = thumbnails.generate_thumbnails(name)
+        cache.clear()
+        self.assertEqual(thumbnails.get_thumbnail_info(name), generated)
+        self.assertEqual(generated['widths'], [160])
+
+    def test_deleting_media_removes_derivatives(self):
+        photo = self.create_photo()
+        self.assertEqual(len(self.derivatives()), 4)   # 2 kenglik x (jpg + webp)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.delete()
+        self.assertEqual(self.derivatives(), [])
+        self.assertIsNone(cache.get(f'thumbs:{photo.image.name}'))
+
+    def test_replacing_image_removes_old_derivatives(self):
+        photo = self.create_photo('eski.jpg')
+        photo.image = image_file('yangi.jpg', (640, 480))
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.save()
+
+        derivatives = self.derivatives()
+        self.assertEqual(len(derivatives), 4)
+        self.assertTrue(all(name.startswith('yangi') for name in derivatives), derivatives)
+
+
+    def test_save_collision_keeps_target_name(self):
+        photo = self.create_photo()
+        before = self.derivatives()
+
+        class RacingStorage(FileSystemStorage):
+            """exists() tekshiruvidan keyin boshqa jarayon nusxani yozib qo'ygandek"""
+            checked = set()
+
+            def exists(self, name):
+                if name not in self.checked:
+                    self.checked.add(name)
+                    return False
+                return super().exists(name)
+
+        info = thumbnails.generate_thumbnails(photo.image.name, storage=RacingStorage(location=self.media_root))
+        self.assertEqual(info['widths'], [160, 320])
+        self.assertEqual(self.derivatives(), before)
+
+    @override_settings(THUMBNAIL_IN_BACKGROUND=True)
+    def test_background_generation(self):
+        name = default_storage.save('media/photos/fon.jpg', image_file('fon.jpg', (640, 480)))
+        thread = thumbnails.schedule_thumbnails(Media(image=name).image)
+        self.assertIsNotNone(thread)
+        thread.join(10)
+        self.assertEqual(len(self.derivatives()), 4)
+
+
+class MinifierTests(SimpleTestCase):
+    """extract_inline_assets minifierlari satr, shablon va url ichidagi matnga tegmaydi"""
+
+    def test_js_keeps_template_literals_and_strings(self):
+        source = (
+            "    // izoh\n"
+            "    const html = `\n"
+            "        // shablon matni\n"
+            "        <b>${name}</b>\n"
+            "    `;\n"
+            "\n"
+            "    const quote = /['`]/g, half = total / 2;\n"
+            "    const s = 'a\\\n"
+            "    // hali satr';\n"
+        )
+        self.assertEqual(minify_js(source), (
+            "const html = `\n"
+            "        // shablon matni\n"
+            "        <b>${name}</b>\n"
+            "    `;\n"
+            "const quote = /['`]/g, half = total / 2;\n"
+            "const s = 'a\\\n"
+            "    // hali satr';"
+        ))
+
+    def test_css_keeps_strings_and_urls(self):
+        source = (
+            'a :hover { content: "x:  y ;}"; background: url( "a  b.png" ) no-repeat; }\n'
+            '/* izoh */ .b { margin: 0/**/auto; font-family: "A" , \'B\'; }'
+        )
+        self.assertEqual(
+            minify_css(source),
+            'a :hover{content:"x:  y ;}";background:url( "a  b.png" ) no-repeat}'
+            '.b{margin:0 auto;font-family:"A",\'B\'}',
+        )
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, PAGE_CACHE_TTL=60)
+class AdsPageCacheTests(TestCase):
+    """Reklamalar sahifasi anonimlar uchun keshlanadi va Advertisement o'zgarsa yangilanadi"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_ads_page_is_cached_and_invalidated(self):
+        url = reverse('ads')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'hit')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Advertisement.objects.create(title='Yangi chegirma', description='20%', ad_type='text', duration_days=3)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'Yangi chegirma')
+
+    def test_logged_in_users_bypass_cache(self):
+        self.client.force_login(User.objects.create_user('mijoz', password='parol123'))
+        self.assertNotIn('X-Page-Cache', self.client.get(reverse('ads')))
+
+
+@override_settings(VIEW_COUNTER_FLUSH_INTERVAL=60, VIEW_COUNTER_MAX_PENDING=500)
+class ViewCounterTests(TransactionTestCase):
+    """Ko'rishlar buferi: guruhlangan UPDATE lar va sokin jarayonda taymer bilan flush"""
+
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        self.videos = [
+            Media.objects.create(title=f'Video {i}', media_type='video', video_url='https://example.com/v.mp4')
+            for i in range(3)
+        ]
+
+    def views(self):
+        return [video.views for video in Media.objects.order_by('id')]
+
+    def test_flush_groups_updates_by_count(self):
+        for video in self.videos[:2]:
+            for _ in range(3):
+                record_view(Media, video.pk)
+        record_view(Media, self.videos[2].pk)
+        self.assertEqual(self.views(), [0, 0, 0])
+        self.assertEqual(pending_views(Media, self.videos[0].pk), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_views(), 2)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(self.views(), [3, 3, 1])
+        self.assertEqual(pending_views(Media, self.videos[0].pk), 0)
+
+    @override_settings(VIEW_COUNTER_MAX_PENDING=3)
+    def test_max_pending_flushes_immediately(self):
+        for _ in range(3):
+            record_view(Media, self.videos[0].pk)
+        self.assertEqual(self.views(), [3, 0, 0])
+
+    @override_settings(VIEW_COUNTER_FLUSH_INTERVAL=0.1)
+    def test_timer_flushes_without_further_views(self):
+        record_view(Media, self.videos[0].pk)
+        deadline = time.monotonic() + 5
+        while self.views()[0] == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.views(), [1, 0, 0])
+        self.assertIsNone(view_counter.timer)
+
+
+class AdExpiryTests(TestCase):
+    """Reklama muddati: save() da expires_at, active()/expired() chegarasi, sweep_expired_ads"""
+
+    def make_ad(self, title, days, age_days=0):
+        ad = Advertisement.objects.create(title=title, description='', ad_type='text', duration_days=days)
+        if age_days:
+            created = timezone.now() - timedelta(days=age_days)
+            Advertisement.objects.filter(pk=ad.pk).update(
+                created_at=created, expires_at=created + timedelta(days=days)
+            )
+            ad.refresh_from_db()
+        return ad
+
+    def sweep(self, *args):
+        out = io.StringIO()
+        call_command('sweep_expired_ads', *args, stdout=out)
+        return out.getvalue()
+
+    def test_save_sets_expiry_from_created_at(self):
+        ad = self.make_ad('Uch kun', 3, age_days=1)
+        ad.duration_days = 5
+        ad.save()
+        self.assertEqual(ad.expires_at, ad.created_at + timedelta(days=5))
+
+    def test_active_and_expired_split_at_expires_at(self):
+        live = self.make_ad('Jonli', 3)
+        old = self.make_ad('Eski', 2, age_days=3)
+        self.assertEqual(list(Advertisement.objects.active()), [live])
+        self.assertEqual(list(Advertisement.objects.expired()), [old])
+        # expires_at ning o'zi hali faol hisoblanadi
+        self.assertIn(old, Advertisement.objects.active(old.expires_at))
+        self.assertNotIn(old, Advertisement.objects.expired(old.expires_at))
+
+    def test_archived_ad_is_neither_active_nor_expired(self):
+        ad = self.make_ad('Arxiv', 2, age_days=3)
+        Advertisement.objects.filter(pk=ad.pk).update(is_archived=True, expires_at=None)
+        self.assertFalse(Advertisement.objects.active().exists())
+        self.assertFalse(Advertisement.objects.expired().exists())
+
+    def test_sweep_archives_only_expired(self):
+        live = self.make_ad('Jonli', 3)
+        old = self.make_ad('Eski', 2, age_days=3)
+        self.assertIn('1 ta (dry-run)', self.sweep('--dry-run'))
+        self.assertFalse(Advertisement.objects.get(pk=old.pk).is_archived)
+
+        self.assertIn('Arxivlandi: 1 ta', self.sweep())
+        old.refresh_from_db()
+        live.refresh_from_db()
+        self.assertTrue(old.is_archived)
+        self.assertFalse(old.is_active())
+        self.assertFalse(live.is_archived)
+        self.assertIn('Arxivlandi: 0 ta', self.sweep())
+
+    def test_sweep_grace_hours(self):
+        recent = self.make_ad('Yaqinda tugagan', 1, age_days=1.5)
+        self.assertIn('Arxivlandi: 0 ta', self.sweep('--grace-hours', '24'))
+        self.assertIn('Arxivlandi: 1 ta', self.sweep('--grace-hours', '6'))
+        recent.refresh_from_db()
+        self.assertTrue(recent.is_archived)
+        with self.assertRaises(CommandError):
+            self.sweep('--grace-hours', '-1')
+
+    def test_extending_archived_ad_unarchives_it(self):
+        ad = self.make_ad('Uzaytirilgan', 2, age_days=3)
+        self.sweep()
+        ad.refresh_from_db()
+        ad.save()
+        self.assertTrue(ad.is_archived)
+
+        ad.duration_days = 10
+        ad.save()
+        ad.refresh_from_db()
+        self.assertFalse(ad.is_archived)
+        self.assertEqual(list(Advertisement.objects.active()), [ad])
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, VIEW_COUNTER_FLUSH_INTERVAL=60)
+class AdSlotTests(TestCase):
+    """Reklama o'rni keshlangan sahifada ham har ko'rishda aylanadi va sanaladi"""
+
+    def setUp(self):
+        cache.clear()
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        self.first = Advertisement.objects.create(title='Birinchi', ad_type='text', duration_days=3, priority=1)
+        self.second = Advertisement.objects.create(title='Ikkinchi', ad_type='text', duration_days=3, priority=1)
+
+    def test_cached_page_has_placeholder_not_ad(self):
+        for _ in range(2):
+            response = self.client.get(reverse('photo_list'))
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertContains(response, 'data-ad-url="/api/ads/next/?slot=gallery"')
+        self.assertNotContains(response, 'Birinchi')
+        self.assertEqual(pending_views(Advertisement, self.first.pk), 0)
+
+    def test_each_fetch_rotates_without_counting(self):
+        titles = [
+            self.client.get(reverse('next_ad'), {'slot': 'gallery'}).json()['ad']['title'] for _ in range(4)
+        ]
+        self.assertEqual(sorted(titles), ['Birinchi', 'Birinchi', 'Ikkinchi', 'Ikkinchi'])
+        self.assertNotEqual(titles[0], titles[1])
+        # Impression faqat beacon kelganda sanaladi
+        self.assertEqual(pending_views(Advertisement, self.first.pk), 0)
+        self.assertEqual(pending_views(Advertisement, self.second.pk), 0)
+
+    def test_impression_beacon_counts_active_ad(self):
+        data = self.client.get(reverse('next_ad'), {'slot': 'gallery'}).json()
+        self.assertIn(f'data-impression-url="{data["ad"]["impression_url"]}"', data['html'])
+
+        self.assertEqual(self.client.post(data['ad']['impression_url']).status_code, 200)
+        self.assertEqual(pending_views(Advertisement, data['ad']['id']), 1)
+        self.assertEqual(self.client.get(data['ad']['impression_url']).status_code, 405)
+
+    def test_impression_beacon_ignores_inactive_ad(self):
+        Advertisement.objects.filter(pk=self.first.pk).update(is_archived=True)
+        ad_rotation.invalidate_plan()
+        response = self.client.post(reverse('ad_impression', args=[self.first.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(pending_views(Advertisement, self.first.pk), 0)
+
+    def test_video_ad_renders_player_and_detail_link(self):
+        media_root = tempfile.mkdtemp(prefix='gilam_adslot_')
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Advertisement.objects.all().delete()
+        ad = Advertisement.objects.create(
+            title='Video', ad_type='video', duration_days=3, video=ContentFile(b'\x00' * 16, name='slot.mp4'),
+        )
+        ad_rotation.invalidate_plan()
+        html = self.client.get(reverse('next_ad')).json()['html']
+        self.assertIn(f'<video src="{reverse("stream_ad_video", args=[ad.pk])}"', html)
+        self.assertIn(f'href="{reverse("ad_detail", args=[ad.pk])}"', html)
+        self.assertEqual(self.client.get(reverse('ad_detail', args=[ad.pk])).status_code, 200)
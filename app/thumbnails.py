@@ -0,0 +1,222 @@
+import logging
+import os
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Pillow formati -> fayl kengaytmasi (boshqa formatlar JPEG yoki PNG ga o'giriladi)
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+ORIENTATION_TAG = 0x0112
+
+
+def thumbnail_widths():
+    return tuple(sorted(getattr(settings, 'THUMBNAIL_WIDTHS', (160, 320, 640, 1024))))
+
+
+def derivative_name(name, width, ext):
+    """media/photos/gilam.jpg -> media/photos/gilam.320w.jpg (asl fayl yonida)"""
+    root, _ = os.path.splitext(name)
+    return f'{root}.{width}w.{ext}'
+
+
+def _cache_key(name):
+    return f'thumbs:{name}'
+
+
+def transposed_size(image):
+    """
+    exif_transpose dan keyingi (width, height): 5-8 orientatsiyalarda tomonlar
+    almashadi. Rasmni dekodlamasdan, faqat sarlavhadan hisoblanadi.
+    """
+    width, height = image.size
+    if image.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+
+def _target_format(image):
+    if image.format in EXTENSIONS:
+        return image.format
+    return 'PNG' if image.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+
+
+def _encode(image, fmt, quality):
+    buffer = BytesIO()
+    if fmt == 'JPEG':
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif fmt == 'WEBP':
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if image.mode in ('LA', 'P', 'PA') else 'RGB')
+        image.save(buffer, 'WEBP', quality=quality, method=4)
+    else:
+        image.save(buffer, fmt, optimize=True)
+    return buffer.getvalue()
+
+
+def generate_thumbnails(name, storage=None, force=False):
+    """
+    Asl rasmdan THUMBNAIL_WIDTHS dagi (asl kenglikdan kichik) o'lchamlarni va
+    ularning WebP nusxalarini yaratadi. Mavjud nusxalar force=False bo'lsa qayta yozilmaydi.
+    Nusxalar haqidagi ma'lumotni (get_thumbnail_info) qaytaradi.
+    """
+    storage = storage or default_storage
+    quality = getattr(settings, 'THUMBNAIL_QUALITY', 80)
+    webp = getattr(settings, 'THUMBNAIL_WEBP', True)
+
+    with storage.open(name, 'rb') as fh:
+        with Image.open(fh) as original:
+            fmt = _target_format(original)
+            # Telefon rasmlaridagi EXIF burilishini hisobga olamiz
+            image = ImageOps.exif_transpose(original)
+
+    info = {
+        'width': image.width,
+        'height': image.height,
+        'ext': EXTENSIONS[fmt],
+        'webp': webp or fmt == 'WEBP',
+        'widths': [],
+    }
+    targets = [(fmt, EXTENSIONS[fmt])]
+    if webp and fmt != 'WEBP':
+        targets.append(('WEBP', 'webp'))
+
+    for width in thumbnail_widths():
+        if width >= image.width:
+            break
+        resized = None
+        for target_fmt, ext in targets:
+            target = derivative_name(name, width, ext)
+            if storage.exists(target):
+                if not force:
+                    continue
+                storage.delete(target)
+            if resized is None:
+                resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            saved = storage.save(target, ContentFile(_encode(resized, target_fmt, quality)))
+            if saved != target:
+                # Parallel jarayon shu nomni egalladi (storage suffiks qo'shdi): srcset target ni
+                # ko'rsatadi, u mavjud - ortiqcha nusxa o'chiriladi
+                storage.delete(saved)
+        info['widths'].append(width)
+
+    remember_thumbnail_info(name, info)
+    return info
+
+
+def ensure_thumbnails(field):
+    """Yetishmayotgan nusxalarni yaratadi (saqlash signallaridan chaqiriladi)"""
+    if not field or not field.name:
+        return
+    try:
+        info = get_thumbnail_info(field.name, field.storage)
+        if info is None:
+            return
+        expected = [w for w in thumbnail_widths() if w < info['width']]
+        if info['widths'] != expected:
+            generate_thumbnails(field.name, field.storage)
+    except (OSError, ValueError):
+        logger.exception("Rasm nusxalarini yaratib bo'lmadi: %s", field.name)
+
+
+def schedule_thumbnails(field):
+    """
+    Saqlash signallaridan (on_commit) chaqiriladi. THUMBNAIL_IN_BACKGROUND bo'lsa nusxalar
+    alohida oqimda yaratiladi - yuklash so'rovi har bir o'lchamni kutmaydi (oqim bazaga
+    murojaat qilmaydi). Oqim daemon emas: jarayon tugashidan oldin fayllar yozib bo'linadi.
+    Yaratilmay qolganlarini build_thumbnails buyrug'i to'ldiradi.
+    """
+    if not field or not field.name:
+        return None
+    if not getattr(settings, 'THUMBNAIL_IN_BACKGROUND', False):
+        ensure_thumbnails(field)
+        return None
+    thread = threading.Thread(target=ensure_thumbnails, args=(field,), name='thumbnails')
+    thread.start()
+    return thread
+
+
+def remember_thumbnail_info(name, info):
+    cache.set(_cache_key(name), info, getattr(settings, 'THUMBNAIL_CACHE_TTL', 24 * 60 * 60))
+
+
+def get_thumbnail_info(name, storage=None):
+    """
+    Rasm uchun mavjud nusxalar: {'width', 'height', 'ext', 'webp', 'widths'}.
+    Keshdan o'qiladi; kesh bo'sh bo'lsa fayl tizimi tekshiriladi (rasm sarlavhasi o'qiladi xolos).
+    Nusxalar hali yaratilmagan bo'lsa 'widths' bo'sh ro'yxat bo'ladi.
+    """
+    info = cache.get(_cache_key(name))
+    if info is not None:
+        return info
+
+    storage = storage or default_storage
+    try:
+        with storage.open(name, 'rb') as fh:
+            with Image.open(fh) as original:
+                fmt = _target_format(original)
+                # generate_thumbnails bilan bir xil: burilgan rasm o'lchami
+                width, height = transposed_size(original)
+    except (OSError, ValueError):
+        return None
+
+    ext = EXTENSIONS[fmt]
+    webp = fmt == 'WEBP' or storage.exists(derivative_name(name, thumbnail_widths()[0], 'webp'))
+    info = {
+        'width': width,
+        'height': height,
+        'ext': ext,
+        'webp': webp,
+        'widths': [w for w in thumbnail_widths() if w < width and storage.exists(derivative_name(name, w, ext))],
+    }
+    remember_thumbnail_info(name, info)
+    return info
+
+
+def delete_thumbnails(name, storage=None):
+    """Rasmning barcha nusxalarini va keshdagi ma'lumotini o'chiradi (asl fayl qoladi)"""
+    storage = storage or default_storage
+    for width in thumbnail_widths():
+        for ext in set(EXTENSIONS.values()):
+            target = derivative_name(name, width, ext)
+            if storage.exists(target):
+                storage.delete(target)
+    cache.delete(_cache_key(name))
+
+
+def build_srcset(field, webp=False):
+    """ImageField uchun srcset qatori: nusxalar va eng oxirida asl rasm"""
+    if not field or not field.name:
+        return ''
+    info = get_thumbnail_info(field.name, field.storage)
+    if not info or not info['widths']:
+        return ''
+    if webp and not info['webp']:
+        return ''
+
+    ext = 'webp' if webp else info['ext']
+    entries = [f"{field.storage.url(derivative_name(field.name, w, ext))} {w}w" for w in info['widths']]
+    if not webp or info['ext'] == 'webp':
+        entries.append(f"{field.url} {info['width']}w")
+    return ', '.join(entries)
+
+
+def thumbnail_url(field, width):
+    """width dan kichik bo'lmagan eng kichik nusxaning URL i (bo'lmasa asl rasm)"""
+    if not field or not field.name:
+        return ''
+    info = get_thumbnail_info(field.name, field.storage)
+    if info:
+        for w in info['widths']:
+            if w >= width:
+                return field.storage.url(derivative_name(field.name, w, info['ext']))
+    return field.url
+
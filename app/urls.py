@@ -2,19 +2,22 @@
 from django.contrib import admin
 from django.urls import path
 from .views import (
-    index, create_order, clients, sozlamalar, update_order_status, 
+    index, create_order, clients, clients_json, sozlamalar, update_order_status, 
     delete_order, boshqaruv, profile_view, video_rasim, add_video, 
     add_photo, delete_video, delete_photo, delete_media, photo_list, 
-    baraban, spin_baraban, sovga_management, foydalanuvchilar_list, 
+    baraban, spin_baraban, media_json, sovga_management, foydalanuvchilar_list, 
     update_yutuq, get_yutuq_info, mark_yutuq_used, foydalanuvchi_detail,
     get_review_stats, get_review, delete_review, edit_review, add_review, 
-    reviews_list, active_ads, ad_detail, create_ad
+    reviews_list, reviews_json, active_ads, ad_detail, create_ad, next_ad_json, ad_impression,
+    stream_media_video, stream_ad_video,
+    upload_init, upload_status, upload_chunk, upload_finalize
 )
 
 urlpatterns = [
     path('', index, name='index'),
     path('create_order/', create_order, name='create_order'),
     path('clients/', clients, name='clients'),
+    path('clients/json/', clients_json, name='clients_json'),
     path('sozlamalar/', sozlamalar, name='sozlamalar'),
     path('boshqaruv/', boshqaruv, name='boshqaruv'),           
     path('order/<int:order_id>/update-status/', update_order_status, name='update_order_status'),
@@ -29,9 +32,17 @@ urlpatterns = [
     path('videos/add/', add_video, name='add_video'),
     path('videos/edit/<int:pk>/', add_video, name='edit_video'),
     path('videos/delete/<int:pk>/', delete_video, name='delete_video'),
+    path('videos/<int:pk>/stream/', stream_media_video, name='stream_media_video'),
     
+    # Katta fayllarni bo'laklab yuklash
+    path('uploads/', upload_init, name='upload_init'),
+    path('uploads/<str:upload_id>/', upload_status, name='upload_status'),
+    path('uploads/<str:upload_id>/chunks/<int:index>/', upload_chunk, name='upload_chunk'),
+    path('uploads/<str:upload_id>/finalize/', upload_finalize, name='upload_finalize'),
+
     # Rasm uchun
     path('photos/', photo_list, name='photo_list'),
+    path('api/media/', media_json, name='media_json'),
     path('photos/add/', add_photo, name='add_photo'),
     path('photos/edit/<int:pk>/', add_photo, name='edit_photo'),
     path('photos/delete/<int:pk>/', delete_photo, name='delete_photo'),
@@ -53,6 +64,7 @@ urlpatterns = [
 
     # Sharx
     path('reviews/', reviews_list, name='reviews_list'),
+    path('api/reviews/', reviews_json, name='reviews_json'),
     path('api/add-review/', add_review, name='add_review'),
     path('api/edit-review/<int:review_id>/', edit_review, name='edit_review'),
     path('api/delete-review/<int:review_id>/', delete_review, name='delete_review'),
@@ -64,6 +76,9 @@ urlpatterns = [
 
     path('ads/', active_ads, name='ads'),
     path('ads/<int:pk>/', ad_detail, name='ad_detail'),
+    path('api/ads/next/', next_ad_json, name='next_ad'),
+    path('api/ads/<int:pk>/impression/', ad_impression, name='ad_impression'),
+    path('ads/<int:pk>/video/', stream_ad_video, name='stream_ad_video'),
     path("ads/create/", create_ad, name="create_ad"),
 
 ]
\ No newline at end of file
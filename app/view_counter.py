@@ -0,0 +1,136 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+SEEN_KEY = 'view_counter:seen:{label}:{pk}:{viewer}'
+
+
+class ViewCounter:
+    """
+    Ko'rishlar/impressionlar buferi: har bir so'rov qatorni yozish o'rniga jarayon
+    xotirasida (model, pk) -> n yig'adi. Buferni flush() bitta model va bir xil n
+    uchun bitta `UPDATE ... SET views = views + n WHERE id IN (...)` bilan yozadi.
+
+    Birinchi yozilmagan ko'rishdan VIEW_COUNTER_FLUSH_INTERVAL soniya o'tgach fon
+    taymeri flush qiladi (jarayon sokin bo'lsa ham ko'rishlar ushlanib qolmaydi),
+    VIEW_COUNTER_MAX_PENDING ta yig'ilsa - darhol, jarayon tugaganda - atexit orqali.
+    Interval 0 bo'lsa har bir ko'rish darhol yoziladi.
+    """
+
+    def __init__(self, field='views'):
+        self.field = field
+        self.lock = threading.Lock()
+        self.pending = defaultdict(int)
+        self.pending_total = 0
+        self.timer = None
+
+    def record(self, model, pk, count=1):
+        interval = getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 10)
+        with self.lock:
+            self.pending[(model, pk)] += count
+            self.pending_total += count
+            due = interval <= 0 or self.pending_total >= getattr(settings, 'VIEW_COUNTER_MAX_PENDING', 500)
+            if not due:
+                self._schedule(interval)
+        if due:
+            self.flush()
+
+    def _schedule(self, interval):
+        # self.lock ushlangan holda chaqiriladi
+        if self.timer is None:
+            self.timer = threading.Timer(interval, self.flush_in_background)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def pending_count(self, model, pk):
+        """Hali yozilmagan ko'rishlar (sahifada ko'rsatiladigan songa qo'shish uchun)"""
+        with self.lock:
+            return self.pending.get((model, pk), 0)
+
+    def flush(self):
+        """Buferni bazaga yozadi; yozilgan UPDATE lar sonini qaytaradi"""
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(int)
+            self.pending_total = 0
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return 0
+
+        # model -> n -> [pk, ...]
+        groups = defaultdict(lambda: defaultdict(list))
+        for (model, pk), count in pending.items():
+            groups[model][count].append(pk)
+
+        updates = 0
+        for model, by_count in groups.items():
+            for count, pks in by_count.items():
+                try:
+                    model.objects.filter(pk__in=pks).update(**{self.field: F(self.field) + count})
+                    updates += 1
+                except DatabaseError:
+                    # Keyingi flush da qayta urinib ko'riladi
+                    logger.exception("%s ko'rishlarini yozib bo'lmadi", model.__name__)
+                    for pk in pks:
+                        self.record_failed(model, pk, count)
+        return updates
+
+    def flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # Taymer oqimining o'z ulanishi
+            connection.close()
+
+    def record_failed(self, model, pk, count):
+        with self.lock:
+            self.pending[(model, pk)] += count
+            self.pending_total += count
+            self._schedule(max(getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 10), 1))
+
+    def reset(self):
+        """Buferni yozmasdan tashlab yuboradi va taymerni to'xtatadi (testlar uchun)"""
+        with self.lock:
+            self.pending = defaultdict(int)
+            self.pending_total = 0
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
+
+
+def record_view(model, pk, count=1):
+    view_counter.record(model, pk, count)
+
+
+def record_view_once(model, pk, viewer):
+    """
+    Ko'rishni tomoshabin (sessiya kaliti yoki IP) uchun VIEW_COUNTER_SEEN_TTL soniyada bir
+    marta sanaydi. Belgi keshda TTL bilan turadi - sessiyada ro'yxat o'smaydi va qayta
+    yozilmaydi. Sanalgan bo'lsa True.
+    """
+    key = SEEN_KEY.format(label=model._meta.label_lower, pk=pk, viewer=viewer)
+    if not cache.add(key, 1, getattr(settings, 'VIEW_COUNTER_SEEN_TTL', 6 * 60 * 60)):
+        return False
+    record_view(model, pk)
+    return True
+
+
+def pending_views(model, pk):
+    return view_counter.pending_count(model, pk)
+
+
+def flush_views():
+    return view_counter.flush()
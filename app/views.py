@@ -1,18 +1,34 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from .forms import CarpetTypeForm, SimpleUserCreationForm, MediaForm, ReviewForm, AdForm
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import login, logout, authenticate
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_http_methods
 from django.utils import timezone
-from django.db.models import Count, Q, Avg, Count
-from .telegram_bot import send_telegram_message
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.db import transaction
+from django.db.models import Count, Q, Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from .telegram_bot import enqueue_telegram_message
 from django.contrib.auth.models import User
 from .models import CarpetType, VisitLog, Order, Media, VisitLog, Sovga, BarabanSpin, User, Yutuq, Review, Advertisement
 from django.contrib.admin.views.decorators import staff_member_required
+from .prize_sampler import get_prize_sampler
+from .spin_cooldown import initial_next_spin, claim_spin, get_cooldown, record_spin
+from . import ad_rotation, chunked_upload, media_gallery
+from .page_cache import cache_anonymous_page
+from . import review_feed
+from .review_stats import apply_review_change, get_review_summary, review_state, summary_payload
+from .stats import get_site_stats
+from .streaming import stream_file
+from .view_counter import pending_views, record_view, record_view_once
+from .visit_stats import get_visit_trend, local_today, start_of_day
+import os
 import random
 from datetime import datetime, timedelta
 from django.core.paginator import Paginator
@@ -21,54 +37,28 @@ from . import forms
 
 
 
+@cache_anonymous_page('CarpetType', 'Media', 'Order')
 def index(request):
     carpets = CarpetType.objects.all()
 
     # 🔥 Bugungi sana
-    today = timezone.now().date()
-    start_of_today = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    end_of_today = timezone.make_aware(datetime.combine(today, datetime.max.time()))
+    today = local_today()
 
-    # 🔥 Bugungi kirishlarni hisoblash
-    today_visits = VisitLog.objects.filter(timestamp__range=(start_of_today, end_of_today))
+    # 🔥 To'liq statistika (kirishlar va buyurtmalar, keshlangan)
+    stats = get_site_stats(today)
 
-    # 🔥 Bugun kirgan foydalanuvchilar
-    today_logged_in_users = today_visits.filter(user__isnull=False).values('user').distinct()
-    today_logged_in_user_ids = [item['user'] for item in today_logged_in_users]
-    today_users = User.objects.filter(id__in=today_logged_in_user_ids)
-
-    # 🔥 To'liq statistikani hisoblash
-    stats = {
-        # Bugungi kirishlar statistikasi
-        'today_visits': today_visits.count(),
-        'guests_today': today_visits.filter(user__isnull=True).count(),
-        'users_today': today_logged_in_users.count(),
-        'admins_today': today_users.filter(is_superuser=True).count(),
-        'staff_today': today_users.filter(is_staff=True, is_superuser=False).count(),
-        'customers_today': today_users.filter(is_staff=False, is_superuser=False).count(),
-
-        # Buyurtmalar statistikasi
-        'new_orders': Order.objects.filter(created_at__date=today, status='new').count(),
-        'processing_orders': Order.objects.filter(created_at__date=today, status='processing').count(),
-        'completed_orders': Order.objects.filter(created_at__date=today, status='completed').count(),
-
-        # Umumiy buyurtmalar (ixtiyoriy)
-        'total_orders': Order.objects.all().count(),
-        'total_new_orders': Order.objects.filter(status='new').count(),
-        'total_processing_orders': Order.objects.filter(status='processing').count(),
-        'total_completed_orders': Order.objects.filter(status='completed').count(),
-    }
-
-    # 🔥 Media bo‘limlari
-    videos = Media.objects.filter(media_type='video', is_active=True)
-    photos = Media.objects.filter(media_type='photo', is_active=True)
+    # 🔥 Media bo‘limlari (birinchi kartalar, qolgani api/media/ dan)
+    videos, videos_cursor = media_gallery.gallery_page('video', size=media_gallery.HOME_VIDEOS)
+    photos, photos_cursor = media_gallery.gallery_page('photo', size=media_gallery.HOME_PHOTOS)
 
     context = {
         'carpets': carpets,
         'stats': stats,
         'today_date': today,
         'videos': videos,    # video bo‘limi
+        'videos_cursor': videos_cursor,
         'photos': photos,    # rasm bo‘limi
+        'photos_cursor': photos_cursor,
     }
 
     return render(request, 'app/index.html', context)
@@ -88,16 +78,6 @@ def create_order(request):
 
         carpet_type = CarpetType.objects.get(id=carpet_type_id) if carpet_type_id else None
 
-        order = Order.objects.create(
-            name=name,
-            phone=phone,
-            address=address,
-            carpet_type=carpet_type,
-            other_carpet_name=other_carpet_name,
-            date=date,
-            comment=comment
-        )
-
         # 📩 Botga ketadigan xabar
         message = f"""
 📦 *Yangi buyurtma!*
@@ -110,8 +90,19 @@ def create_order(request):
 📝 Izoh: {comment}
 """
 
-        # 🔥 Qo‘shimcha faylga yozilgan funksiya chaqirilyapti
-        send_telegram_message(message)
+        # 🔥 Buyurtma va xabar bitta tranzaksiyada yoziladi,
+        # Telegramga esa send_telegram_outbox worker yuboradi
+        with transaction.atomic():
+            order = Order.objects.create(
+                name=name,
+                phone=phone,
+                address=address,
+                carpet_type=carpet_type,
+                other_carpet_name=other_carpet_name,
+                date=date,
+                comment=comment
+            )
+            enqueue_telegram_message(message)
 
         messages.success(request, "Buyurtma muvaffaqiyatli yuborildi!")
         return redirect('index')
@@ -120,25 +111,102 @@ def create_order(request):
 
 
 
+ORDERS_PAGE_SIZE = 50
+
+
+def filter_orders(params):
+    """Buyurtmalarni GET parametrlari bo'yicha filtrlash (status, sana, gilam turi)"""
+    orders = Order.objects.select_related('carpet_type')
+    filters = {
+        'status': params.get('status', ''),
+        'date_from': params.get('date_from', ''),
+        'date_to': params.get('date_to', ''),
+        'carpet_type': params.get('carpet_type', ''),
+    }
+
+    if filters['status'] in dict(Order.STATUS_CHOICES):
+        orders = orders.filter(status=filters['status'])
+
+    for key, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lte')):
+        try:
+            orders = orders.filter(**{lookup: datetime.strptime(filters[key], '%Y-%m-%d').date()})
+        except ValueError:
+            filters[key] = ''
+
+    if filters['carpet_type'] == 'other':
+        orders = orders.filter(carpet_type__isnull=True)
+    elif filters['carpet_type'].isdigit():
+        orders = orders.filter(carpet_type_id=int(filters['carpet_type']))
+    else:
+        filters['carpet_type'] = ''
+
+    return orders, filters
+
+
+def orders_page(request):
+    """
+    Keyset (id-kursor) sahifalash: ?before=<id> dan kichik id li keyingi
+    ORDERS_PAGE_SIZE ta buyurtma. OFFSET ishlatilmaydi, sahifa tezligi doimiy.
+    """
+    orders, filters = filter_orders(request.GET)
+
+    before = request.GET.get('before', '')
+    if before.isdigit():
+        orders = orders.filter(id__lt=int(before))
+
+    page = list(orders.order_by('-id')[:ORDERS_PAGE_SIZE + 1])
+    has_more = len(page) > ORDERS_PAGE_SIZE
+    page = page[:ORDERS_PAGE_SIZE]
+    next_cursor = page[-1].id if has_more else None
+    return page, next_cursor, filters
+
+
+@staff_member_required
 def clients(request):
-    orders = Order.objects.all().order_by('-id')
+    orders, next_cursor, filters = orders_page(request)
 
     # Statistika hisoblash
-    total_orders = orders.count()
-    new_orders = orders.filter(status='new').count()
-    processing_orders = orders.filter(status='processing').count()
-    completed_orders = orders.filter(status='completed').count()
+    stats = get_site_stats()
 
     context = {
         'orders': orders,
-        'total_orders': total_orders,
-        'new_orders': new_orders,
-        'processing_orders': processing_orders,
-        'completed_orders': completed_orders,
+        'next_cursor': next_cursor,
+        'filters': filters,
+        'carpet_types': CarpetType.objects.all(),
+        'status_choices': Order.STATUS_CHOICES,
+        'total_orders': stats['total_orders'],
+        'new_orders': stats['total_new_orders'],
+        'processing_orders': stats['total_processing_orders'],
+        'completed_orders': stats['total_completed_orders'],
     }
     return render(request, 'app/clients.html', context)
 
 
+@staff_member_required
+def clients_json(request):
+    """Mijozlar jadvalining keyingi sahifasi (cilents.js uchun)"""
+    orders, next_cursor, filters = orders_page(request)
+
+    return JsonResponse({
+        'success': True,
+        'orders': [
+            {
+                'id': order.id,
+                'name': order.name,
+                'phone': order.phone,
+                'address': order.address,
+                'carpet_type': order.carpet_type.name if order.carpet_type else order.other_carpet_name,
+                'date': order.date.isoformat(),
+                'status': order.status,
+                'status_display': order.get_status_display(),
+            }
+            for order in orders
+        ],
+        'html': render_to_string('app/clients_rows.html', {'orders': orders}, request=request),
+        'next_cursor': next_cursor,
+    })
+
+
 # AJAX orqali status yangilash
 @csrf_exempt
 def update_order_status(request, order_id):
@@ -278,30 +346,29 @@ def profile_view(request):
 
 
 def get_dashboard_stats():
-    today = timezone.now().date()
-    start_of_today = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    end_of_today = timezone.make_aware(datetime.combine(today, datetime.max.time()))
-
-    # Bugungi kirishlar
-    today_visits = VisitLog.objects.filter(timestamp__range=(start_of_today, end_of_today))
-
-    # Bugun kirmagan foydalanuvchilarni aniqlash
-    today_logged_in_users = today_visits.filter(user__isnull=False).values('user').distinct()
-    today_logged_in_user_ids = [item['user'] for item in today_logged_in_users]
+    today = local_today()
+    site_stats = get_site_stats(today)
 
-    # Bugun kirgan foydalanuvchilar turkumlari
-    today_users = User.objects.filter(id__in=today_logged_in_user_ids)
+    # Bugun kirgan foydalanuvchilar
+    today_logged_in_users = VisitLog.objects.filter(
+        timestamp__gte=start_of_day(today), user__isnull=False
+    ).values('user')
 
     stats = {
-        'today_visits': today_visits.count(),
-        'guests_today': today_visits.filter(user__isnull=True).count(),
-        'users_today': today_logged_in_users.count(),
-        'new_orders': Order.objects.filter(status='new').count(),
-        'processing_orders': Order.objects.filter(status='processing').count(),
-        'completed_orders': Order.objects.filter(status='completed').count(),
+        'today_visits': site_stats['today_visits'],
+        'guests_today': site_stats['guests_today'],
+        'users_today': site_stats['users_today'],
+        'new_orders': site_stats['total_new_orders'],
+        'processing_orders': site_stats['total_processing_orders'],
+        'completed_orders': site_stats['total_completed_orders'],
 
         # Bugungi faol foydalanuvchilar ro'yxati (qo'shimcha)
-        'today_active_users': today_users.values('username', 'email')[:10]
+        'today_active_users': User.objects.filter(id__in=today_logged_in_users).values('username', 'email')[:10],
+
+        # Oxirgi 7/30/90 kunlik kirishlar dinamikasi
+        'visit_trend_7': get_visit_trend(7),
+        'visit_trend_30': get_visit_trend(30),
+        'visit_trend_90': get_visit_trend(90),
     }
 
     return stats
@@ -363,6 +430,7 @@ def video_list(request):
 # ============ VIDEO BOSHQARISH ============
 
 
+@cache_anonymous_page('Media')
 def add_video(request, pk=None):
     """Video qo'shish yoki tahrirlash"""
     video = None
@@ -385,11 +453,12 @@ def add_video(request, pk=None):
     else:
         form = MediaForm(instance=video)
     
-    videos = Media.objects.filter(media_type='video').order_by('-created_at')
+    videos, next_cursor = media_gallery.gallery_page('video', include_inactive=request.user.is_staff)
     
     context = {
         'form': form,
         'videos': videos,
+        'next_cursor': next_cursor,
         'action': action,
         'current_video': video,
     }
@@ -405,20 +474,167 @@ def delete_video(request, pk):
     messages.success(request, f'"{title}" videosi o\'chirildi!')
     return redirect('video_list')
 
+# ============ VIDEO OQIMI (HTTP Range) ============
+
+
+def serve_video(request, field):
+    try:
+        path = field.path
+    except NotImplementedError:
+        # Tashqi storage (S3 va h.k.) Range so'rovlarini o'zi qo'llab-quvvatlaydi
+        return redirect(field.url)
+    if not os.path.exists(path):
+        raise Http404("Video fayl topilmadi")
+    return stream_file(request, path)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def stream_media_video(request, pk):
+    """Media videosini bo'laklab uzatish; ko'rish sessiya uchun bir marta sanaladi"""
+    media = get_object_or_404(
+        Media.objects.only('id', 'video_file', 'is_active'), pk=pk, media_type='video'
+    )
+    if not media.video_file or (not media.is_active and not request.user.is_staff):
+        raise Http404("Video topilmadi")
+
+    # Brauzer seek qilganda ko'plab Range so'rovlari keladi - faqat birinchisi sanaladi
+    if request.method == 'GET':
+        viewer = request.session.session_key or request.META.get('REMOTE_ADDR', '')
+        record_view_once(Media, media.pk, viewer)
+
+    return serve_video(request, media.video_file)
+
+
+@require_http_methods(['GET', 'HEAD'])
+def stream_ad_video(request, pk):
+    """Reklama videosini bo'laklab uzatish"""
+    ad = get_object_or_404(Advertisement.objects.only('id', 'video'), pk=pk)
+    if not ad.video:
+        raise Http404("Video topilmadi")
+    return serve_video(request, ad.video)
+
+
+# ============ BO'LAKLAB YUKLASH (qayta davom ettiriladigan) ============
+
+
+def upload_error(e):
+    return JsonResponse({'success': False, 'error': str(e)}, status=e.status)
+
+
+@login_required
+@user_passes_test(admin_required)
+@require_POST
+def upload_init(request):
+    """Yuklashni boshlash: fayl nomi, hajmi va Media ma'lumotlari"""
+    try:
+        data = json.loads(request.body or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': "JSON noto'g'ri"}, status=400)
+
+    try:
+        state = chunked_upload.init_upload(
+            request.user,
+            filename=data.get('filename'),
+            size=data.get('size'),
+            media_type=data.get('media_type', 'video'),
+            title=data.get('title'),
+            description=data.get('description'),
+            duration=data.get('duration'),
+            is_active=data.get('is_active', True),
+            sha256=data.get('sha256'),
+        )
+    except chunked_upload.UploadError as e:
+        return upload_error(e)
+    return JsonResponse({'success': True, **state}, status=201)
+
+
+@login_required
+@user_passes_test(admin_required)
+@require_http_methods(['GET', 'DELETE'])
+def upload_status(request, upload_id):
+    """Qabul qilingan bo'laklar ro'yxati (davom ettirish uchun) yoki bekor qilish"""
+    try:
+        if request.method == 'DELETE':
+            chunked_upload.abort_upload(upload_id, request.user)
+            return JsonResponse({'success': True})
+        return JsonResponse({'success': True, **chunked_upload.status(upload_id, request.user)})
+    except chunked_upload.UploadError as e:
+        return upload_error(e)
+
+
+@login_required
+@user_passes_test(admin_required)
+@require_http_methods(['PUT', 'POST'])
+def upload_chunk(request, upload_id, index):
+    """N-bo'lak: so'rov tanasi xom baytlar, xotiraga to'liq o'qilmaydi"""
+    try:
+        state = chunked_upload.save_chunk(
+            upload_id, request.user, index, request,
+            checksum=request.headers.get('X-Chunk-SHA256', ''),
+        )
+    except chunked_upload.UploadError as e:
+        return upload_error(e)
+    return JsonResponse({'success': True, **state})
+
+
+@login_required
+@user_passes_test(admin_required)
+@require_POST
+def upload_finalize(request, upload_id):
+    """Bo'laklarni yig'ish, tekshirish va Media yaratish"""
+    try:
+        media = chunked_upload.finalize_upload(upload_id, request.user)
+    except chunked_upload.UploadError as e:
+        return upload_error(e)
+    return JsonResponse({'success': True, 'media_id': media.id, 'title': media.title}, status=201)
+
+
 # ============ RASM BOSHQARISH ============
 
 
+@cache_anonymous_page('Media')
 def photo_list(request):
-    """Rasmlar ro'yxati"""
-    photos = Media.objects.filter(media_type='photo').order_by('-created_at')
+    """Rasmlar ro'yxati (birinchi sahifa, qolgani skroll qilinganda api/media/ dan)"""
+    photos, next_cursor = media_gallery.gallery_page('photo', include_inactive=request.user.is_staff)
     
     context = {
         'photos': photos,
+        'next_cursor': next_cursor,
     }
     
     return render(request, 'app/photo_list.html', context)
 
 
+@require_http_methods(["GET", "HEAD"])
+def media_json(request):
+    """
+    Galereyaning keyingi kartalari: ?type=video|photo&layout=index|list&cursor=<next_cursor>&limit=N.
+    `html` sahifadagi kartalar bilan bir xil partial dan render qilinadi.
+    """
+    media_type = request.GET.get('type', '')
+    layout = request.GET.get('layout', 'list')
+    if media_type not in dict(Media.MEDIA_CHOICES) or layout not in media_gallery.CARD_TEMPLATES:
+        return JsonResponse({'success': False, 'error': "Noto'g'ri type yoki layout"}, status=400)
+
+    # Bosh sahifada faqat faollar, boshqaruv ro'yxatlarida xodimlar hammasini ko'radi
+    include_inactive = layout == 'list' and request.user.is_staff
+    items, next_cursor = media_gallery.gallery_page(
+        media_type,
+        cursor=request.GET.get('cursor'),
+        size=media_gallery.parse_page_size(request.GET.get('limit')),
+        include_inactive=include_inactive,
+    )
+    template = media_gallery.CARD_TEMPLATES[layout][media_type]
+    context_name = 'videos' if media_type == 'video' else 'photos'
+
+    return JsonResponse({
+        'success': True,
+        'items': [media_gallery.media_item(media) for media in items],
+        'html': render_to_string(template, {context_name: items}, request=request),
+        'next_cursor': next_cursor,
+    })
+
+
 def add_photo(request, pk=None):
     """Rasm qo'shish yoki tahrirlash"""
     photo = None
@@ -484,18 +700,17 @@ def baraban(request):
         # Faol sovg'alarni olish
         sovgalar = Sovga.objects.filter(is_active=True).order_by('katak_raqami')
         
-        # Foydalanuvchining oxirgi spinini olish
-        last_spin = BarabanSpin.objects.filter(user=request.user).order_by('-spin_vaqti').first()
+        # Kutish holati va oxirgi spin (bitta indekslangan so'rov)
+        now = timezone.now()
+        cooldown = get_cooldown(request.user)
+        if cooldown:
+            next_spin_at, last_spin = cooldown.next_spin_at, cooldown.last_spin
+        else:
+            next_spin_at, last_spin = initial_next_spin(request.user, now)
         
         # Spin qila olishini tekshirish
-        can_spin = True
-        remaining_time = 0
-        
-        if last_spin:
-            now = timezone.now()
-            if now < last_spin.keyingi_spin_vaqti:
-                can_spin = False
-                remaining_time = int((last_spin.keyingi_spin_vaqti - now).total_seconds())
+        can_spin = now >= next_spin_at
+        remaining_time = 0 if can_spin else int((next_spin_at - now).total_seconds())
         
         context = {
             'user': request.user,
@@ -520,13 +735,22 @@ def spin_baraban(request):
         if request.method != 'POST':
             return JsonResponse({'success': False, 'error': 'Faqat POST so\'rov qabul qilinadi'})
         
-        # Foydalanuvchining oxirgi spinini tekshirish
-        last_spin = BarabanSpin.objects.filter(user=request.user).order_by('-spin_vaqti').first()
+        # Faol sovg'alar sampleri (jarayonda keshlangan, Sovga o'zgarganda qayta quriladi)
+        sampler = get_prize_sampler()
         
-        if last_spin:
+        if sampler.empty:
+            return JsonResponse({
+                'success': False,
+                'error': 'Hozircha sovg\'alar mavjud emas'
+            })
+        
+        with transaction.atomic():
+            # Kutish vaqtini atomar band qilish: parallel so'rovlardan faqat bittasi o'tadi
             now = timezone.now()
-            if now < last_spin.keyingi_spin_vaqti:
-                qolgan = last_spin.keyingi_spin_vaqti - now
+            claimed, next_spin_time = claim_spin(request.user, now)
+            
+            if not claimed:
+                qolgan = next_spin_time - now
                 soat = qolgan.seconds // 3600
                 daqiqa = (qolgan.seconds % 3600) // 60
                 soniya = qolgan.seconds % 60
@@ -534,62 +758,27 @@ def spin_baraban(request):
                     'success': False,
                     'error': f'Siz hali {soat:02d}:{daqiqa:02d}:{soniya:02d} vaqt o\'tmagan'
                 })
-        
-        # Faol sovg'alarni olish
-        active_sovgalar = Sovga.objects.filter(is_active=True)
-        
-        if not active_sovgalar.exists():
-            return JsonResponse({
-                'success': False,
-                'error': 'Hozircha sovg\'alar mavjud emas'
-            })
-        
-        # Yutuqni tasodifiy tanlash
-        # 1. Barcha sovg'alarni foizlari bo'yicha ro'yxatga joylash
-        prizes_list = []
-        for sovga in active_sovgalar:
-            prizes_list.extend([sovga] * sovga.foiz)
-        
-        # 2. Agar foizlar yig'indisi 100 dan kam bo'lsa, "Yutuq yo'q" qo'shish
-        total_foiz = sum(s.foiz for s in active_sovgalar)
-        if total_foiz < 100:
-            # "Yutuq yo'q" uchun ma'lumot
-            no_prize_count = 100 - total_foiz
-            for _ in range(no_prize_count):
-                prizes_list.append({
-                    'nomi': "Yutuq yo'q",
-                    'katak_raqami': random.randint(1, 10),
-                    'is_no_prize': True
-                })
-        
-        # 3. Tasodifiy tanlash
-        selected = random.choice(prizes_list)
-        
-        # 4. Natijani aniqlash
-        if isinstance(selected, dict) and selected.get('is_no_prize'):
-            sovga_obj = None
-            sovga_nomi = "Yutuq yo'q"
-            katak_raqami = selected['katak_raqami']
-        else:
-            sovga_obj = selected
-            sovga_nomi = selected.nomi
-            katak_raqami = selected.katak_raqami
-        
-        # 5. Yangi spin yaratish
-        next_spin_time = timezone.now() + timedelta(hours=24)
-        BarabanSpin.objects.create(
-            user=request.user,
-            sovga=sovga_obj,
-            spin_vaqti=timezone.now(),
-            keyingi_spin_vaqti=next_spin_time
-        )
+            
+            # Yutuqni foizlar bo'yicha tanlash (alias usuli, O(1))
+            prize = sampler.draw()
+            sovga_nomi = prize.nomi
+            katak_raqami = prize.katak_raqami
+            
+            # Yangi spin yaratish
+            spin = BarabanSpin.objects.create(
+                user=request.user,
+                sovga_id=prize.sovga_id,
+                spin_vaqti=now,
+                keyingi_spin_vaqti=next_spin_time
+            )
+            record_spin(request.user, spin)
         
         return JsonResponse({
             'success': True,
             'sovga': sovga_nomi,
             'katak': katak_raqami,
             'next_spin_time': next_spin_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'message': f"Tabriklaymiz! Siz {sovga_nomi} sovg'asini yutdingiz!" if sovga_obj else "Bu safar omad yorilmadi. Keyingi imkoniyatingizda omad!"
+            'message': f"Tabriklaymiz! Siz {sovga_nomi} sovg'asini yutdingiz!" if prize.sovga_id else "Bu safar omad yorilmadi. Keyingi imkoniyatingizda omad!"
         })
         
     except Exception as e:
@@ -694,40 +883,53 @@ def sovga_management(request):
     
 # _________________________foydalanuvchilardiki___________________________________
 
+# Saralash: kalit -> (nomi, order_by)
+USER_SORTS = {
+    '': ("Yangi ro'yxatdan o'tganlar", ('-date_joined', '-id')),
+    'spins': ("Ko'p aylantirganlar", ('-total_spins', '-id')),
+    'wins': ("Ko'p yutganlar", ('-total_wins', '-id')),
+    'win_rate': ("Yutish foizi bo'yicha", ('-win_rate', '-total_spins', '-id')),
+}
+
+
 @staff_member_required
 def foydalanuvchilar_list(request):
     """Foydalanuvchilar ro'yxati"""
     q = request.GET.get('q', '')
-    
+    sort = request.GET.get('sort', '')
+    if sort not in USER_SORTS:
+        sort = ''
+
+    users = User.objects.all()
     if q:
-        users = User.objects.filter(
+        users = users.filter(
             Q(username__icontains=q) |
             Q(first_name__icontains=q) |
             Q(last_name__icontains=q) |
             Q(email__icontains=q)
-        ).order_by('-date_joined')
-    else:
-        users = User.objects.all().order_by('-date_joined')
-    
-    # Har bir foydalanuvchi uchun statistikalar
-    user_stats = []
-    for user in users:
-        total_spins = BarabanSpin.objects.filter(user=user).count()
-        total_wins = BarabanSpin.objects.filter(user=user, sovga__isnull=False).count()
-        user_stats.append({
-            'user': user,
-            'total_spins': total_spins,
-            'total_wins': total_wins,
-            'win_rate': (total_wins / total_spins * 100) if total_spins > 0 else 0
-        })
-    
-    paginator = Paginator(user_stats, 20)
+        )
+
+    # Statistikalar bitta so'rovda, bazaning o'zida hisoblanadi
+    users = users.annotate(
+        total_spins=Count('spins'),
+        total_wins=Count('spins', filter=Q(spins__sovga__isnull=False)),
+    ).annotate(
+        win_rate=Case(
+            When(total_spins=0, then=Value(0.0)),
+            default=Cast('total_wins', FloatField()) * 100.0 / F('total_spins'),
+            output_field=FloatField(),
+        )
+    ).order_by(*USER_SORTS[sort][1])
+
+    paginator = Paginator(users, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
     context = {
         'page_obj': page_obj,
         'q': q,
+        'sort': sort,
+        'sort_choices': [(key, label) for key, (label, _) in USER_SORTS.items()],
         'total_users': User.objects.count()
     }
     
@@ -819,20 +1021,13 @@ def mark_yutuq_used(request, yutuq_id):
 
 # ______________________sharx_________________________________________
 
+@cache_anonymous_page('Review')
 def reviews_list(request):
-    """Barcha sharhlarni ko'rsatish"""
-    reviews = Review.objects.filter(is_active=True).select_related('user').order_by('-created_at')
+    """Sharhlarning birinchi sahifasi, qolganlari skroll qilinganda reviews_json dan"""
+    reviews, next_cursor = review_feed.reviews_page(request.GET)
     
-    # Reyting statistikasi
-    stats = Review.objects.filter(is_active=True).aggregate(
-        total=Count('id'),
-        average=Avg('rating'),
-        five_star=Count('id', filter=Q(rating=5)),
-        four_star=Count('id', filter=Q(rating__gte=4, rating__lt=5)),
-        three_star=Count('id', filter=Q(rating__gte=3, rating__lt=4)),
-        two_star=Count('id', filter=Q(rating__gte=2, rating__lt=3)),
-        one_star=Count('id', filter=Q(rating__gte=1, rating__lt=2))
-    )
+    # Reyting statistikasi (ReviewRatingSummary dan bitta qator)
+    stats = get_review_summary()
     
     # Har bir foydalanuvchining o'z sharhi bor-yo'qligini tekshirish
     user_review = None
@@ -844,6 +1039,7 @@ def reviews_list(request):
     
     context = {
         'reviews': reviews,
+        'next_cursor': next_cursor,
         'stats': stats,
         'user_review': user_review,
         'form': form,
@@ -851,6 +1047,46 @@ def reviews_list(request):
     
     return render(request, 'app/reviews.html', context)
 
+
+@require_http_methods(["GET", "HEAD"])
+def reviews_json(request):
+    """
+    Sharhlar lentasi: ?cursor=<next_cursor> bilan keyingi sahifa. Yangi sharhlarni
+    tekshirayotgan mijozlar If-None-Match / If-Modified-Since yuborsa, o'zgarish
+    bo'lmaganida sahifa so'rovisiz 304 qaytadi.
+    """
+    etag, latest = review_feed.feed_validators(request)
+    last_modified = int(latest.timestamp()) if latest else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    if response is None:
+        reviews, next_cursor = review_feed.reviews_page(request.GET)
+        response = JsonResponse({
+            'success': True,
+            'reviews': [
+                {
+                    'id': review.id,
+                    'user': review.user.get_full_name() or review.user.username,
+                    'rating': review.rating,
+                    'stars': review.stars,
+                    'comment': review.comment,
+                    'created_at': review.created_at.isoformat(),
+                    'is_owner': review.user_id == request.user.id,
+                }
+                for review in reviews
+            ],
+            'html': render_to_string('app/reviews_rows.html', {'reviews': reviews}, request=request),
+            'next_cursor': next_cursor,
+        })
+
+    response.headers['ETag'] = etag
+    if latest:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    # Brauzer har safar qayta tekshiradi (arzon 304), javob foydalanuvchiga bog'liq
+    response.headers['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
 @login_required
 def add_review(request):
     """Yangi sharh qo'shish"""
@@ -867,7 +1103,9 @@ def add_review(request):
         if form.is_valid():
             review = form.save(commit=False)
             review.user = request.user
-            review.save()
+            with transaction.atomic():
+                review.save()
+                apply_review_change(new=review_state(review))
             
             return JsonResponse({
                 'success': True,
@@ -892,9 +1130,13 @@ def edit_review(request, review_id):
         review = Review.objects.get(id=review_id, user=request.user)
         
         if request.method == 'POST':
+            # is_valid() instance ni o'zgartiradi - eski holatni oldindan olamiz
+            old_state = review_state(review)
             form = ReviewForm(request.POST, instance=review)
             if form.is_valid():
-                form.save()
+                with transaction.atomic():
+                    form.save()
+                    apply_review_change(old_state, review_state(review))
                 return JsonResponse({
                     'success': True,
                     'message': 'Sharh muvaffaqiyatli yangilandi!'
@@ -918,8 +1160,11 @@ def delete_review(request, review_id):
     """Sharhni o'chirish (faol emas qilish)"""
     try:
         review = Review.objects.get(id=review_id, user=request.user)
+        old_state = review_state(review)
         review.is_active = False
-        review.save()
+        with transaction.atomic():
+            review.save()
+            apply_review_change(old_state, review_state(review))
         
         return JsonResponse({
             'success': True,
@@ -934,34 +1179,9 @@ def delete_review(request, review_id):
 
 def get_review_stats(request):
     """Reyting statistikasini olish (AJAX uchun)"""
-    stats = Review.objects.filter(is_active=True).aggregate(
-        total=Count('id'),
-        average=Avg('rating'),
-    )
-    
-    # Har bir yulduz uchun foizlarni hisoblash
-    total_reviews = stats['total'] or 1  # 0 ga bo'linishdan saqlanish
-    
-    rating_counts = {
-        '5': Review.objects.filter(rating=5, is_active=True).count(),
-        '4': Review.objects.filter(rating__gte=4, rating__lt=5, is_active=True).count(),
-        '3': Review.objects.filter(rating__gte=3, rating__lt=4, is_active=True).count(),
-        '2': Review.objects.filter(rating__gte=2, rating__lt=3, is_active=True).count(),
-        '1': Review.objects.filter(rating__gte=1, rating__lt=2, is_active=True).count(),
-    }
-    
-    rating_percentages = {}
-    for key, count in rating_counts.items():
-        rating_percentages[key] = (count / total_reviews) * 100
-    
     return JsonResponse({
         'success': True,
-        'stats': {
-            'total': stats['total'],
-            'average': float(stats['average'] or 0),
-            'rating_counts': rating_counts,
-            'rating_percentages': rating_percentages,
-        }
+        'stats': summary_payload(get_review_summary()),
     })
 
 
@@ -991,20 +1211,47 @@ def get_review(request, review_id):
         })
     
 
+@cache_anonymous_page('Advertisement')
 def active_ads(request):
-    ads = Advertisement.objects.all()
-    active_ads = [ad for ad in ads if ad.is_active()]
-    return render(request, 'app/ads.html', {'ads': active_ads})
+    ads = Advertisement.objects.active()
+    return render(request, 'app/ads.html', {'ads': ads})
+
+
+@require_http_methods(["GET", "HEAD"])
+def next_ad_json(request):
+    """Slot uchun navbatdagi reklama: ?slot=<nom> (keshlangan aylanish rejasidan)"""
+    slot = request.GET.get('slot', 'default')[:50]
+    ad = ad_rotation.next_ad(slot)
+    response = JsonResponse({
+        'success': True,
+        'ad': ad,
+        'html': render_to_string('app/ad_slot.html', {'ad': ad, 'slot': slot}),
+    })
+    # Har safar navbatdagisi - brauzer/proksi keshlamasin
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+# sendBeacon sarlavha yubora olmaydi, keshlangan sahifada esa CSRF cookie bo'lmasligi mumkin;
+# so'rov faqat ko'rishlar hisoblagichini oshiradi
+@csrf_exempt
+@require_POST
+def ad_impression(request, pk):
+    """Banner o'rniga qo'yilgach ad_slot.js yuboradi: impression shu yerda sanaladi"""
+    if not ad_rotation.record_impression(pk):
+        return JsonResponse({'success': False, 'error': 'Reklama topilmadi'}, status=404)
+    return JsonResponse({'success': True})
 
 
 def ad_detail(request, pk):
     ad = get_object_or_404(Advertisement, pk=pk)
 
+    # Qatorni qayta yozmasdan buferga, bazaga F() bilan guruhlab yoziladi
     if ad.is_active():
-        ad.views += 1
-        ad.save()
+        record_view(Advertisement, ad.pk)
+        ad.views += pending_views(Advertisement, ad.pk)
 
-    return render(request, 'ad_detail.html', {'ad': ad})
+    return render(request, 'app/ad_detail.html', {'ad': ad})
 
 
 
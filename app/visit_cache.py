@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .visit_stats import local_today, start_of_day
+
+
+class VisitSeenCache:
+    """
+    "Bugun allaqachon log qilingan" (user, session_key, kun) kalitlari uchun LRU kesh.
+
+    Middleware bazaga murojaat qilishdan oldin shu yerdan tekshiradi. Kun
+    almashganda (Asia/Tashkent bo'yicha yarim tunda) kesh avtomatik tozalanadi.
+    """
+
+    def __init__(self, max_size=50000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._day = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _rollover(self, day):
+        if day != self._day:
+            self._entries.clear()
+            self._day = day
+
+    def _local_contains(self, key, day):
+        with self._lock:
+            self._rollover(day)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True
+            return False
+
+    def _local_add(self, key, day):
+        with self._lock:
+            self._rollover(day)
+            self._entries[key] = True
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def seen(self, user_id, session_key, day=None):
+        """Bugun shu sessiya log qilingan bo'lsa True (bazaga so'rov kerak emas)"""
+        day = day or local_today()
+        hit = self._local_contains((user_id, session_key), day)
+        self._record(hit)
+        return hit
+
+    def mark(self, user_id, session_key, day=None):
+        self._local_add((user_id, session_key), day or local_today())
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,            # tejalgan so'rovlar soni
+                'misses': self.misses,
+                'hit_rate': (self.hits / total) if total else 0.0,
+                'size': len(self._entries),
+                'day': self._day,
+            }
+
+
+class SharedVisitSeenCache(VisitSeenCache):
+    """
+    Django cache framework ustidagi variant: bir nechta worker jarayonlari
+    bitta keshni bo'lishadi. Mahalliy LRU birinchi daraja sifatida qoladi.
+    """
+
+    key_prefix = 'visitlog:seen'
+
+    def __init__(self, max_size=50000, alias='default'):
+        super().__init__(max_size=max_size)
+        self.cache = caches[alias]
+
+    def _cache_key(self, user_id, session_key, day):
+        return f"{self.key_prefix}:{day.isoformat()}:{user_id or 0}:{session_key}"
+
+    def _ttl(self, day):
+        # Kalit ertangi yarim tungacha yashaydi
+        next_midnight = start_of_day(day + timedelta(days=1))
+        return max(int((next_midnight - timezone.now()).total_seconds()), 1)
+
+    def seen(self, user_id, session_key, day=None):
+        day = day or local_today()
+        key = (user_id, session_key)
+        hit = self._local_contains(key, day)
+        if not hit and self.cache.get(self._cache_key(user_id, session_key, day)):
+            hit = True
+            self._local_add(key, day)
+        self._record(hit)
+        return hit
+
+    def mark(self, user_id, session_key, day=None):
+        day = day or local_today()
+        self._local_add((user_id, session_key), day)
+        self.cache.set(self._cache_key(user_id, session_key, day), 1, self._ttl(day))
+
+
+_visit_cache = None
+_visit_cache_lock = threading.Lock()
+
+
+def get_visit_cache():
+    """
+    Sozlamalar bo'yicha keshni qaytaradi:
+    VISIT_LOG_CACHE = 'local' | 'shared' | None
+    """
+    global _visit_cache
+    backend = getattr(settings, 'VISIT_LOG_CACHE', 'local')
+    if not backend:
+        return None
+
+    with _visit_cache_lock:
+        if _visit_cache is None:
+            max_size = getattr(settings, 'VISIT_LOG_CACHE_SIZE', 50000)
+            if backend == 'shared':
+                _visit_cache = SharedVisitSeenCache(
+                    max_size=max_size,
+                    alias=getattr(settings, 'VISIT_LOG_CACHE_ALIAS', 'default'),
+                )
+            else:
+                _visit_cache = VisitSeenCache(max_size=max_size)
+        return _visit_cache
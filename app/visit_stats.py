@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import VisitDailyStat, VisitLog
+
+STAT_FIELDS = ('visits', 'guests', 'users', 'admins', 'staff', 'customers')
+
+
+def local_today():
+    """Bugungi sana TIME_ZONE (Asia/Tashkent) bo'yicha"""
+    return timezone.localdate(timezone=timezone.get_default_timezone())
+
+
+def start_of_day(day):
+    """Kun boshini (mahalliy vaqt bo'yicha) aware datetime sifatida qaytaradi"""
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _user_role(user):
+    if user.is_superuser:
+        return 'admins'
+    if user.is_staff:
+        return 'staff'
+    return 'customers'
+
+
+def _day_range(day):
+    return start_of_day(day), start_of_day(day + timedelta(days=1))
+
+
+def aggregate_visit_logs(start=None, end=None):
+    """
+    VisitLog ni bitta GROUP BY so'rovi bilan kunlar bo'yicha yig'adi.
+    {sana: {visits, guests, users, admins, staff, customers}} qaytaradi.
+    """
+    logs = VisitLog.objects.all()
+    if start is not None:
+        logs = logs.filter(timestamp__gte=start)
+    if end is not None:
+        logs = logs.filter(timestamp__lt=end)
+
+    rows = (
+        logs.order_by()
+        .annotate(day=TruncDate('timestamp', tzinfo=timezone.get_default_timezone()))
+        .values('day')
+        .annotate(
+            visits=Count('id'),
+            guests=Count('id', filter=Q(user__isnull=True)),
+            users=Count('user', distinct=True),
+            admins=Count('user', distinct=True, filter=Q(user__is_superuser=True)),
+            staff=Count('user', distinct=True, filter=Q(user__is_staff=True, user__is_superuser=False)),
+            customers=Count('user', distinct=True, filter=Q(user__is_staff=False, user__is_superuser=False)),
+        )
+    )
+    return {row.pop('day'): row for row in rows}
+
+
+def rebuild_day(day):
+    """Bitta kun qatorini VisitLog dan qaytadan hisoblaydi"""
+    start, end = _day_range(day)
+    values = aggregate_visit_logs(start, end).get(day, {})
+    defaults = {field: values.get(field, 0) for field in STAT_FIELDS}
+    stat, _ = VisitDailyStat.objects.update_or_create(date=day, defaults=defaults)
+    return stat
+
+
+def record_visits(visits, day=None):
+    """
+    Yangi VisitLog yozuvlarini kunlik statistikaga qo'shadi.
+
+    Yozuvlar bazaga kiritilishidan OLDIN va o'sha tranzaksiya ichida chaqiriladi:
+    noyob foydalanuvchilar shu kun uchun avval log qilinmaganlar bo'yicha sanaladi.
+    """
+    if not visits:
+        return
+
+    day = day or local_today()
+    increments = dict.fromkeys(STAT_FIELDS, 0)
+    increments['visits'] = len(visits)
+
+    users = {}
+    for visit in visits:
+        if visit.user_id is None:
+            increments['guests'] += 1
+        else:
+            users[visit.user_id] = visit.user
+
+    if users:
+        start, end = _day_range(day)
+        already_logged = set(
+            VisitLog.objects.filter(
+                user_id__in=users, timestamp__gte=start, timestamp__lt=end
+            ).values_list('user_id', flat=True).distinct()
+        )
+        for user_id, user in users.items():
+            if user_id in already_logged:
+                continue
+            increments['users'] += 1
+            increments[_user_role(user)] += 1
+
+    changes = {field: F(field) + amount for field, amount in increments.items() if amount}
+    updated = VisitDailyStat.objects.filter(date=day).update(updated_at=timezone.now(), **changes)
+    if not updated:
+        # Kun qatori hali yo'q: shu paytgacha yozilgan loglardan yaratib, keyin qo'shamiz
+        rebuild_day(day)
+        VisitDailyStat.objects.filter(date=day).update(updated_at=timezone.now(), **changes)
+
+
+def save_visits(visits, day=None):
+    """Statistikani yangilab, yozuvlarni bitta tranzaksiyada saqlaydi"""
+    with transaction.atomic():
+        record_visits(visits, day)
+        if len(visits) == 1:
+            visits[0].save()
+        else:
+            VisitLog.objects.bulk_create(visits)
+
+
+def get_day_stats(day=None):
+    """Bitta kun statistikasini qaytaradi (bitta qator o'qiladi)"""
+    day = day or local_today()
+    stat = VisitDailyStat.objects.filter(date=day).first()
+    if stat is None:
+        stat = rebuild_day(day)
+    return stat
+
+
+def get_visit_trend(days=7, end_day=None):
+    """Oxirgi `days` kun uchun statistikalar ro'yxati (bo'sh kunlar 0 bilan)"""
+    end_day = end_day or local_today()
+    start_day = end_day - timedelta(days=days - 1)
+    stats = {
+        stat.date: stat
+        for stat in VisitDailyStat.objects.filter(date__range=(start_day, end_day))
+    }
+
+    trend = []
+    for offset in range(days):
+        day = start_day + timedelta(days=offset)
+        stat = stats.get(day)
+        row = {'date': day}
+        for field in STAT_FIELDS:
+            row[field] = getattr(stat, field) if stat else 0
+        trend.append(row)
+    return trend
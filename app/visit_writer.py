@@ -0,0 +1,221 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import VisitLog
+from .visit_stats import local_today, save_visits, start_of_day
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = 'drop'
+OVERFLOW_BLOCK = 'block'
+
+
+class VisitLogWriter:
+    """
+    Kirishlarni navbatga yig'ib, fon oqimida bulk_create bilan yozadi.
+
+    Middleware so'rov ichida faqat navbatga qo'yadi, bazaga yozish esa
+    har `batch_size` ta yozuvda yoki `flush_interval` soniyada bir marta
+    bajariladi.
+    """
+
+    def __init__(self, max_size=10000, batch_size=100, flush_interval=0.5,
+                 overflow=OVERFLOW_DROP, block_timeout=1.0):
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Noma'lum overflow rejimi: {overflow}")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self._lock = threading.Lock()
+        # Partiyani yig'ish + dublikat tekshiruvi + yozish bitta oqimda: fon oqimi va flush()
+        # bir vaqtda yozsa, ikkala tekshiruv ham insertdan oldin o'tib ketishi mumkin
+        self._write_lock = threading.Lock()
+        self._counters = {
+            'queued': 0,
+            'flushed': 0,
+            'dropped': 0,
+            'duplicates': 0,
+            'failed': 0,
+            'batches': 0,
+        }
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_size=getattr(settings, 'VISIT_LOG_QUEUE_SIZE', 10000),
+            batch_size=getattr(settings, 'VISIT_LOG_BATCH_SIZE', 100),
+            flush_interval=getattr(settings, 'VISIT_LOG_FLUSH_INTERVAL_MS', 500) / 1000,
+            overflow=getattr(settings, 'VISIT_LOG_OVERFLOW', OVERFLOW_DROP),
+            block_timeout=getattr(settings, 'VISIT_LOG_BLOCK_TIMEOUT', 1.0),
+        )
+
+    # ------------------------- ishga tushirish / to'xtatish -------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='visit-log-writer', daemon=True)
+        self._thread.start()
+        # Qayta start() da handler lar ko'payib ketmasin
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, timeout=5.0):
+        """Oqimni to'xtatadi va navbatda qolgan yozuvlarni bazaga yozadi"""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+        # Oqim ulgurmagan bo'lsa, qolganini shu yerning o'zida yozamiz
+        self._drain()
+
+    # ------------------------- navbatga qo'yish -------------------------
+
+    def submit(self, visit):
+        """VisitLog obyektini navbatga qo'yadi, qabul qilinsa True qaytaradi"""
+        # Kun so'rov vaqtida belgilanadi: timestamp esa bulk_create paytida qo'yiladi
+        visit.visit_day = local_today()
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self._queue.put(visit, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(visit)
+        except queue.Full:
+            self._incr('dropped')
+            return False
+
+        self._incr('queued')
+        return True
+
+    def flush(self):
+        """
+        Navbatdagi barcha yozuvlarni darhol yozadi (testlar va shutdown uchun). Fon oqimi
+        partiya yozayotgan bo'lsa, u tugashini kutadi.
+        """
+        self._drain()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self._counters)
+        data['pending'] = self._queue.qsize()
+        return data
+
+    # ------------------------- ichki qism -------------------------
+
+    def _incr(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                # Yozuv navbatdan faqat qulf ostida olinadi: flush() qaytganda olingan, lekin
+                # hali yozilmagan partiya qolmaydi
+                with self._write_lock:
+                    try:
+                        first = self._queue.get_nowait()
+                    except queue.Empty:
+                        first = None
+                    if first is not None:
+                        self._write(self._collect(first))
+                        continue
+                self._stop.wait(self.flush_interval)
+        finally:
+            self._drain()
+            connection.close()
+
+    def _collect(self, first):
+        """Bitta partiyani yig'adi: batch_size ga yetguncha yoki vaqt tugaguncha"""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        with self._write_lock:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            rows = self._deduplicate(batch)
+            by_day = {}
+            for visit in rows:
+                by_day.setdefault(visit.visit_day, []).append(visit)
+            # Kunlik statistika ham shu tranzaksiyada yangilanadi
+            for day, visits in by_day.items():
+                save_visits(visits, day)
+        except Exception:
+            logger.exception("VisitLog partiyasini yozib bo'lmadi (%s ta yozuv)", len(batch))
+            self._incr('failed', len(batch))
+            return
+
+        self._incr('batches')
+        self._incr('flushed', len(rows))
+        self._incr('duplicates', len(batch) - len(rows))
+
+    def _deduplicate(self, batch):
+        """
+        Sessiya uchun kuniga bitta yozuv qoidasini saqlaydi: partiya ichidagi
+        takrorlarni va bazada allaqachon bor bo'lganlarini bitta so'rov bilan chiqarib tashlaydi.
+        """
+        unique = {}
+        for visit in batch:
+            key = (visit.user_id, visit.session_key, visit.visit_day)
+            unique.setdefault(key, visit)
+
+        first_day = min(day for _, _, day in unique)
+        existing = VisitLog.objects.filter(
+            session_key__in={session_key for _, session_key, _ in unique},
+            timestamp__gte=start_of_day(first_day),
+        ).values_list('user_id', 'session_key', 'timestamp')
+
+        seen = {
+            (user_id, session_key, timezone.localdate(timestamp, timezone.get_default_timezone()))
+            for user_id, session_key, timestamp in existing
+        }
+        return [visit for key, visit in unique.items() if key not in seen]
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_visit_log_writer():
+    """Jarayon uchun yagona VisitLogWriter ni qaytaradi (kerak bo'lsa ishga tushiradi)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = VisitLogWriter.from_settings()
+            _writer.start()
+        return _writer
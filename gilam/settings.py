@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 ALLOWED_HOSTS = ["anorgilam.uz", "www.anorgilam.uz"]
@@ -134,6 +135,29 @@ STATICFILES_DIRS = [
     BASE_DIR / "app" / "static",
 ]
 
+# Static build: `collectstatic` fayl nomlariga mazmun hashini qo'shadi, .gz nusxalar va
+# staticfiles.json manifestini yaratadi. True bo'lsa {% static %} hashlangan URL qaytaradi va
+# /static/ STATIC_ROOT dan uzoq muddatli kesh bilan beriladi (runserver uchun --nostatic).
+# Production da (DEBUG=False) yoki STATIC_BUILD=1 muhit o'zgaruvchisi bilan yoqiladi; ishga
+# tushirishdan oldin build qadami (manifest bo'lmasa {% static %} xato beradi):
+#   python manage.py extract_inline_assets          # app/assets -> build/bundles (minify)
+#   STATIC_BUILD=1 python manage.py collectstatic --noinput   # hash + .gz + manifest -> STATIC_ROOT
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_BUILD = not DEBUG or os.environ.get('STATIC_BUILD') == '1'
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Sahifa CSS/JS lari (extract_inline_assets): shablonlar o'zgarmas nom bilan havola qiladi
+# ({% static 'bundles/index-2.js' %}). Oddiy rejimda app/assets/ dagi manbalar beriladi, build da
+# esa `extract_inline_assets` qurgan minify nusxalar; nom hashini manifest storage qo'shadi.
+STATIC_BUNDLES_DIR = BASE_DIR / 'build' / 'bundles'
+STATICFILES_DIRS.append(('bundles', STATIC_BUNDLES_DIR if STATIC_BUILD else BASE_DIR / 'app' / 'assets'))
+
+if STATIC_BUILD:
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'app.static_storage.CompressedManifestStaticFilesStorage'},
+    }
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -143,3 +167,82 @@ LOGIN_URL = '/boshqaruv/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Kirishlar logi (VisitLogMiddleware)
+# True bo'lsa kirishlar navbatga qo'yiladi va fon oqimida bulk_create bilan yoziladi
+VISIT_LOG_WRITE_BEHIND = False
+VISIT_LOG_QUEUE_SIZE = 10000          # navbat sig'imi
+VISIT_LOG_BATCH_SIZE = 100            # shuncha yozuv yig'ilganda yoziladi
+VISIT_LOG_FLUSH_INTERVAL_MS = 500     # yoki shuncha millisekundda bir marta
+VISIT_LOG_OVERFLOW = 'drop'           # navbat to'lganda: 'drop' yoki 'block'
+VISIT_LOG_BLOCK_TIMEOUT = 1.0         # 'block' rejimida kutish (soniya), None - cheksiz
+
+# "Bugun log qilingan" sessiyalar keshi: 'local' (jarayon ichida LRU),
+# 'shared' (Django cache orqali workerlar o'rtasida umumiy) yoki None
+VISIT_LOG_CACHE = 'local'
+VISIT_LOG_CACHE_SIZE = 50000
+VISIT_LOG_CACHE_ALIAS = 'default'
+
+# VisitLog arxivlash (manage.py archive_visit_logs)
+VISIT_LOG_RETENTION_DAYS = 180
+VISIT_LOG_ARCHIVE_DIR = BASE_DIR / 'archive' / 'visitlog'
+
+# Bosh sahifa / mijozlar statistikasi keshi (soniya)
+STATS_CACHE_TTL = 30
+
+# Telegram xabarlari (manage.py send_telegram_outbox)
+TELEGRAM_API_URL = "https://api.telegram.org"
+TELEGRAM_TIMEOUT = (3.05, 10)         # (ulanish, o'qish) soniya
+TELEGRAM_MAX_ATTEMPTS = 8
+TELEGRAM_BACKOFF_BASE = 5.0           # birinchi qayta urinishgacha (soniya)
+TELEGRAM_BACKOFF_MAX = 3600.0
+TELEGRAM_BREAKER_THRESHOLD = 5        # ketma-ket xatoliklardan keyin circuit ochiladi
+TELEGRAM_BREAKER_RESET = 60.0
+TELEGRAM_DIGEST_THRESHOLD = 5         # shuncha xabar yig'ilsa dayjest qilib yuboriladi
+
+# Baraban tasodifiy sonlar generatori: 'system' (secrets.SystemRandom) yoki 'random'
+BARABAN_RNG = 'system'
+BARABAN_RNG_SEED = None               # faqat 'random' uchun (takrorlanadigan natijalar)
+BARABAN_COOLDOWN_HOURS = 24           # spinlar orasidagi kutish vaqti
+
+# Rasmlar uchun kichraytirilgan nusxalar (asl fayl yonida saqlanadi)
+THUMBNAIL_WIDTHS = (160, 320, 640, 1024)
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_WEBP = True                 # har bir o'lcham uchun WebP nusxa ham
+THUMBNAIL_CACHE_TTL = 24 * 60 * 60    # mavjud nusxalar ro'yxati keshi (soniya)
+THUMBNAIL_IN_BACKGROUND = not DEBUG   # yuklangandan keyin nusxalar fon oqimida (production da)
+
+# Katta media fayllarni bo'laklab (qayta davom ettirish mumkin) yuklash
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'tmp' / 'uploads'
+CHUNKED_UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024      # bitta bo'lak (bayt)
+CHUNKED_UPLOAD_MAX_SIZE = 1024 * 1024 * 1024     # fayl hajmi chegarasi (1 GB)
+CHUNKED_UPLOAD_EXPIRE_HOURS = 24                 # tugallanmagan yuklashlar shuncha vaqtdan keyin o'chiriladi
+
+# Anonim foydalanuvchilar uchun to'liq sahifa keshi (index, sharhlar, galereyalar)
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_TTL = 60                   # sahifa yangi hisoblanadigan muddat (soniya)
+PAGE_CACHE_STALE = 300                # muddati o'tgach qayta render paytida eski nusxa beriladi
+PAGE_CACHE_LOCK_TIMEOUT = 10          # qayta render qulfi (soniya)
+PAGE_CACHE_WAIT = 2.0                 # kesh bo'sh bo'lsa boshqa worker natijasini kutish (soniya)
+
+# Media va reklama ko'rishlari buferi (app/view_counter.py)
+VIEW_COUNTER_FLUSH_INTERVAL = 10      # bufer shuncha soniyada bir bazaga yoziladi (0 - darhol)
+VIEW_COUNTER_MAX_PENDING = 500        # shuncha ko'rish yig'ilsa muddatidan oldin yoziladi
+VIEW_COUNTER_SEEN_TTL = 6 * 60 * 60   # video bitta sessiya/IP uchun shu muddatda bir marta sanaladi
+
+# Reklama aylanishi (app/ad_rotation.py): vazn = ustuvorlik x qolgan kunlar
+AD_ROTATION_TTL = 300                 # reja keshi (soniya), eng yaqin tugash vaqtidan oshmaydi
+AD_ROTATION_PLAN_SIZE = 100           # rejadagi o'rinlar soni chegarasi
+
+# SQLite production profili: har bir yangi ulanishda PRAGMA lar (app/sqlite_profile.py).
+# Faqat production da (DEBUG=False) yoki SQLITE_PRODUCTION_PROFILE=1 muhit o'zgaruvchisi bilan
+# yoqiladi - journal_mode=WAL fayl sarlavhasiga yoziladi va git dagi db.sqlite3 ni o'zgartiradi.
+SQLITE_PRODUCTION_PROFILE = not DEBUG or os.environ.get('SQLITE_PRODUCTION_PROFILE') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',            # o'quvchilar yozuvchini kutmaydi
+    'busy_timeout': 5000,             # qulf band bo'lsa kutish (ms)
+    'synchronous': 'NORMAL',          # WAL da xavfsiz, har commitda fsync yo'q
+    'mmap_size': 128 * 1024 * 1024,   # bayt
+    'cache_size': -20000,             # manfiy - KiB (~20 MB)
+    'temp_store': 'MEMORY',
+}
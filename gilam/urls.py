@@ -15,12 +15,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf.urls.static import static
 from django.conf import settings
+from app.streaming import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('app.urls')),
 
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Static build rejimi: hashlangan va siqilgan fayllar STATIC_ROOT dan
+if settings.STATIC_BUILD:
+    urlpatterns += [re_path(r'^static/(?P<path>.*)$', serve_static)]